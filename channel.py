@@ -1,11 +1,16 @@
-﻿from typing import AsyncIterator, Dict, Tuple, Type  # noqa: F401
+﻿import time
+
+from typing import Callable, Dict, Hashable, List, Optional  # noqa: F401
+from typing import Tuple, Type  # noqa: F401
 
 from bot import data  # noqa: F401
 from lib.cache import CacheStore
 from lib.data import ChatCommandArgs
 from lib.helper.chat import feature, permission
 
-from .library import gen, gen1
+from .library import answers, gen, gen1, metrics, responses
+from .library.config import config
+from .library.singleflight import SingleFlight
 
 pokemonGameVersions: Dict[str, Type[gen.Generation]] = {
     'red': gen1.Generation1,
@@ -14,14 +19,91 @@ pokemonGameVersions: Dict[str, Type[gen.Generation]] = {
     }
 
 
+# channel -> (game, expires), cleared by !pokegame when the game changes
+_channelGames: Dict[str, Tuple[str, float]] = {}
+
+_inFlight: SingleFlight = SingleFlight()
+
+
 async def _getGame(dataCache: CacheStore,
                    channel: 'data.Channel',
                    query: str) -> Tuple[str, gen.Generation]:
-    game: str = await dataCache.getChatProperty(channel.channel, 'pokedexGame',
-                                                'red')
+    game: str
+    expires: float
+    now: float = time.monotonic()
+    if channel.channel in _channelGames:
+        game, expires = _channelGames[channel.channel]
+        if expires > now:
+            return game, pokemonGameVersions[game](query, game)
+    game = await dataCache.getChatProperty(channel.channel, 'pokedexGame',
+                                           'red')
+    _channelGames[channel.channel] = game, now + config.gameCacheDuration
     return game, pokemonGameVersions[game](query, game)
 
 
+async def _respond(args: ChatCommandArgs, method: str, *flags: bool) -> None:
+    start: float = time.perf_counter()
+    # Rendered from the normalized query too, so a response echoing the query
+    # is the same for every spelling sharing its cache key
+    query: str = responses.normalizeQuery(args.message.query)
+    game: str
+    info: gen.Generation
+    game, info = await _getGame(args.data, args.chat, query)
+    key: Tuple[Hashable, ...] = (method, game, query) + flags
+    cache: responses.ResponseCache = responses.shared()
+    messages: Optional[responses.Messages] = None
+    table: Optional[answers.AnswerTable] = answers.shared()
+    if table is not None:
+        messages = table.get(method, flags, game, query)
+    if messages is None:
+        messages = cache.get(key)
+    streamed: List[str] = []
+    rendered: bool = False
+    if messages is None:
+        def stream(message: str) -> None:
+            streamed.append(message)
+            args.chat.send(message)
+
+        async def render() -> responses.Messages:
+            nonlocal rendered
+            rendered = True
+            return await _render(cache, key, info, method, flags, stream)
+
+        # A burst of the same lookup renders it once and shares the result,
+        # only the caller rendering it streams
+        messages = await _inFlight.run(key, render)
+        messages = messages[len(streamed):]
+    if messages:
+        args.chat.send(messages)
+
+    # Only the caller that rendered the response ran any statements
+    metrics.shared().record(
+        args.message.command.lower(), game,
+        metrics.Sample(
+            time.perf_counter() - start, info.statistics.time,
+            info.statistics.statements, info.statistics.rows,
+            sum(len(m.encode('utf-8')) for m in streamed + list(messages)),
+            rendered))
+
+
+async def _render(cache: responses.ResponseCache,
+                  key: Tuple[Hashable, ...],
+                  info: gen.Generation,
+                  method: str,
+                  flags: Tuple[bool, ...],
+                  send: Callable[[str], None]) -> responses.Messages:
+    # Each message goes out as soon as it is produced, the connection is
+    # released as soon as the last one is
+    messages: List[str] = []
+    message: str
+    async with info:
+        async for message in getattr(info, method)(*flags):
+            send(message)
+            messages.append(message)
+    cache.put(key, tuple(messages))
+    return tuple(messages)
+
+
 @feature('pokedex')
 @permission('broadcaster')
 async def commandPokeGame(args: ChatCommandArgs) -> bool:
@@ -39,6 +121,7 @@ async def commandPokeGame(args: ChatCommandArgs) -> bool:
         return True
 
     await args.data.setChatProperty(args.chat.channel, 'pokedexGame', game)
+    _channelGames.pop(args.chat.channel, None)
     args.chat.send(
         f'Set the Bot Pokedex to Pokemon {game[0].upper()}{game[1:]}')
     return True
@@ -51,12 +134,7 @@ async def commandPokeDex(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a pokemon or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    async with info:
-        messages: AsyncIterator[str] = info.pokemonDex()
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonDex')
     return True
 
 
@@ -67,12 +145,7 @@ async def commandPokeEntry(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a pokemon or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    async with info:
-        messages: AsyncIterator[str] = info.pokemonEntry()
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonEntry')
     return True
 
 
@@ -83,12 +156,7 @@ async def commandPokeIndex(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    async with info:
-        messages: AsyncIterator[str] = info.pokemonIndex()
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonIndex')
     return True
 
 
@@ -99,12 +167,7 @@ async def commandPokeMove(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a pokemon or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    async with info:
-        messages: AsyncIterator[str] = info.pokemonMove()
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonMove')
     return True
 
 
@@ -115,12 +178,7 @@ async def commandPokeStats(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a pokemon or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    async with info:
-        messages: AsyncIterator[str] = info.pokemonStats()
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonStats')
     return True
 
 
@@ -131,12 +189,7 @@ async def commandPokeEvolve(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a pokemon or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    async with info:
-        messages: AsyncIterator[str] = info.pokemonEvolve()
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonEvolve')
     return True
 
 
@@ -147,17 +200,11 @@ async def commandPokeLearn(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a pokemon or a number or a move')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonLearn(
-            args.message.command.endswith(('-full', '-level')),
-            args.message.command.endswith(('-full', '-tmhm')),
-            args.message.command.endswith(('-full', '-egg')),
-            args.message.command.endswith(('-full', '-tutor')))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonLearn',
+                   args.message.command.endswith(('-full', '-level')),
+                   args.message.command.endswith(('-full', '-tmhm')),
+                   args.message.command.endswith(('-full', '-egg')),
+                   args.message.command.endswith(('-full', '-tutor')))
     return True
 
 
@@ -168,13 +215,8 @@ async def commandPokeTmHms(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a move')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonTmHm(args.message.command.endswith('-full'))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonTmHm',
+                   args.message.command.endswith('-full'))
     return True
 
 
@@ -185,13 +227,8 @@ async def commandPokeTm(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonTm(args.message.command.endswith('-full'))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonTm',
+                   args.message.command.endswith('-full'))
     return True
 
 
@@ -202,13 +239,8 @@ async def commandPokeHm(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonHm(args.message.command.endswith('-full'))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonHm',
+                   args.message.command.endswith('-full'))
     return True
 
 
@@ -219,13 +251,8 @@ async def commandPokeLocation(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a location or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonLocation(args.message.command.endswith('-full'))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonLocation',
+                   args.message.command.endswith('-full'))
     return True
 
 
@@ -236,13 +263,8 @@ async def commandPokeWild(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a location or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonWild(args.message.command.endswith('-full'))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonWild',
+                   args.message.command.endswith('-full'))
     return True
 
 
@@ -253,13 +275,8 @@ async def commandPokeSurf(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a location or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonSurf(args.message.command.endswith('-full'))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonSurf',
+                   args.message.command.endswith('-full'))
     return True
 
 
@@ -270,11 +287,53 @@ async def commandPokeFish(args: ChatCommandArgs) -> bool:
         args.chat.send('Please specify a location or a number')
         return True
 
-    game: str
-    info: gen.Generation
-    game, info = await _getGame(args.data, args.chat, args.message.query)
-    messages: AsyncIterator[str]
-    async with info:
-        messages = info.pokemonFish(args.message.command.endswith('-full'))
-    args.chat.send([message async for message in messages])
+    await _respond(args, 'pokemonFish',
+                   args.message.command.endswith('-full'))
+    return True
+
+
+@feature('pokedex')
+@permission('moderator')
+async def commandPokeType(args: ChatCommandArgs) -> bool:
+    if len(args.message) < 2:
+        args.chat.send('Please specify a type or a pokemon')
+        return True
+
+    await _respond(args, 'pokemonType')
+    return True
+
+
+@feature('pokedex')
+@permission('moderator')
+async def commandPokeMatchup(args: ChatCommandArgs) -> bool:
+    if len(args.message) < 2:
+        args.chat.send('Please specify a type or a move, optionally followed '
+                       'by vs and a pokemon or types')
+        return True
+
+    await _respond(args, 'pokemonMatchup')
+    return True
+
+
+@feature('pokedex')
+@permission('moderator')
+async def commandPokeDamage(args: ChatCommandArgs) -> bool:
+    if len(args.message) < 2:
+        args.chat.send('Please specify a pokemon, optionally a move and a '
+                       'level, followed by vs and a pokemon')
+        return True
+
+    await _respond(args, 'pokemonDamage')
+    return True
+
+
+@feature('pokedex')
+@permission('moderator')
+async def commandPokeCatch(args: ChatCommandArgs) -> bool:
+    if len(args.message) < 2:
+        args.chat.send('Please specify a pokemon, optionally followed by a '
+                       'ball, the HP left in %, a status and a level')
+        return True
+
+    await _respond(args, 'pokemonCatch')
     return True
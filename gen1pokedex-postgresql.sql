@@ -23574,3 +23574,18 @@ INSERT INTO gen1_charmap VALUES (NULL, 253, '7');
 INSERT INTO gen1_charmap VALUES (NULL, 254, '8');
 INSERT INTO gen1_charmap VALUES (NULL, 255, '9');
 
+-- Secondary indexes for the lookups done by the pokedex commands, built
+-- after the data is loaded. The LOWER(name) expression indexes need SQLite
+-- 3.9.0 or newer. gen1_wild_encounters is already covered by its
+-- UNIQUE (versionId, locationId, encounterType, slotIndex) constraint and
+-- gen1_location_warps by its primary key.
+CREATE INDEX gen1_pokemon_lower_name ON gen1_pokemon (LOWER(name));
+CREATE INDEX gen1_pokemon_gameindexnumber ON gen1_pokemon (gameIndexNumber);
+CREATE INDEX gen1_moves_lower_name ON gen1_moves (LOWER(name));
+CREATE INDEX gen1_pokemon_levelup_pokemon ON gen1_pokemon_levelup (pokedexNumber, gameIndex, levelUp, levelUpOrder);
+CREATE INDEX gen1_pokemon_levelup_move ON gen1_pokemon_levelup (moveIndex, gameIndex, pokedexNumber, levelUp);
+CREATE INDEX gen1_pokemon_tmhmcompatability_move ON gen1_pokemon_tmhmcompatability (moveIndex, gameIndex, pokedexNumber);
+CREATE INDEX gen1_locations_lower_name ON gen1_locations (LOWER(name));
+CREATE INDEX gen1_fishing_location ON gen1_fishing (versionId, locationId, slotIndex);
+
+ANALYZE;
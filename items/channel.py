@@ -39,6 +39,10 @@ def commands() -> Mapping[str, Optional[ChatCommand]]:
             '!pokesurf-full': channel.commandPokeSurf,
             '!pokefish': channel.commandPokeFish,
             '!pokefish-full': channel.commandPokeFish,
+            '!poketype': channel.commandPokeType,
+            '!pokematchup': channel.commandPokeMatchup,
+            '!pokedamage': channel.commandPokeDamage,
+            '!pokecatch': channel.commandPokeCatch,
             }
         )
     return getattr(commands, 'commands')
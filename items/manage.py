@@ -2,6 +2,10 @@
 
 from lib.data import ManageBotCommand
 
+from .. import manage
+
 
 def methods() -> Mapping[str, Optional[ManageBotCommand]]:
-    return {}
+    return {
+        'pokedexstats': manage.managePokedexStats,
+        }
@@ -0,0 +1,131 @@
+import gzip
+import json
+import os
+
+from bot import utils
+from typing import Any, Dict, List, Optional, Sequence, Tuple  # noqa: F401
+
+from .config import config
+from .responses import Messages, normalizeQuery
+
+# Raised whenever rendering changes, a table of another version is rebuilt
+version: int = 2
+
+
+def canonicalQuery(query: str) -> str:
+    '''
+    Normalizes query the way the commands read it
+
+    Names are looked up ignoring case, numbers and 0x indexes by their
+    value, so queries reading the same entity have the same key.
+    '''
+    query = normalizeQuery(query)
+    try:
+        return str(int(query))
+    except ValueError:
+        pass
+    if query[0:2] == '0x':
+        try:
+            return f'0x{int(query[2:], 16):x}'
+        except ValueError:
+            pass
+    return query
+
+
+def answerKey(method: str,
+              flags: Sequence[bool],
+              game: str,
+              query: str) -> str:
+    return '|'.join([method, ''.join('1' if f else '0' for f in flags), game,
+                     canonicalQuery(query)])
+
+
+class AnswerTable:
+    '''
+    Responses to every command rendered ahead of time
+
+    tools/compileanswers.py renders each command over every pokemon, move
+    and location. Identical responses are stored once, a key only holds the
+    position of its response.
+    '''
+    def __init__(self,
+                 responses: List[Messages],
+                 keys: Dict[str, int]) -> None:
+        self.responses: List[Messages] = responses
+        self.keys: Dict[str, int] = keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def get(self,
+            method: str,
+            flags: Sequence[bool],
+            game: str,
+            query: str) -> Optional[Messages]:
+        index: Optional[int] = self.keys.get(
+            answerKey(method, flags, game, query))
+        return self.responses[index] if index is not None else None
+
+    @classmethod
+    def read(cls, path: str) -> 'AnswerTable':
+        data: Dict[str, Any]
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+        if data.get('version') != version:
+            raise ValueError(f'{path} is version {data.get("version")}, '
+                             f'expected {version}')
+        return cls([tuple(r) for r in data['responses']], data['keys'])
+
+    def write(self, path: str) -> None:
+        with gzip.open(path, 'wt', encoding='utf-8') as file:
+            json.dump({
+                'version': version,
+                'responses': self.responses,
+                'keys': self.keys,
+                }, file, ensure_ascii=False, separators=(',', ':'))
+
+
+class AnswerTableBuilder:
+    def __init__(self) -> None:
+        self.responses: List[Messages] = []
+        self.keys: Dict[str, int] = {}
+        self._positions: Dict[Messages, int] = {}
+
+    def add(self,
+            method: str,
+            flags: Sequence[bool],
+            game: str,
+            query: str,
+            messages: Messages) -> None:
+        if messages not in self._positions:
+            self._positions[messages] = len(self.responses)
+            self.responses.append(messages)
+        self.keys[answerKey(method, flags, game, query)] = (
+            self._positions[messages])
+
+    def build(self) -> AnswerTable:
+        return AnswerTable(self.responses, self.keys)
+
+
+_table: Optional[AnswerTable] = None
+_tried: bool = False
+
+
+def shared() -> Optional[AnswerTable]:
+    '''
+    Returns the answer table at config.answersPath, read on first use
+
+    None is returned if the file does not exist or cannot be read, the
+    commands then render every response.
+    '''
+    global _table, _tried
+    if _tried:
+        return _table
+    _tried = True
+    if not os.path.isfile(config.answersPath):
+        return None
+    try:
+        _table = AnswerTable.read(config.answersPath)
+    except Exception:
+        utils.logException()
+    return _table
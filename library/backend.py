@@ -0,0 +1,13 @@
+import aioodbc.cursor  # noqa: F401
+
+from typing import Union  # noqa: F401
+
+from lib.database import DatabaseMain
+
+from .postgresdirect import PostgresCursor, PostgresDatabase
+from .sqlitedirect import SqliteCursor, SqliteDatabase
+
+# A connection from the pool or one of the direct readers, the pokedex only
+# uses cursor() and isSqlite of any of them
+Database = Union[DatabaseMain, SqliteDatabase, PostgresDatabase]
+Cursor = Union[aioodbc.cursor.Cursor, SqliteCursor, PostgresCursor]
@@ -0,0 +1,100 @@
+import math
+
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple  # noqa: F401
+
+from .namematch import NameIndex, normalize
+
+
+class Ball(NamedTuple):
+    name: str
+    # The first random number is drawn from 0 to randomMax
+    randomMax: int
+    # Max HP * 255 is divided by this before the current HP
+    hpDivisor: int
+
+
+class Status(NamedTuple):
+    name: str
+    # Catches outright when the first random number is below it
+    bonus: int
+
+
+class CaptureOdds(NamedTuple):
+    chance: float
+    # Average number of balls thrown until it is caught
+    expectedBalls: float
+    # Balls thrown for a 90% chance of having caught it
+    balls90: Optional[int]
+
+
+balls: Dict[str, Ball] = {ball.name: ball for ball in [
+    Ball('Poke Ball', 255, 12),
+    Ball('Great Ball', 200, 8),
+    Ball('Ultra Ball', 150, 12),
+    Ball('Safari Ball', 150, 12),
+    Ball('Master Ball', 255, 12),
+    ]}
+
+noStatus: Status = Status('No Status', 0)
+_statusAliases: List[Tuple[Status, str]] = [
+    (noStatus, 'none healthy ok normal'),
+    (Status('Asleep', 25), 'asleep sleep slp'),
+    (Status('Frozen', 25), 'frozen freeze frz'),
+    (Status('Paralyzed', 12), 'paralyzed paralysis par prz'),
+    (Status('Burned', 12), 'burned burn brn'),
+    (Status('Poisoned', 12), 'poisoned poison psn'),
+    ]
+statuses: Dict[str, Status] = {alias: status
+                               for status, aliases in _statusAliases
+                               for alias in aliases.split()}
+
+_ballNames: NameIndex = NameIndex(balls, minPrefix=2)
+
+
+def ballByName(name: str) -> Optional[Ball]:
+    # Poke Ball, pokeball, poke and misspellings of them
+    if not normalize(name).endswith('ball'):
+        name += ' ball'
+    found: Optional[str] = _ballNames.match(name)
+    return balls[found] if found is not None else None
+
+
+def statusByName(name: str) -> Optional[Status]:
+    return statuses.get(normalize(name))
+
+
+@lru_cache(maxsize=4096)
+def captureChance(catchRate: int,
+                  ball: Ball,
+                  status: Status,
+                  maxHP: int,
+                  currentHP: int) -> float:
+    '''
+    The exact chance one ball catches a pokemon, by the Gen 1 algorithm
+
+    The first random number R1 is from 0 to the randomMax of the ball. The
+    pokemon is caught if R1 is below the status bonus, breaks free if R1
+    minus the bonus is above the catch rate, otherwise it is caught if a
+    second random number from 0 to 255 is at most F, F being
+    maxHP * 255 / hpDivisor / (currentHP / 4) capped at 255. Every R1 is
+    counted instead of drawing samples.
+    '''
+    if ball.name == 'Master Ball':
+        return 1.0
+    draws: int = ball.randomMax + 1
+    outright: int = min(status.bonus, draws)
+    checked: int = max(min(ball.randomMax, status.bonus + catchRate)
+                       - status.bonus + 1, 0)
+    f: int = min(maxHP * 255 // ball.hpDivisor // max(currentHP // 4, 1),
+                 255)
+    return (outright + checked * (f + 1) / 256) / draws
+
+
+def captureOdds(chance: float) -> CaptureOdds:
+    if chance >= 1:
+        return CaptureOdds(1.0, 1.0, 1)
+    if chance <= 0:
+        return CaptureOdds(0.0, math.inf, None)
+    return CaptureOdds(chance, 1 / chance,
+                       math.ceil(math.log(0.1) / math.log(1 - chance)))
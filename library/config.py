@@ -0,0 +1,107 @@
+import configparser
+import os
+
+from typing import Optional
+
+
+class PokedexConfig:
+    '''
+    Tunables for the pokedex package, read from pokedex.ini if it exists
+
+    Every option has a default so the file is optional.
+    '''
+    def __init__(self) -> None:
+        self.poolMinSize: int = 1
+        self.poolMaxSize: int = 8
+        self.poolIdleTimeout: float = 300.0
+        self.poolHealthCheckInterval: float = 60.0
+        self.gameCacheDuration: float = 60.0
+        self.responseCacheSize: int = 1024
+        self.responseCacheDuration: float = 3600.0
+        self.metricsSlices: int = 60
+        self.metricsSliceDuration: float = 60.0
+        self.slowQueryThreshold: Optional[float] = None
+        self.slowQueryLog: str = 'pokedex-slowquery.log'
+        self.slowQueryExplainInterval: float = 600.0
+        self.sqliteDirect: bool = False
+        self.sqlitePath: str = os.path.join('sqlite', 'gen1.sqlite')
+        self.sqliteThreads: int = 2
+        # KiB of page cache for each connection
+        self.sqliteCacheSize: int = 65536
+        self.postgresDsn: Optional[str] = None
+        self.postgresMinSize: int = 1
+        self.postgresMaxSize: int = 8
+        self.postgresStatementCacheSize: int = 256
+        self.answersPath: str = os.path.join('sqlite', 'gen1-answers.json.gz')
+        self.binaryPath: str = os.path.join('sqlite', 'gen1.bin')
+
+    def read(self, path: str='pokedex.ini') -> None:
+        if not os.path.isfile(path):
+            return
+
+        ini: configparser.ConfigParser = configparser.ConfigParser()
+        ini.read(path)
+
+        if 'POOL' in ini:
+            section: configparser.SectionProxy = ini['POOL']
+            self.poolMinSize = section.getint('minSize', self.poolMinSize)
+            self.poolMaxSize = section.getint('maxSize', self.poolMaxSize)
+            self.poolIdleTimeout = section.getfloat('idleTimeout',
+                                                    self.poolIdleTimeout)
+            self.poolHealthCheckInterval = section.getfloat(
+                'healthCheckInterval', self.poolHealthCheckInterval)
+        if 'CHANNEL' in ini:
+            section = ini['CHANNEL']
+            self.gameCacheDuration = section.getfloat('gameCacheDuration',
+                                                      self.gameCacheDuration)
+        if 'RESPONSES' in ini:
+            section = ini['RESPONSES']
+            self.responseCacheSize = section.getint('cacheSize',
+                                                    self.responseCacheSize)
+            self.responseCacheDuration = section.getfloat(
+                'cacheDuration', self.responseCacheDuration)
+        if 'METRICS' in ini:
+            section = ini['METRICS']
+            self.metricsSlices = section.getint('slices', self.metricsSlices)
+            self.metricsSliceDuration = section.getfloat(
+                'sliceDuration', self.metricsSliceDuration)
+        if 'SLOWQUERY' in ini:
+            section = ini['SLOWQUERY']
+            self.slowQueryThreshold = section.getfloat(
+                'threshold', self.slowQueryThreshold)
+            self.slowQueryLog = section.get('log', self.slowQueryLog)
+            self.slowQueryExplainInterval = section.getfloat(
+                'explainInterval', self.slowQueryExplainInterval)
+        if 'SQLITE' in ini:
+            section = ini['SQLITE']
+            self.sqliteDirect = section.getboolean('direct', self.sqliteDirect)
+            self.sqlitePath = section.get('path', self.sqlitePath)
+            self.sqliteThreads = section.getint('threads', self.sqliteThreads)
+            self.sqliteCacheSize = section.getint('cacheSize',
+                                                  self.sqliteCacheSize)
+        if 'POSTGRESQL' in ini:
+            section = ini['POSTGRESQL']
+            self.postgresDsn = section.get('dsn', self.postgresDsn)
+            self.postgresMinSize = section.getint('minSize',
+                                                  self.postgresMinSize)
+            self.postgresMaxSize = section.getint('maxSize',
+                                                  self.postgresMaxSize)
+            self.postgresStatementCacheSize = section.getint(
+                'statementCacheSize', self.postgresStatementCacheSize)
+        if 'ANSWERS' in ini:
+            section = ini['ANSWERS']
+            self.answersPath = section.get('path', self.answersPath)
+        if 'SNAPSHOT' in ini:
+            section = ini['SNAPSHOT']
+            self.binaryPath = section.get('binaryPath', self.binaryPath)
+        self.poolMinSize = max(self.poolMinSize, 0)
+        self.poolMaxSize = max(self.poolMaxSize, self.poolMinSize, 1)
+        self.metricsSlices = max(self.metricsSlices, 1)
+        self.sqliteThreads = max(self.sqliteThreads, 1)
+        self.postgresMinSize = max(self.postgresMinSize, 0)
+        self.postgresMaxSize = max(self.postgresMaxSize,
+                                   self.postgresMinSize, 1)
+
+
+config: PokedexConfig = PokedexConfig()
+config.read()
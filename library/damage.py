@@ -0,0 +1,171 @@
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Sequence  # noqa: F401
+from typing import Tuple  # noqa: F401
+
+from .gen1source import MoveRow, PokemonRow
+from .stats import hpValue, maxDV, statValue
+from .typechart import TypeChart
+
+# The random factor of a hit is r / 255 for r from 217 to 255
+rolls: Tuple[int, ...] = tuple(range(217, 256))
+
+
+class Combatant(NamedTuple):
+    name: str
+    level: int
+    types: Tuple[str, ...]
+    hp: int
+    attack: int
+    defense: int
+    special: int
+    baseSpeed: int
+
+
+class DamageRange(NamedTuple):
+    minimum: int
+    maximum: int
+    average: float
+
+
+class MoveDamage(NamedTuple):
+    move: MoveRow
+    multiplier: float
+    normal: DamageRange
+    critical: DamageRange
+    criticalChance: float
+    hits: Tuple[int, int]
+    # Average damage a turn, with accuracy, hits and critical hits
+    expected: float
+
+
+def combatant(pokemon: PokemonRow, level: int) -> Combatant:
+    '''
+    The stats of pokemon at level with perfect DVs and no stat experience
+    '''
+    types: Tuple[str, ...] = (
+        (pokemon.type1,) if pokemon.type2 in (None, pokemon.type1)
+        else (pokemon.type1, pokemon.type2))
+    return Combatant(
+        pokemon.name, level, types,
+        hpValue(pokemon.baseHP, maxDV, level),
+        statValue(pokemon.baseAttack, maxDV, level),
+        statValue(pokemon.baseDefense, maxDV, level),
+        statValue(pokemon.baseSpecial, maxDV, level),
+        pokemon.baseSpeed)
+
+
+def baseDamage(level: int,
+               power: int,
+               attack: int,
+               defense: int,
+               stab: bool,
+               modifiers: Iterable[float]) -> int:
+    '''
+    Damage of a hit before the random factor, rounded like the games do
+    '''
+    if attack > 255 or defense > 255:
+        attack = max(attack // 4 % 256, 1)
+        defense = max(defense // 4 % 256, 1)
+    damage: int = (level * 2 // 5 + 2) * power * attack // defense // 50
+    damage = min(damage, 997) + 2
+    if stab:
+        damage += damage // 2
+    modifier: float
+    for modifier in modifiers:
+        damage = damage * int(modifier * 10) // 10
+    return damage
+
+
+@lru_cache(maxsize=None)
+def rollDamage(damage: int) -> DamageRange:
+    # Every roll of a damage is computed once, moves often share a damage
+    if damage <= 1:
+        return DamageRange(damage, damage, float(damage))
+    values: List[int] = [damage * r // 255 for r in rolls]
+    return DamageRange(values[0], values[-1], sum(values) / len(values))
+
+
+def criticalChance(baseSpeed: int, highCritical: bool) -> float:
+    threshold: int = baseSpeed // 2
+    if highCritical:
+        threshold = min(threshold * 8, 255)
+    return threshold / 256
+
+
+def expectedHits(move: MoveRow) -> Tuple[int, int, float]:
+    if move.primaryEffect != 'multihit':
+        return 1, 1, 1.0
+    minimum: int = int(move.effectMinTurns or 1)
+    maximum: int = int(move.effectMaxTurns or minimum)
+    if (minimum, maximum) == (2, 5):
+        # 2 and 3 hits are 3/8 each, 4 and 5 hits are 1/8 each
+        return minimum, maximum, 3.0
+    return minimum, maximum, (minimum + maximum) / 2
+
+
+def moveDamage(chart: TypeChart,
+               attacker: Combatant,
+               defender: Combatant,
+               move: MoveRow) -> Optional[MoveDamage]:
+    '''
+    Returns the damage move does, None unless it uses the damage formula
+    '''
+    if not move.basePower:
+        return None
+    position: int = chart.positions[move.type.lower()]
+    attack: int
+    defense: int
+    if chart.special[position]:
+        attack, defense = attacker.special, defender.special
+    else:
+        attack, defense = attacker.attack, defender.defense
+    if move.primaryEffect == 'boom':
+        defense = max(defense // 2, 1)
+    stab: bool = move.type in attacker.types
+    modifiers: List[float] = [
+        chart.matrix[position][chart.positions[t.lower()]]
+        for t in defender.types]
+    multiplier: float = 1.0
+    modifier: float
+    for modifier in modifiers:
+        multiplier *= modifier
+    # Critical hits double the level of the attacker
+    normal: DamageRange = rollDamage(baseDamage(
+        attacker.level, move.basePower, attack, defense, stab, modifiers))
+    critical: DamageRange = rollDamage(baseDamage(
+        attacker.level * 2, move.basePower, attack, defense, stab, modifiers))
+    if multiplier == 0:
+        normal = critical = DamageRange(0, 0, 0.0)
+    chance: float = criticalChance(attacker.baseSpeed,
+                                   move.primaryEffect == 'highCrit')
+    minHits: int
+    maxHits: int
+    hits: float
+    minHits, maxHits, hits = expectedHits(move)
+    accuracy: float = (move.accuracy if move.accuracy is not None else 100)
+    expected: float = (accuracy / 100 * hits
+                       * (normal.average * (1 - chance)
+                          + critical.average * chance))
+    if move.hasChargingTurn or move.primaryEffect == 'recharge':
+        # Spread over the two turns the move takes
+        expected /= 2
+    return MoveDamage(move, multiplier, normal, critical, chance,
+                      (minHits, maxHits), expected)
+
+
+def bestMoves(chart: TypeChart,
+              attacker: Combatant,
+              defender: Combatant,
+              moves: Iterable[MoveRow]) -> List[MoveDamage]:
+    '''
+    Every move that damages defender, the most expected damage first
+    '''
+    damages: List[MoveDamage] = []
+    move: MoveRow
+    for move in moves:
+        damage: Optional[MoveDamage] = moveDamage(chart, attacker, defender,
+                                                  move)
+        if damage is not None and damage.multiplier:
+            damages.append(damage)
+    damages.sort(key=lambda d: (-d.expected, d.move.name))
+    return damages
@@ -3,24 +3,34 @@ from typing import AsyncIterator, Optional, Type
 
 from lib.database import DatabaseMain
 
+from . import pool
+from .metrics import QueryStatistics
+
 
 class Generation:
     def __init__(self,
                  query: str,
                  game: str) -> None:
-        self.database: DatabaseMain = DatabaseMain.acquire()
+        self.connection: Optional[pool.PooledConnection] = None
+        self.database: DatabaseMain
         self.query: str = query
         self.game = game
+        # Statements this command executed, for the command metrics
+        self.statistics: QueryStatistics = QueryStatistics()
 
     async def __aenter__(self) -> 'Generation':
-        await self.database.connect()
+        self.connection = await pool.shared().acquire()
+        self.database = self.connection.database
         return self
 
     async def __aexit__(self,
                         type: Optional[Type[BaseException]],
                         value: Optional[BaseException],
                         traceback: Optional[TracebackType]) -> None:
-        await self.database.close()
+        if self.connection is not None:
+            await pool.shared().release(self.connection,
+                                        healthy=type is None)
+            self.connection = None
 
     async def pokemonDex(self) -> AsyncIterator[str]:
         return
@@ -81,3 +91,19 @@ class Generation:
     async def pokemonFish(self, isFull: bool) -> AsyncIterator[str]:
         return
         yield
+
+    async def pokemonType(self) -> AsyncIterator[str]:
+        return
+        yield
+
+    async def pokemonMatchup(self) -> AsyncIterator[str]:
+        return
+        yield
+
+    async def pokemonDamage(self) -> AsyncIterator[str]:
+        return
+        yield
+
+    async def pokemonCatch(self) -> AsyncIterator[str]:
+        return
+        yield
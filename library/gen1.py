@@ -1,421 +1,441 @@
-﻿import bot
+﻿import re
+import sys
 
 import aioodbc.cursor  # noqa: F401
 
 from contextlib import suppress
-from typing import AsyncIterator, Dict, List, Optional, Tuple  # noqa: F401
+from typing import AsyncIterator, Awaitable, Callable, Dict, List  # noqa: F401
+from typing import Match, NamedTuple, Optional, Pattern, Sequence  # noqa: F401
+from typing import Tuple  # noqa: F401
 
+from . import gen1snapshot, postgresdirect, sqlitedirect
+from .backend import Database
+from .capture import Ball, CaptureOdds, Status, ballByName, balls
+from .capture import captureChance, captureOdds, noStatus, statusByName
+from .config import config
+from .damage import Combatant, DamageRange, MoveDamage, bestMoves, combatant
+from .damage import moveDamage
 from .gen import Generation
+from .gen1source import EncounterRow, EncounterSummaryRow, EvolutionRow
+from .gen1source import IndexRow, LocationRow, MoveRow, PokedexEntryRow
+from .gen1source import PokemonRow, Source
+from .gen1sql import SqlSource
+from .learnset import LearnsetIndex
+from .messages import pack
+from .namematch import normalize
+from .stats import DVInference, averageStats, baseStats, dvCombinations
+from .stats import inferDVs, maxDV, maxStatExp, statNames, statValues
+from .typechart import TypeChart
 
 _encounterRate256: Tuple[int, ...]
 _encounterRate256 = 51, 51, 39, 25, 25, 25, 13, 13, 11, 3
 
+_defaultLevel: int = 50
+_maxTypes: int = 2
+_bestMoveCount: int = 10
+# L50, Lv. 50 or level 50 at the end of a query
+_levelSuffix: Pattern[str] = re.compile(
+    r'\s*\b(?:level|lvl|lv|l)\.?\s*(\d+)\s*$', re.IGNORECASE)
+# Pikachu L50, optionally followed by the HP, Attack, Defense, Speed and
+# Special to infer the DVs from
+_statsQuery: Pattern[str] = re.compile(
+    r'^(?P<name>.+?)\s+(?:level|lvl|lv|l)\.?\s*(?P<level>\d+)'
+    r'(?P<stats>(?:\s*[\s/,]\s*\d+)*)\s*$', re.IGNORECASE)
+# Words of a !pokecatch query besides the pokemon
+_levelWord: Pattern[str] = re.compile(r'(?:lvl|lv|l)\.?(\d+)', re.IGNORECASE)
+_percentWord: Pattern[str] = re.compile(r'(\d+(?:\.\d+)?)%')
+_ballWords: Tuple[str, ...] = 'poke', 'great', 'ultra', 'safari', 'master'
+# surf,strength,fly or cut + surf, no name has a comma or a plus sign
+_moveSeparator: Pattern[str] = re.compile(r'\s*[,+]\s*')
+
+
+class _Query(NamedTuple):
+    number: Optional[int]
+    hexIndex: Optional[int]
+    name: str
+
+
+class _CatchQuery(NamedTuple):
+    name: str
+    ball: Optional[str]
+    hpPercent: float
+    status: Status
+    level: int
+
+
+class _Attacker(NamedTuple):
+    name: str
+    type: str
+
+
+class _Defender(NamedTuple):
+    name: str
+    types: Tuple[str, ...]
+    pokemonId: Optional[int]
+
+
+def _parseQuery(query: str) -> _Query:
+    # Decide locally what the query is so resolving it takes one lookup, no
+    # name is a number so a number never falls back to a name lookup
+    with suppress(ValueError):
+        return _Query(int(query), None, query)
+    if query[0:2].lower() == '0x':
+        with suppress(ValueError):
+            return _Query(None, int(query[2:], 16), query)
+    return _Query(None, None, query)
+
+
+def _parseLevel(text: str) -> Tuple[str, Optional[int]]:
+    match: Optional[Match[str]] = _levelSuffix.search(text)
+    if match is None:
+        return text.strip(), None
+    return text[:match.start()].strip(), int(match.group(1))
+
+
+def _parseCatchQuery(query: str) -> _CatchQuery:
+    # Pikachu great ball 25% paralyzed L5, everything but the pokemon is
+    # optional and in any order
+    nameWords: List[str] = []
+    ball: Optional[str] = None
+    hpPercent: float = 100.0
+    status: Status = noStatus
+    level: int = _defaultLevel
+    word: str
+    for word in query.split():
+        normalized: str = normalize(word)
+        found: Optional[Status] = statusByName(word)
+        levelMatch: Optional[Match[str]] = _levelWord.fullmatch(word)
+        percentMatch: Optional[Match[str]] = _percentWord.fullmatch(word)
+        if found is not None:
+            status = found
+        elif levelMatch is not None:
+            level = int(levelMatch.group(1))
+        elif percentMatch is not None:
+            hpPercent = float(percentMatch.group(1))
+        elif normalized in ('ball', 'balls'):
+            # The word before names the ball
+            if ball is None and nameWords:
+                ball = nameWords.pop()
+        elif normalized.endswith('ball') or normalized in _ballWords:
+            ball = word
+        else:
+            nameWords.append(word)
+    return _CatchQuery(' '.join(nameWords), ball, hpPercent, status, level)
+
+
+def _formatLevel(levelUp: int) -> str:
+    return '---' if levelUp == 1 else f'L{levelUp}'
+
+
+def _formatLevelRange(minLevel: int, maxLevel: int) -> str:
+    if minLevel == maxLevel:
+        return f'L{minLevel}'
+    return f'L{minLevel} - L{maxLevel}'
+
+
+def _formatLevelCounts(counts: List[Tuple[int, int]]) -> str:
+    levels: List[str] = []
+    level: int
+    count: int
+    for level, count in counts:
+        if level == 1:
+            if count > 1:
+                levels.append(f'---({count})')
+            else:
+                levels.append('---')
+        else:
+            levels.append(f'L{level}')
+    return 'Learn Moves at: ' + ', '.join(levels)
+
+
+def _formatMultiplier(multiplier: float) -> str:
+    return f'{multiplier:g}x'
+
+
+def _formatMultipliers(names: List[str], row: Sequence[float]) -> List[str]:
+    # Type names grouped by multiplier, highest first, neutral ones left out
+    groups: Dict[float, List[str]] = {}
+    name: str
+    multiplier: float
+    for name, multiplier in zip(names, row):
+        if multiplier != 1:
+            groups.setdefault(multiplier, []).append(name)
+    return [f'{_formatMultiplier(multiplier)} {", ".join(groups[multiplier])}'
+            for multiplier in sorted(groups, reverse=True)]
+
+
+def _formatDamage(damage: DamageRange, hp: int) -> str:
+    return (f'{damage.minimum}-{damage.maximum} '
+            f'({damage.minimum / hp:.0%}-{damage.maximum / hp:.0%})')
+
+
+def _formatHits(damage: MoveDamage) -> str:
+    minHits: int
+    maxHits: int
+    minHits, maxHits = damage.hits
+    if maxHits == 1:
+        return ''
+    if minHits == maxHits:
+        return f' x{minHits}'
+    return f' x{minHits}-{maxHits}'
+
+
+def _formatStats(stats: Sequence[int]) -> str:
+    return ', '.join(f'{name}: {value}'
+                     for name, value in zip(statNames, stats))
+
+
+def _formatStatRanges(low: Sequence[int], high: Sequence[int]) -> str:
+    return ', '.join(f'{name}: {minimum}-{maximum}'
+                     for name, minimum, maximum in zip(statNames, low, high))
+
+
+def _formatDVs(dvs: Sequence[int]) -> str:
+    # Consecutive DVs are shown as a range
+    runs: List[List[int]] = []
+    dv: int
+    for dv in dvs:
+        if runs and runs[-1][1] + 1 == dv:
+            runs[-1][1] = dv
+        else:
+            runs.append([dv, dv])
+    return ' '.join(str(first) if first == last else f'{first}-{last}'
+                    for first, last in runs)
+
+
+def _formatMove(move: MoveRow) -> str:
+    return f'''\
+Move Name: {move.name}, Move Index: {move.gameIndexNumber}, \
+Type: {move.type}, Base Power: {move.basePower}, PP: {move.basePP}, \
+Accuracy: {move.accuracy}'''
+
 
 class Generation1(Generation):
+    def __init__(self,
+                 query: str,
+                 game: str) -> None:
+        super().__init__(query, game)
+        self.data: Source
+
+    async def __aenter__(self) -> 'Generation1':
+        snapshot: Optional[gen1snapshot.Snapshot]
+        snapshot = gen1snapshot.current() or gen1snapshot.loadFile()
+        if snapshot is not None:
+            self.data = snapshot
+            return self
+        direct: Optional[Database]
+        direct = sqlitedirect.shared() or postgresdirect.shared()
+        if direct is not None:
+            # Reads the file itself, no pooled connection is needed
+            snapshot = await gen1snapshot.load(direct)
+            self.data = snapshot or SqlSource(direct, self.statistics)
+            return self
+        await super().__aenter__()
+        try:
+            await self._attachDatabase()
+            snapshot = await gen1snapshot.load(self.database)
+        except BaseException:
+            # __aexit__ does not run when __aenter__ raises, return the
+            # connection so it is checked before it is lent out again
+            await self.__aexit__(*sys.exc_info())
+            raise
+        self.data = snapshot or SqlSource(self.database, self.statistics)
+        return self
+
     async def _attachDatabase(self) -> None:
+        # ATTACH loads the schema, do it once for each pooled connection
         if not self.database.isSqlite:
             return
+        assert self.connection is not None
+        if 'gen1' in self.connection.attached:
+            return
         cursor: aioodbc.cursor.Cursor
         query: str
         async with await self.database.cursor() as cursor:
             query = 'ATTACH DATABASE ? AS gen1'
-            await cursor.execute(query, ('sqlite/gen1.sqlite',))
+            await cursor.execute(query, (config.sqlitePath,))
+        self.connection.attached.add('gen1')
 
     async def _getGameVersionIds(self) -> Tuple[int, int]:
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT gen1_game_versions.id, gen1_games.id
-    FROM gen1_game_versions, gen1_games
-    WHERE gen1_game_versions.shortName=?
-        AND gen1_games.id=gen1_game_versions.gameIndex'''
-            await cursor.execute(query, (self.game,))
-            row: Tuple[int, int] = await cursor.fetchone() or (0, 0)
-            return row[1], row[0],
-
-    async def _queryPokemon(self) -> Optional[int]:
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            pokemonId: Optional[int] = None
-            q: int
-            if pokemonId is None:
-                with suppress(ValueError):
-                    q = int(self.query)
-                    if 1 <= q <= 151:
-                        pokemonId = q
-            if pokemonId is None:
-                try:
-                    if self.query[0:2].lower() != '0x':
-                        raise Exception()
-                    q = int(self.query[2:], 16)
-                    query = '''
-SELECT pokedexNumber FROM gen1_pokemon WHERE gameIndexNumber=?
-'''
-                    await cursor.execute(query, (q,))
-                    pokemonId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            if pokemonId is None:
-                try:
-                    query = '''
-SELECT pokedexNumber FROM gen1_pokemon WHERE LOWER(name)=?
-'''
-                    await cursor.execute(query, (self.query.lower(),))
-                    pokemonId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            return pokemonId
+        return await self.data.gameVersionIds(self.game)
+
+    async def _queryPokemon(self,
+                            text: Optional[str]=None,
+                            fuzzy: bool=True) -> Optional[int]:
+        query: _Query = _parseQuery(self.query if text is None else text)
+        if query.number is not None:
+            return query.number if 1 <= query.number <= 151 else None
+        if query.hexIndex is not None:
+            return await self.data.pokemonByIndex(query.hexIndex)
+        return await self._queryName('pokemon', query.name,
+                                     self.data.pokemonByName, fuzzy)
 
     async def _queryMove(self,
                          isTM: bool=False,
-                         isHM: bool=False) -> Optional[int]:
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            moveId: Optional[int] = None
-            q: int
-            if isHM and moveId is None:
-                try:
-                    q = int(self.query)
-                    query = '''
-SELECT gameIndexNumber FROM gen1_moves WHERE hmNumber=?
-'''
-                    await cursor.execute(query, (q,))
-                    moveId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            if isTM and moveId is None:
-                try:
-                    q = int(self.query)
-                    query = '''
-SELECT gameIndexNumber FROM gen1_moves WHERE tmNumber=?
-'''
-                    await cursor.execute(query, (q,))
-                    moveId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            if not isHM and not isTM and moveId is None:
-                try:
-                    q = int(self.query)
-                    if 1 <= q <= 165:
-                        moveId = q
-                except Exception:
-                    pass
-            if not isHM and not isTM and moveId is None:
-                try:
-                    if self.query[0:2].lower() != '0x':
-                        raise Exception()
-                    q = int(self.query[2:], 16)
-                    if 1 <= q <= 165:
-                        moveId = q
-                except Exception:
-                    pass
-            if moveId is None:
-                try:
-                    query = '''
-SELECT gameIndexNumber FROM gen1_moves WHERE LOWER(name)=?
-'''
-                    await cursor.execute(query, (query.lower(),))
-                    moveId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            return moveId
+                         isHM: bool=False,
+                         text: Optional[str]=None,
+                         fuzzy: bool=True) -> Optional[int]:
+        query: _Query = _parseQuery(self.query if text is None else text)
+        if query.number is not None:
+            if isTM or isHM:
+                return await self.data.moveByMachine(query.number, isTM, isHM)
+            return query.number if 1 <= query.number <= 165 else None
+        if query.hexIndex is not None and not isTM and not isHM:
+            return query.hexIndex if 1 <= query.hexIndex <= 165 else None
+        return await self._queryName('move', query.name, self.data.moveByName,
+                                     fuzzy)
+
+    async def _queryPokemonOrMove(self
+                                  ) -> Tuple[Optional[int], Optional[int]]:
+        # Many moves are spelled like a pokemon, Growl and Growlithe, so an
+        # exact name of either wins over a misspelled name of either
+        fuzzy: bool
+        for fuzzy in False, True:
+            pokemonId: Optional[int] = await self._queryPokemon(fuzzy=fuzzy)
+            if pokemonId is not None:
+                return pokemonId, None
+            moveId: Optional[int] = await self._queryMove(fuzzy=fuzzy)
+            if moveId is not None:
+                return None, moveId
+        return None, None
 
     async def _queryLocation(self, version: Tuple[int, int]) -> Optional[int]:
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            locationId: Optional[int] = None
-            q: int
-            if locationId is None:
-                try:
-                    query = '''
-SELECT mapIndex
-    FROM gen1_locations
-    WHERE mapIndex=?
-        AND EXISTS(
-            SELECT 1
-                FROM gen1_location_used
-                WHERE gen1_location_used.mapIndex=gen1_locations.mapIndex
-                    AND gen1_location_used.versionId=?)
-'''
-                    q = int(self.query)
-                    await cursor.execute(query, (q, version[1]))
-                    locationId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            if locationId is None:
-                try:
-                    if self.query[0:2].lower() != '0x':
-                        raise Exception()
-                    q = int(self.query[2:], 16)
-                    query = '''
-SELECT mapIndex
-    FROM gen1_locations
-    WHERE mapIndex=?
-    AND EXISTS(
-        SELECT 1
-            FROM gen1_location_used
-            WHERE gen1_location_used.mapIndex=gen1_locations.mapIndex
-                AND gen1_location_used.versionId=?)
-'''
-                    await cursor.execute(query, (q, version[1]))
-                    locationId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            if locationId is None:
-                try:
-                    query = '''
-SELECT mapIndex
-    FROM gen1_locations
-    WHERE LOWER(name)=?
-    AND EXISTS(
-        SELECT 1
-            FROM gen1_location_used
-            WHERE gen1_location_used.mapIndex=gen1_locations.mapIndex
-                AND gen1_location_used.versionId=?)
-'''
-                    await cursor.execute(query, (query.lower(), version[1]))
-                    locationId, = await cursor.fetchone()
-                except Exception:
-                    pass
-            return locationId
+        query: _Query = _parseQuery(self.query)
+        index: Optional[int] = query.number
+        if index is None:
+            index = query.hexIndex
+        if index is not None:
+            return await self.data.locationByIndex(index, version[1])
+        return await self._queryName(
+            'location', query.name,
+            lambda name: self.data.locationByName(name, version[1]))
+
+    async def _queryName(self,
+                         kind: str,
+                         name: str,
+                         lookup: Callable[[str], Awaitable[Optional[int]]],
+                         fuzzy: bool=True) -> Optional[int]:
+        found: Optional[int] = await lookup(name)
+        if found is None and fuzzy:
+            # Chat misspells names, try the closest name before giving up
+            closest: Optional[str] = await self.data.closestName(kind, name)
+            if closest is not None and closest.lower() != name.lower():
+                found = await lookup(closest)
+        return found
 
     async def pokemonDex(self) -> AsyncIterator[str]:
-        await self._attachDatabase()
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
         pokemonId: Optional[int] = await self._queryPokemon()
         if pokemonId is None:
             yield 'Pokemon Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT pokedexNumber, name, heightMeters, weightKilograms,
-        (SELECT entry
-            FROM gen1_pokedex_entries AS pokedex
-            WHERE pokedex.pokedexNumber=gen1_pokemon.pokedexNumber
-                AND pokedex.versionId=?)
-    FROM gen1_pokemon
-    WHERE pokedexNumber=?
-'''
-            await cursor.execute(query, (gameIds[1], int(pokemonId),))
-            pokemon: Tuple[int, str, float, float, str]
-            pokemon = await cursor.fetchone()
-            weightLbs: float = round(float(pokemon[3]) * 2.205)
-            if weightLbs == 0:
-                weightLbs = round(float(pokemon[3]) * 2.205, 1)
-            heightInches: int = round(float(pokemon[2]) * 39.3701)
-            pokedex: str = pokemon[4].replace('\r\n', ' ').replace('\n', ' ')
-            pokedex = pokedex.replace('\x0c', ' ')
-
-            yield f'''\
-Pokemon Name: {pokemon[1]}, Pokedex Number: {pokemon[0]}, \
-Weight: {weightLbs:.1f}lbs ({pokemon[3]:.1f}kg), \
-Height: {heightInches // 12}'{heightInches % 12}" ({pokemon[2]:.1f}m)'''
-            yield f'Pokedex: {pokedex}'
+        pokemon: Optional[PokedexEntryRow]
+        pokemon = await self.data.pokedexEntry(pokemonId, gameIds[1])
+        if pokemon is None:
+            yield 'Pokemon Not Found'
+            return
+        weightLbs: float = round(float(pokemon.weightKilograms) * 2.205)
+        if weightLbs == 0:
+            weightLbs = round(float(pokemon.weightKilograms) * 2.205, 1)
+        heightInches: int = round(float(pokemon.heightMeters) * 39.3701)
+        pokedex: str = (pokemon.entry or '').replace('\r\n', ' ')
+        pokedex = pokedex.replace('\n', ' ').replace('\x0c', ' ')
+
+        yield f'''\
+Pokemon Name: {pokemon.name}, Pokedex Number: {pokemon.pokedexNumber}, \
+Weight: {weightLbs:.1f}lbs ({pokemon.weightKilograms:.1f}kg), \
+Height: {heightInches // 12}'{heightInches % 12}" \
+({pokemon.heightMeters:.1f}m)'''
+        yield f'Pokedex: {pokedex}'
 
     async def pokemonEntry(self) -> AsyncIterator[str]:
-        await self._attachDatabase()
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
         pokemonId: Optional[int] = await self._queryPokemon()
         if pokemonId is None:
             yield 'Pokemon Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT pokedexNumber, gameIndexNumber, name,
-        (SELECT typeName
-            FROM gen1_types
-            WHERE gen1_types.typeIndex=gen1_pokemon.type1) AS type1,
-        (SELECT typeName
-            FROM gen1_types
-            WHERE gen1_types.typeIndex=gen1_pokemon.type2) AS type2,
-        (SELECT name
-            FROM gen1_experiencecurve
-            WHERE gen1_experiencecurve.curveIndex=gen1_pokemon.experienceCurve
-            ) AS experienceCurve,
-        catchRate, heightMeters, weightKilograms, baseHP, baseAttack,
-        baseDefense, baseSpeed, baseSpecial
-    FROM gen1_pokemon
-    WHERE pokedexNumber=?
-'''
-            await cursor.execute(query, (pokemonId,))
-            pokemon: Optional[Tuple[int,  # 0: pokedexNumber
-                                    int,  # 1: gameIndexNumber
-                                    str,  # 2: name
-                                    str,  # 3: type1
-                                    Optional[str],  # 4: type2
-                                    str,  # 5: experienceCurve
-                                    int,  # 6: catchRate
-                                    int,  # 7: heightMeters
-                                    int,  # 8: weightKilograms
-                                    int,  # 9: baseHP
-                                    int,  # 10: baseAttack
-                                    int,  # 11: baseDefense
-                                    int,  # 12: baseSpeed
-                                    int,  # 13: baseSpecial
-                                    ]]
-            pokemon = await cursor.fetchone()
-            if pokemon is None:
-                yield 'Pokemon Not Found'
-                return
-            pokemonType: str = pokemon[3]
-            if pokemon[4]:
-                pokemonType += '/' + pokemon[4]
-            weightLbs: float = round(float(pokemon[8]) * 2.205)
-            if weightLbs == 0:
-                weightLbs = round(float(pokemon[8]) * 2.205, 1)
-            heightInches: int = round(float(pokemon[7]) * 39.3701)
-
-            yield f'''\
-Pokemon Name: {pokemon[2]}, Pokedex Number: {pokemon[0]}, \
-Pokemon Index: 0x{pokemon[1]:02X} ({pokemon[1]}), Type: {pokemonType}'''
-            yield f'''\
-Catch Rate: {pokemon[6]}, Experience Curve: {pokemon[5]}, \
-Weight: {weightLbs:.1f}lbs ({pokemon[8]:.1f}kg), \
-Height: {heightInches // 12}'{heightInches % 12}" ({pokemon[7]:.1f}m)'''
-            yield f'''\
-Base Stats HP: {pokemon[9]}, Attack: {pokemon[10]}, Defense: {pokemon[11]}, \
-Speed: {pokemon[12]}, Special: {pokemon[13]}'''
-
-            query = '''
-SELECT levelUp, COUNT(*)
-    FROM gen1_pokemon_levelup
-    WHERE pokedexNumber=?
-        AND gameIndex=?
-    GROUP BY levelUp
-    ORDER BY levelUp ASC
-'''
-            levels: List[str] = []
-            params: Tuple[int, int] = (pokemonId, gameIds[0])
-            level: int
-            count: int
-            async for level, count in await cursor.execute(query, params):
-                if int(level) == 1:
-                    if int(count) > 1:
-                        levels.append(f'---({count})')
-                    else:
-                        levels.append('---')
-                else:
-                    levels.append(f'L{level}')
-            message: str = 'Learn Moves at: ' + ', '.join(levels)
-            query = '''
-SELECT COUNT(*)
-    FROM gen1_pokemon_tmhmcompatability AS tmhm
-    WHERE pokedexNumber=?
-        AND gameIndex=?
-        AND (SELECT tmNumber
-                FROM gen1_moves
-                 WHERE gen1_moves.gameIndexNumber=tmhm.moveIndex
-             ) IS NOT NULL
-'''
-            await cursor.execute(query, (pokemonId, gameIds[0],))
-            tmCount: int
-            tmCount, = await cursor.fetchone() or (0,)
-            message += f'; Learns {tmCount} TMs'
-            query = '''
-SELECT (SELECT name
-            FROM gen1_moves
-            WHERE gen1_moves.gameIndexNumber=tmhm.moveIndex)
-    FROM gen1_pokemon_tmhmcompatability AS tmhm
-    WHERE pokedexNumber=?
-        AND gameIndex=?
-        AND (SELECT hmNumber
-                FROM gen1_moves
-                WHERE gen1_moves.gameIndexNumber=tmhm.moveIndex
-            ) IS NOT NULL
-'''
-            hms: List[str] = []
-            move: str
-            async for move, in await cursor.execute(query, params):
-                hms.append(move)
-            if hms:
-                message += '; ' + ', '.join(hms)
+        pokemon: Optional[PokemonRow] = await self.data.pokemon(pokemonId)
+        if pokemon is None:
+            yield 'Pokemon Not Found'
+            return
+        pokemonType: str = pokemon.type1
+        if pokemon.type2:
+            pokemonType += '/' + pokemon.type2
+        weightLbs: float = round(float(pokemon.weightKilograms) * 2.205)
+        if weightLbs == 0:
+            weightLbs = round(float(pokemon.weightKilograms) * 2.205, 1)
+        heightInches: int = round(float(pokemon.heightMeters) * 39.3701)
+
+        yield f'''\
+Pokemon Name: {pokemon.name}, Pokedex Number: {pokemon.pokedexNumber}, \
+Pokemon Index: 0x{pokemon.gameIndexNumber:02X} ({pokemon.gameIndexNumber}), \
+Type: {pokemonType}'''
+        yield f'''\
+Catch Rate: {pokemon.catchRate}, Experience Curve: {pokemon.experienceCurve}, \
+Weight: {weightLbs:.1f}lbs ({pokemon.weightKilograms:.1f}kg), \
+Height: {heightInches // 12}'{heightInches % 12}" \
+({pokemon.heightMeters:.1f}m)'''
+        yield f'''\
+Base Stats HP: {pokemon.baseHP}, Attack: {pokemon.baseAttack}, \
+Defense: {pokemon.baseDefense}, Speed: {pokemon.baseSpeed}, \
+Special: {pokemon.baseSpecial}'''
+
+        learns: List[str] = [_formatLevelCounts(
+            await self.data.levelUpCounts(pokemonId, gameIds[0]))]
+        tmCount: int = await self.data.tmCount(pokemonId, gameIds[0])
+        learns.append(f'Learns {tmCount} TMs')
+        hms: List[Tuple[str, int]]
+        hms = await self.data.hmMoves(pokemonId, gameIds[0])
+        if hms:
+            learns.append(', '.join(name for name, _ in hms))
+        message: str
+        for message in pack(learns, separator='; '):
             yield message
 
     async def pokemonIndex(self) -> AsyncIterator[str]:
-        await self._attachDatabase()
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            number: Optional[int] = None
-            if number is None:
-                try:
-                    number = int(self.query)
-                except Exception:
-                    pass
-            if number is None:
-                try:
-                    if self.query[0:2].lower() != '0x':
-                        raise Exception()
+        number: Optional[int] = None
+        if number is None:
+            with suppress(ValueError):
+                number = int(self.query)
+        if number is None:
+            with suppress(ValueError):
+                if self.query[0:2].lower() == '0x':
                     number = int(self.query[2:], 16)
-                except Exception:
-                    pass
-            if number is None:
-                yield 'Invalid number entered'
-                return
-            messages: List[str] = []
-            name: str
+        if number is None:
+            yield 'Invalid number entered'
+            return
+        messages: List[str] = []
+        index: IndexRow = await self.data.index(number, gameIds[1])
 
-            query = 'SELECT name FROM gen1_pokemon WHERE pokedexNumber=?'
-            await cursor.execute(query, (number,))
-            name, = await cursor.fetchone() or (None,)
-            if name:
-                messages.append(f'Pokemon by Dex number: {name}')
+        if index.pokemonByDex:
+            messages.append(f'Pokemon by Dex number: {index.pokemonByDex}')
+        if index.pokemonByIndex:
+            if messages:
+                messages.append(f'by Index number: {index.pokemonByIndex}')
+            else:
+                messages.append(
+                    f'Pokemon by Index number: {index.pokemonByIndex}')
 
-            query = 'SELECT name FROM gen1_pokemon WHERE gameIndexNumber=?'
-            await cursor.execute(query, (number,))
-            name, = await cursor.fetchone() or (None,)
-            if name:
-                if messages:
-                    messages.append(f'by Index number: {name}')
-                else:
-                    messages.append(f'Pokemon by Index number: {name}')
-
-            queries: List[Tuple[str, str]] = [
-                ('SELECT name FROM gen1_moves WHERE gameIndexNumber=?',
-                 'Move'),
-                ('SELECT name FROM gen1_items WHERE hexIndex=?', 'Item'),
-                ('SELECT name FROM gen1_experiencecurve WHERE curveIndex=?',
-                 'Experience Curve'),
-                ('SELECT typeName FROM gen1_types WHERE typeIndex=?', 'Type'),
-                ('SELECT className FROM gen1_trainer_class WHERE gameIndex=?',
-                 'Trainer Class'),
-                ]
-            for query, item in queries:
-                await cursor.execute(query, (number,))
-                name, = await cursor.fetchone() or (None,)
-                if name:
-                    messages.append(f'{item}: {name}')
-            queries = [
-                ('''
-SELECT name
-    FROM gen1_locations
-    WHERE mapIndex=?
-        AND EXISTS(
-            SELECT 1
-                FROM gen1_location_used
-                WHERE gen1_locations.mapIndex=gen1_location_used.mapIndex
-                    AND gen1_location_used.versionId=?)
-''',
-                 'Location'),
+        items: List[Tuple[Optional[str], str]] = [
+            (index.move, 'Move'),
+            (index.item, 'Item'),
+            (index.experienceCurve, 'Experience Curve'),
+            (index.type, 'Type'),
+            (index.trainerClass, 'Trainer Class'),
+            (index.location, 'Location'),
             ]
-            for query, item in queries:
-                await cursor.execute(query, (int(number), gameIds[1],))
-                name, = await cursor.fetchone() or (None,)
-                if name:
-                    messages.append(f'{item}: {name}')
-            if not messages:
-                yield 'Nothing found'
-                return
-            yield ', '.join(messages)
+        name: Optional[str]
+        item: str
+        for name, item in items:
+            if name:
+                messages.append(f'{item}: {name}')
+        if not messages:
+            yield 'Nothing found'
+            return
+        message: str
+        for message in pack(messages):
+            yield message
 
     async def pokemonMove(self) -> AsyncIterator[str]:
         def stageFormat(prefix: str, by: int, stat: str, who: str) -> str:
@@ -429,1014 +449,844 @@ SELECT name
                 return f'{prefix} double increase the {stat} stat on {who}'
             return ''
 
-        await self._attachDatabase()
+        def stageModifier(prefix: str, move: MoveRow) -> str:
+            who: str = 'enemy' if move.enemyStageModifier else 'self'
+            stage: str = ''
+            if move.attackStageModifier is not None:
+                stage = stageFormat(prefix, move.attackStageModifier,
+                                    'Attack', who)
+            if move.defenseStageModifier is not None:
+                stage = stageFormat(prefix, move.defenseStageModifier,
+                                    'Defense', who)
+            if move.speedStageModifier is not None:
+                stage = stageFormat(prefix, move.speedStageModifier,
+                                    'Speed', who)
+            if move.specialStageModifier is not None:
+                stage = stageFormat(prefix, move.specialStageModifier,
+                                    'Special', who)
+            if move.accuracyStageModifier is not None:
+                stage = stageFormat(prefix, move.accuracyStageModifier,
+                                    'Accuracy', who)
+            if move.evasionStageModifier is not None:
+                stage = stageFormat(prefix, move.evasionStageModifier,
+                                    'Evasion', who)
+            return stage
+
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
         moveId: Optional[int] = await self._queryMove()
         if moveId is None:
             yield 'Move Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT gameIndexNumber, name,
-        (SELECT typeName
-            FROM gen1_types
-            WHERE gen1_types.typeIndex=gen1_moves.typeIndex) AS type,
-        basePower, basePP, accuracy, tmNumber, hmNumber, targetEnemy,
-        hasChargingTurn, healRate, drainRate, primaryEffect, secondEffect,
-        secondEffectChance, staticDamage, effectMinTurns, effectMaxTurns,
-        enemyStageModifier, attackStageModifier, defenseStageModifier,
-        speedStageModifier, specialStageModifier, accuracyStageModifier,
-        evasionStageModifier
-    FROM gen1_moves
-    WHERE gameIndexNumber=?'''
-            await cursor.execute(query, (moveId,))
-            move: Optional[Tuple[int,  # 0: gameIndexNumber
-                                 str,  # 1: name
-                                 str,  # 2: type
-                                 Optional[int],  # 3: basePower
-                                 Optional[int],  # 4: basePP
-                                 Optional[int],  # 5: accuracy
-                                 Optional[int],  # 6: tmNumber
-                                 Optional[int],  # 7: hmNumber
-                                 bool,  # 8: targetEnemy
-                                 bool,  # 9: hasChargingTurn
-                                 Optional[float],  # 10: healRate
-                                 Optional[float],  # 11: drainRate
-                                 Optional[str],  # 12: primaryEffect
-                                 Optional[str],  # 13: secondEffect
-                                 Optional[float],  # 14: secondEffectChance
-                                 Optional[float],  # 15: staticDamage
-                                 Optional[float],  # 16: effectMinTurns
-                                 Optional[float],  # 17: effectMaxTurns
-                                 Optional[bool],  # 18: enemyStageModifier
-                                 Optional[int],  # 19: attackStageModifier
-                                 Optional[int],  # 20: defenseStageModifier
-                                 Optional[int],  # 21: speedStageModifier
-                                 Optional[int],  # 22: specialStageModifier
-                                 Optional[int],  # 23: accuracyStageModifier
-                                 Optional[int],  # 24: evasionStageModifier
-                                 ]]
-            move = await cursor.fetchone()
-            yield f'''\
-Move Name: {move[1]}, Move Index: {move[0]}, Type: {move[2]}, \
-Base Power: {move[3]}, PP: {move[4]}, Accuracy: {move[5]}'''
-            properties = []
-            if move[8]:
-                properties.append('Targets enemy')
-            else:
-                properties.append('Targets self')
-            if move[9]:
-                properties.append('Has Charging Turn')
-            if move[10] and not move[12]:
-                properties.append(f'Heals {move[10]}% of Max HP')
-            if move[12] == 'badlyPoison':
-                properties.append('Badly Poisons the enemy')
-            elif move[12] == 'bide':
-                properties.append(
-                    'Wait 2 turns, Returns twice damage received')
-            elif move[12] == 'boom':
-                properties.append('Faints, Enemy defense will be halved')
-            elif move[12] == 'confusion':
-                properties.append('Applies Confusion status')
-            elif move[12] == 'conversion':
-                properties.append('Changes user type to enemy type')
-            elif move[12] == 'counter':
-                properties.append('''\
+        move: Optional[MoveRow] = await self.data.move(moveId)
+        if move is None:
+            yield 'Move Not Found'
+            return
+        yield _formatMove(move)
+        properties: List[str] = []
+        if move.targetEnemy:
+            properties.append('Targets enemy')
+        else:
+            properties.append('Targets self')
+        if move.hasChargingTurn:
+            properties.append('Has Charging Turn')
+        if move.healRate and not move.primaryEffect:
+            properties.append(f'Heals {move.healRate}% of Max HP')
+        effect: Optional[str] = move.primaryEffect
+        minTurns: Optional[float] = move.effectMinTurns
+        maxTurns: Optional[float] = move.effectMaxTurns
+        if effect == 'badlyPoison':
+            properties.append('Badly Poisons the enemy')
+        elif effect == 'bide':
+            properties.append(
+                'Wait 2 turns, Returns twice damage received')
+        elif effect == 'boom':
+            properties.append('Faints, Enemy defense will be halved')
+        elif effect == 'confusion':
+            properties.append('Applies Confusion status')
+        elif effect == 'conversion':
+            properties.append('Changes user type to enemy type')
+        elif effect == 'counter':
+            properties.append('''\
 Returns twitce damage received from a Normal or Fighting move''')
-            elif move[12] == 'crash':
-                properties.append('User receive 1 HP damage if missed')
-            elif move[12] == 'disable':
-                properties.append(f'''\
-Disables one of enemy moves for {move[16]} - {move[17]} turns''')
-            elif move[12] == 'fatigue':
-                properties.append(f'''\
-Consecutively attacks for {move[16]} - {move[17]} turns, afterwards user is \
+        elif effect == 'crash':
+            properties.append('User receive 1 HP damage if missed')
+        elif effect == 'disable':
+            properties.append(f'''\
+Disables one of enemy moves for {minTurns} - {maxTurns} turns''')
+        elif effect == 'fatigue':
+            properties.append(f'''\
+Consecutively attacks for {minTurns} - {maxTurns} turns, afterwards user is \
 confused''')
-            elif move[12] == 'flee' or move[12] == 'phazing':
-                properties.append('Escape an wild encounter')
-            elif move[12] == 'fly':
-                properties.append(
-                    'On Charging turn, user is semi-invulnerable')
-            elif move[12] == 'focusEnergy':
-                properties.append('Decreases chance of critical hit by 4')
-            elif move[12] == 'haze':
-                properties.append('Reset some of in-battle effects')
-            elif move[12] == 'highCrit':
-                properties.append('High Critical-hit ratio')
-            elif move[12] == 'leechSeed':
-                p = 'Plant a seed at the target, drains 1/16 HP per turn'
-                properties.append(p)
-            elif move[12] == 'levelDamage':
-                properties.append('Applies damage equal to user level')
-            elif move[12] == 'lightscreen':
-                properties.append('Doubles the users effective Special')
-            elif move[12] == 'metronome':
-                properties.append('Executes a random move')
-            elif move[12] == 'mimic':
-                properties.append('Copies a move the enemy has')
-            elif move[12] == 'mirrorMove':
-                properties.append('Uses the last move the enemy used on user')
-            elif move[12] == 'mist':
-                properties.append('Prevents stat modifications from enemy')
-            elif move[12] == 'multihit':
-                properties.append(f'''\
-Execute the move {move[16]} - {move[17]} times in same turn''')
-            elif move[12] == 'ohko':
-                properties.append('One Hit KO if user is faster')
-            elif move[12] == 'paralyze':
-                properties.append('Paralyzes the enemy')
-            elif move[12] == 'payday':
-                properties.append("Scatter coins twice the user's level")
-            elif move[12] == 'poison':
-                properties.append("Poisons the enemy")
-            elif move[12] == 'psywave':
-                properties.append('''\
+        elif effect == 'flee' or effect == 'phazing':
+            properties.append('Escape an wild encounter')
+        elif effect == 'fly':
+            properties.append(
+                'On Charging turn, user is semi-invulnerable')
+        elif effect == 'focusEnergy':
+            properties.append('Decreases chance of critical hit by 4')
+        elif effect == 'haze':
+            properties.append('Reset some of in-battle effects')
+        elif effect == 'highCrit':
+            properties.append('High Critical-hit ratio')
+        elif effect == 'leechSeed':
+            p = 'Plant a seed at the target, drains 1/16 HP per turn'
+            properties.append(p)
+        elif effect == 'levelDamage':
+            properties.append('Applies damage equal to user level')
+        elif effect == 'lightscreen':
+            properties.append('Doubles the users effective Special')
+        elif effect == 'metronome':
+            properties.append('Executes a random move')
+        elif effect == 'mimic':
+            properties.append('Copies a move the enemy has')
+        elif effect == 'mirrorMove':
+            properties.append('Uses the last move the enemy used on user')
+        elif effect == 'mist':
+            properties.append('Prevents stat modifications from enemy')
+        elif effect == 'multihit':
+            properties.append(f'''\
+Execute the move {minTurns} - {maxTurns} times in same turn''')
+        elif effect == 'ohko':
+            properties.append('One Hit KO if user is faster')
+        elif effect == 'paralyze':
+            properties.append('Paralyzes the enemy')
+        elif effect == 'payday':
+            properties.append("Scatter coins twice the user's level")
+        elif effect == 'poison':
+            properties.append("Poisons the enemy")
+        elif effect == 'psywave':
+            properties.append('''\
 Deals Random amount of damage from 0.5 to 1.5 or the user's level''')
-            elif move[12] == 'rage':
-                properties.append('''\
+        elif effect == 'rage':
+            properties.append('''\
 Locks the user to only use Rage, user Attack will increase if hit by enemy''')
-            elif move[12] == 'recharge':
-                properties.append('User needs to recharge after executed')
-            elif move[12] == 'reflect':
-                properties.append('Doubles the users effective Defense')
-            elif move[12] == 'reset':
-                properties.append('''\
+        elif effect == 'recharge':
+            properties.append('User needs to recharge after executed')
+        elif effect == 'reflect':
+            properties.append('Doubles the users effective Defense')
+        elif effect == 'reset':
+            properties.append('''\
 Heals to full, Remove all status ailment, Sleeps for 2 turns''')
-            elif move[12] == 'sleep':
-                properties.append('Sleep the enemy')
-            elif move[12] == 'stage':
-                prefix = 'Applies'
-                who = 'enemy' if move[18] else 'self'
-                stage = ''
-                if move[19] is not None:
-                    stage = stageFormat(prefix, move[19], 'Attack', who)
-                if move[20] is not None:
-                    stage = stageFormat(prefix, move[20], 'Defense', who)
-                if move[21] is not None:
-                    stage = stageFormat(prefix, move[21], 'Speed', who)
-                if move[22] is not None:
-                    stage = stageFormat(prefix, move[22], 'Special', who)
-                if move[23] is not None:
-                    stage = stageFormat(prefix, move[23], 'Accuracy', who)
-                if move[24] is not None:
-                    stage = stageFormat(prefix, move[24], 'Evasion', who)
-                properties.append(stage)
-            elif move[12] == 'static':
-                properties.append(f'Deals {move[15]} damage')
-            elif move[12] == 'substitute':
+        elif effect == 'sleep':
+            properties.append('Sleep the enemy')
+        elif effect == 'stage':
+            properties.append(stageModifier('Applies', move))
+        elif effect == 'static':
+            properties.append(f'Deals {move.staticDamage} damage')
+        elif effect == 'substitute':
+            properties.append(
+                'Create a substitute using 25% of user Max HP')
+        elif effect == 'superFang':
+            properties.append(
+                'Deals damage equal to half enemy current HP')
+        elif effect == 'targetSleep':
+            properties.append('Deals damage when the enemy is asleep')
+        elif effect == 'transform':
+            properties.append('Transforms as the enemy')
+        elif effect == 'trap':
+            properties.append('Traps the enemy')
+        if move.secondEffect:
+            chance = f'{(move.secondEffectChance or 0) / 256 * 100:.1f}%'
+            if move.secondEffect == 'burn':
+                properties.append(f'{chance} to burn the enemy')
+            elif move.secondEffect == 'confusion':
+                properties.append(f'{chance} to confuse the enemy')
+            elif move.secondEffect == 'flinch':
+                properties.append(f'{chance} to flinch the enemy')
+            elif move.secondEffect == 'freeze':
+                properties.append(f'{chance} to freeze the enemy')
+            elif move.secondEffect == 'paralyze':
+                properties.append(f'{chance} to paralyze the enemy')
+            elif move.secondEffect == 'poison':
+                properties.append(f'{chance} to poison the enemy')
+            elif move.secondEffect == 'stage':
+                properties.append(stageModifier(f'{chance} to', move))
+        if move.drainRate:
+            if move.drainRate > 0:
+                properties.append(f'Recovers {move.drainRate}% of Damage Done')
+            if move.drainRate < 0:
                 properties.append(
-                    'Create a substitute using 25% of user Max HP')
-            elif move[12] == 'superFang':
-                properties.append(
-                    'Deals damage equal to half enemy current HP')
-            elif move[12] == 'targetSleep':
-                properties.append('Deals damage when the enemy is asleep')
-            elif move[12] == 'transform':
-                properties.append('Transforms as the enemy')
-            elif move[12] == 'trap':
-                properties.append('Traps the enemy')
-            if move[13]:
-                chance = f'{move[14] / 256 * 100:.1f}%'
-                if move[13] == 'burn':
-                    properties.append(f'{chance} to burn the enemy')
-                elif move[13] == 'confusion':
-                    properties.append(f'{chance} to confuse the enemy')
-                elif move[13] == 'flinch':
-                    properties.append(f'{chance} to flinch the enemy')
-                elif move[13] == 'freeze':
-                    properties.append(f'{chance}to freeze the enemy')
-                elif move[13] == 'paralyze':
-                    properties.append(f'{chance} to paralyze the enemy')
-                elif move[13] == 'poison':
-                    properties.append(f'{chance} to poison the enemy')
-                elif move[13] == 'stage':
-                    prefix = f'{chance} to'
-                    who = 'enemy' if move[18] else 'self'
-                    stage = ''
-                    if move[19] is not None:
-                        stage = stageFormat(prefix, move[19], 'Attack', who)
-                    if move[20] is not None:
-                        stage = stageFormat(prefix, move[20], 'Defense', who)
-                    if move[21] is not None:
-                        stage = stageFormat(prefix, move[21], 'Speed', who)
-                    if move[22] is not None:
-                        stage = stageFormat(prefix, move[22], 'Special', who)
-                    if move[23] is not None:
-                        stage = stageFormat(prefix, move[23], 'Accuracy', who)
-                    if move[24] is not None:
-                        stage = stageFormat(prefix, move[24], 'Evasion', who)
-                    properties.append(stage)
-            if move[11]:
-                if move[11] > 0:
-                    properties.append(f'Recovers {move[11]}% of Damage Done')
-                if move[11] < 0:
-                    properties.append(f'Recoils {-move[11]}% of Damage Done')
-            yield ', '.join(properties)
-
-            query = '''
-SELECT COUNT(DISTINCT pokedexNumber), levelUp=1
-    FROM gen1_pokemon_levelup
-    WHERE moveIndex=? AND gameIndex=?
-    GROUP BY levelUp=1
-    ORDER BY levelUp=1
-'''
-            count: Dict[bool, int] = {False: 0, True: 0}
-            moveCount: int
-            starts: bool
-            await cursor.execute(query, (moveId, gameIds[0]))
-            async for moveCount, starts in cursor:
-                count[bool(starts)] = moveCount
-            if count[True] > 0:
-                yield f'{count[True]} Pokemon starts with this move'
-            if count[False] > 0:
-                yield f'{count[False]} Pokemon learns this move'
-
-            if move[6] is not None or move[7] is not None:
-                query = '''
-SELECT COUNT(DISTINCT pokedexNumber)
-    FROM gen1_pokemon_tmhmcompatability
-    WHERE moveIndex=? AND gameIndex=?
-'''
-                await cursor.execute(query, (moveId, gameIds[0]))
-                tmhmCount: int
-                tmhmCount, = await cursor.fetchone() or (0,)
-                item: str
-                if move[6] is not None:
-                    item = f'TM{move[6]:02}'
-                else:
-                    item = f'HM{move[7]:02}'
-                yield f'{tmhmCount} Pokemon learns {item}'
+                    f'Recoils {-move.drainRate}% of Damage Done')
+        message: str
+        for message in pack(properties):
+            yield message
+
+        count: Dict[bool, int]
+        count = await self.data.moveLearnerCounts(moveId, gameIds[0])
+        if count[True] > 0:
+            yield f'{count[True]} Pokemon starts with this move'
+        if count[False] > 0:
+            yield f'{count[False]} Pokemon learns this move'
+
+        if move.tmNumber is not None or move.hmNumber is not None:
+            tmhmCount: int
+            tmhmCount = await self.data.tmhmLearnerCount(moveId, gameIds[0])
+            item: str
+            if move.tmNumber is not None:
+                item = f'TM{move.tmNumber:02}'
+            else:
+                item = f'HM{move.hmNumber:02}'
+            yield f'{tmhmCount} Pokemon learns {item}'
 
     async def pokemonStats(self) -> AsyncIterator[str]:
-        await self._attachDatabase()
-        pokemonId: Optional[int] = await self._queryPokemon()
+        match: Optional[Match[str]] = _statsQuery.match(self.query.strip())
+        pokemonId: Optional[int] = await self._queryPokemon(
+            match.group('name') if match is not None else None)
         if pokemonId is None:
             yield 'Pokemon Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT pokedexNumber, name, baseHP, baseAttack, baseDefense, baseSpeed,
-        baseSpecial
-    FROM gen1_pokemon
-    WHERE pokedexNumber=?
-'''
-            await cursor.execute(query, (pokemonId,))
-            pokemon: Optional[Tuple[int,  # 0: pokedexNumber
-                                    str,  # 1: name
-                                    int,  # 2: baseHP
-                                    int,  # 3: baseAttack
-                                    int,  # 4: baseDefense
-                                    int,  # 5: baseSpeed
-                                    int,  # 6: baseSpecial
-                                    ]]
-            pokemon = await cursor.fetchone()
-            if pokemon is None:
-                yield 'Pokemon Not Found'
-                return
-            yield f'Pokemon Name: {pokemon[1]}, Pokedex Number: {pokemon[0]}'
-            yield f'''\
-Base Stats HP: {pokemon[2]}, Attack: {pokemon[3]}, Defense: {pokemon[4]}, \
-Speed: {pokemon[5]}, Special: {pokemon[6]}'''
+        pokemon: Optional[PokemonRow] = await self.data.pokemon(pokemonId)
+        if pokemon is None:
+            yield 'Pokemon Not Found'
+            return
+        if match is not None:
+            message: str
+            async for message in self._pokemonStatsAt(
+                    pokemon, int(match.group('level')),
+                    [int(n) for n in re.findall(r'\d+',
+                                                match.group('stats'))]):
+                yield message
+            return
+        yield (f'Pokemon Name: {pokemon.name}, '
+               f'Pokedex Number: {pokemon.pokedexNumber}')
+        yield f'''\
+Base Stats HP: {pokemon.baseHP}, Attack: {pokemon.baseAttack}, \
+Defense: {pokemon.baseDefense}, Speed: {pokemon.baseSpeed}, \
+Special: {pokemon.baseSpecial}'''
+
+    async def _pokemonStatsAt(self,
+                              pokemon: PokemonRow,
+                              level: int,
+                              stats: List[int]) -> AsyncIterator[str]:
+        if not 1 <= level <= 100:
+            yield 'Levels are from 1 to 100'
+            return
+        if stats and len(stats) != len(statNames):
+            yield 'Please specify the HP, Attack, Defense, Speed and Special'
+            return
+        bases: Tuple[int, ...] = baseStats(pokemon)
+        yield f'Pokemon Name: {pokemon.name}, Level: {level}'
+        if not stats:
+            yield ('Stats without Stat Exp ' + _formatStatRanges(
+                statValues(bases, 0, level), statValues(bases, maxDV, level)))
+            yield ('Stats with max Stat Exp ' + _formatStatRanges(
+                statValues(bases, 0, level, maxStatExp),
+                statValues(bases, maxDV, level, maxStatExp)))
+            yield ('Typical Stats with average DVs and no Stat Exp '
+                   + _formatStats(averageStats(bases, level)))
+            return
+
+        # Caught or wild pokemon have no stat experience
+        inference: DVInference = inferDVs(bases, level, tuple(stats))
+        if not inference.combinations:
+            yield ('No DVs give these stats at this level without Stat Exp, '
+                   + _formatStats(stats))
+            return
+        yield ('Possible DVs ' + ', '.join(
+            f'{name}: {_formatDVs(dvs)}'
+            for name, dvs in zip(statNames, inference.dvs))
+            + f' ({inference.combinations} of {dvCombinations} combinations)')
 
     async def pokemonLearn(self,
                            isFullLearn: bool,
                            isFullTmHm: bool,
                            isFullEgg: bool,
                            isFullTutoring: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            params: Tuple[int, int]
-            levelUp: int
-            name: str
-            count: int
-            level: str
+        levelUp: int
+        name: str
+        message: str
 
-            pokemonId: Optional[int] = await self._queryPokemon()
-            if pokemonId is not None:
-                query = '''
-SELECT pokedexNumber, name FROM gen1_pokemon WHERE pokedexNumber=?'''
-                await cursor.execute(query, (pokemonId,))
-                dex: int
-                name, dex = await cursor.fetchone() or ('', 0)
-                if name:
-                    yield f'Pokemon Name: {name}, Pokedex Number: {dex}'
-
-                params = pokemonId, gameIds[0],
-                if isFullLearn:
-                    query = '''
-SELECT l.levelUp, m.name
-    FROM gen1_pokemon_levelup AS l, gen1_moves AS m
-    WHERE l.moveIndex=m.gameIndexNumber
-        AND l.pokedexNumber=?
-        AND l.gameIndex=?
-    ORDER BY l.levelUp ASC, l.levelUpOrder ASC
-'''
-                    await cursor.execute(query, params)
-                    async for levelUp, name in cursor:
-                        if levelUp == 1:
-                            level = '---'
-                        else:
-                            level = f'L{levelUp}'
-                        yield f'{level}: {name}'
-                else:
-                    query = '''
-SELECT levelUp, COUNT(*)
-    FROM gen1_pokemon_levelup
-    WHERE pokedexNumber=? AND gameIndex=?
-    GROUP BY levelUp
-    ORDER BY levelUp ASC
-'''
-                    levels: List[str] = []
-                    await cursor.execute(query, params)
-                    async for levelUp, count in cursor:
-                        if levelUp == 1:
-                            if count > 1:
-                                levels.append(f'---({count})')
-                            else:
-                                levels.append('---')
-                        else:
-                            levels.append(f'L{levelUp}')
-                    yield 'Learn Moves at: ' + ', '.join(levels)
-
-                if isFullTmHm:
-                    message: str
-                    query = '''
-SELECT m.name, m.tmNumber
-    FROM gen1_pokemon_tmhmcompatability AS c, gen1_moves AS m
-    WHERE c.pokedexNumber=?
-        AND c.gameIndex=?
-        AND m.gameIndexNumber=c.moveIndex
-        AND m.tmNumber IS NOT NULL
-    ORDER BY tmNumber
-'''
-                    message = ''
-                    await cursor.execute(query, params)
-                    i: int = 0
-                    tmNum: int
-                    async for name, tmNum in cursor:
-                        if message:
-                            message += ', '
-                        message += f'TM{tmNum:02}: {name}'
-                        i += 1
-                        if i == 5:
-                            yield message
-                            message = ''
-                            i = 0
-                    if message:
-                        yield message
-
-                    query = '''
-SELECT m.name, m.hmNumber
-    FROM gen1_pokemon_tmhmcompatability AS c, gen1_moves AS m
-    WHERE c.pokedexNumber=?
-        AND c.gameIndex=?
-        AND m.gameIndexNumber=c.moveIndex
-        AND m.hmNumber IS NOT NULL ORDER BY hmNumber
-'''
-                    message = ''
-                    hmNum: int
-                    await cursor.execute(query, params)
-                    async for name, hmNum in cursor:
-                        if message:
-                            message += ', '
-                        message += f'HM{hmNum:02}: {name}'
-                    if message:
-                        yield message
-                else:
-                    query = '''
-SELECT COUNT(*)
-    FROM gen1_pokemon_tmhmcompatability AS tmhm
-    WHERE pokedexNumber=?
-        AND gameIndex=?
-        AND (SELECT tmNumber
-                FROM gen1_moves
-                WHERE gen1_moves.gameIndexNumber=tmhm.moveIndex) IS NOT NULL
-'''
-                    await cursor.execute(query, params)
-                    tmCount: int
-                    tmCount, = await cursor.fetchone() or (0,)
-                    message = f'Learns {tmCount} TMs'
-                    query = '''
-SELECT (SELECT name
-            FROM gen1_moves
-            WHERE gen1_moves.gameIndexNumber=tmhm.moveIndex)
-    FROM gen1_pokemon_tmhmcompatability as tmhm
-    WHERE pokedexNumber=?
-        AND gameIndex=?
-        AND (SELECT hmNumber
-                FROM gen1_moves
-                WHERE gen1_moves.gameIndexNumber=tmhm.moveIndex) IS NOT NULL
-'''
-                    hms: List[str] = []
-                    async for name, in await cursor.execute(query, params):
-                        hms.append(name)
-                    if hms:
-                        message += ', ' + ', '.join(hms)
-                    yield message
-                return
+        if _moveSeparator.search(self.query):
+            # -level and -tmhm limit the learners to one way of learning
+            async for message in self._commonLearners(
+                    isFullLearn or not isFullTmHm,
+                    isFullTmHm or not isFullLearn, gameIds):
+                yield message
+            return
 
-            moveId: Optional[int] = await self._queryMove()
-            if moveId is None:
-                yield 'Pokemon or Move Not Found'
-                return
-            query = '''
-SELECT gameIndexNumber, name,
-    (SELECT typeName
-        FROM gen1_types
-        WHERE gen1_types.typeIndex=gen1_moves.typeIndex) AS type,
-    basePower, basePP, accuracy, tmNumber, hmNumber
-    FROM gen1_moves
-    WHERE gameIndexNumber=?
-'''
-            await cursor.execute(query, (moveId,))
-            move: Optional[Tuple[int, str, str, Optional[int], Optional[int],
-                                 Optional[int], Optional[int], Optional[int]]]
-            move = await cursor.fetchone()
-            if move is None:
-                yield 'Pokemon or Move Not Found'
-                return
-            yield f'''\
-Move Name: {move[1]}, Move Index: {move[0]}, Type: {move[2]}, \
-Base Power: {move[3]}, PP: {move[4]}, Accuracy: {move[5]}'''
+        pokemonId: Optional[int]
+        moveId: Optional[int]
+        pokemonId, moveId = await self._queryPokemonOrMove()
+        if pokemonId is not None:
+            pokemon: Optional[PokemonRow] = await self.data.pokemon(pokemonId)
+            if pokemon is not None:
+                yield (f'Pokemon Name: {pokemon.name}, '
+                       f'Pokedex Number: {pokemon.pokedexNumber}')
 
             if isFullLearn:
-                query = '''
-SELECT p.name, l.levelUp
-    FROM gen1_pokemon_levelup AS l, gen1_pokemon AS p
-    WHERE p.pokedexNumber=l.pokedexNumber AND l.moveIndex=? AND l.gameIndex=?
-'''
-                params = moveId, gameIds[0],
-                async for row in await cursor.execute(query, params):
-                    level = '---' if int(row[1]) == 1 else row[1]
-                    yield f'{row[0]} learns at {level}'
+                for levelUp, name in await self.data.levelUpMoves(
+                        pokemonId, gameIds[0]):
+                    yield f'{_formatLevel(levelUp)}: {name}'
             else:
-                query = '''\
-SELECT COUNT(DISTINCT pokedexNumber), levelUp=1
-    FROM gen1_pokemon_levelup
-    WHERE moveIndex=? AND gameIndex=?
-    GROUP BY levelUp=1
-    ORDER BY levelUp=1'''
-                counts: Dict[bool, int] = {False: 0, True: 0}
-                starts: bool
-                async for count, starts in await cursor.execute(query, params):
-                    counts[starts] = count
-                if int(counts[True]) > 0:
-                    yield f'{counts[True]} Pokemon starts with this move'
-                if int(counts[False]) > 0:
-                    yield f'{counts[False]} Pokemon learns this move'
-
-            if move[6] is not None or move[7] is not None:
-                item: str
-                if move[6] is not None:
-                    item = f'TM{move[6]:02}'
-                else:
-                    item = f'HM{move[7]:02}'
-                if isFullTmHm:
-                    query = '''
-SELECT p.name
-    FROM gen1_pokemon_tmhmcompatability AS l, gen1_pokemon AS p
-    WHERE p.pokedexNumber=l.pokedexNumber AND l.moveIndex=? AND l.gameIndex=?
-'''
-                    pokemon: List[str] = []
-                    async for name, in await cursor.execute(query, params):
-                        length: int
-                        length = sum(len(p) + 2 for p in pokemon) + len(name)
-                        length += len('These Pokemon learns TM00: ')
-                        if length > bot.config.messageLimit:
-                            yield (f'These Pokemon learns {item}: '
-                                   + ', '.join(pokemon))
-                            pokemon.clear()
-                        pokemon.append(name)
-                    yield f'These Pokemon learns {item}: ' + ', '.join(pokemon)
-                else:
-                    query = '''
-SELECT COUNT(DISTINCT pokedexNumber)
-    FROM gen1_pokemon_tmhmcompatability
-    WHERE moveIndex=? AND gameIndex=?
-'''
-                    await cursor.execute(query, params)
-                    count, = await cursor.fetchone() or (0,)
-                    yield f'{count} Pokemon learns {item}'
+                yield _formatLevelCounts(
+                    await self.data.levelUpCounts(pokemonId, gameIds[0]))
 
-    async def pokemonEvolve(self) -> AsyncIterator[str]:
-        await self._attachDatabase()
-        pokemonId: Optional[int] = await self._queryPokemon()
-        if pokemonId is None:
-            yield 'Pokemon Not Found'
+            if isFullTmHm:
+                tms: List[Tuple[str, int]]
+                tms = await self.data.tmMoves(pokemonId, gameIds[0])
+                for message in pack(f'TM{tmNum:02}: {name}'
+                                    for name, tmNum in tms):
+                    yield message
+
+                hms: List[Tuple[str, int]]
+                hms = await self.data.hmMoves(pokemonId, gameIds[0])
+                for message in pack(f'HM{hmNum:02}: {name}'
+                                    for name, hmNum in hms):
+                    yield message
+            else:
+                tmCount: int = await self.data.tmCount(pokemonId, gameIds[0])
+                hms = await self.data.hmMoves(pokemonId, gameIds[0])
+                for message in pack([f'Learns {tmCount} TMs']
+                                    + [name for name, _ in hms]):
+                    yield message
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT pokedexNumber, name FROM gen1_pokemon WHERE pokedexNumber=?
-'''
-            await cursor.execute(query, (int(pokemonId),))
-            dex: int
-            name: str
-            dex, name = await cursor.fetchone() or (0, '')
-            if not dex:
-                yield 'Pokemon Not Found'
-                return
-            yield f'Pokemon Name: {name}, Pokedex Number: {dex}'
-            query = '''
-SELECT toPokedexNumber, levelUp, itemIndex, isTrade,
-        (SELECT name
-            FROM gen1_pokemon
-            WHERE gen1_pokemon.pokedexNumber=evo.toPokedexNumber
-        ) AS pokemonName,
-        (SELECT name
-            FROM gen1_items
-            WHERE gen1_items.hexIndex=evo.itemIndex) AS itemName
-    FROM gen1_pokemon_evolution as evo
-    WHERE fromPokedexNumber=?
-'''
-            await cursor.execute(query, (int(pokemonId),))
-            toDex: int
-            levelUp: Optional[int]
-            item: Optional[int]
-            trade: bool
-            toName: str
-            itemName: Optional[str]
-            async for toDex, levelUp, item, trade, toName, itemName in cursor:
-                if levelUp:
-                    yield f'Evolves to {toName} at level {levelUp}'
-                elif item:
-                    yield f'Evolves to {toName} with item {itemName}'
-                elif trade:
-                    yield f'Evolves to {toName} with trading'
-            if cursor.rowcount == 0:
-                yield f'{name} has no evolutions'
 
-    async def pokemonTmHm(self, isFull: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
-        gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        moveId: Optional[int] = await self._queryMove()
         if moveId is None:
-            yield 'Move Not Found'
+            yield 'Pokemon or Move Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT gameIndexNumber, name,
-        (SELECT typeName
-            FROM gen1_types
-            WHERE gen1_types.typeIndex=gen1_moves.typeIndex) AS type,
-        basePower, basePP, accuracy, tmNumber, hmNumber
-     FROM gen1_moves
-    WHERE gameIndexNumber=?
-'''
-            await cursor.execute(query, (int(moveId),))
-            move: Optional[Tuple[int, str, str, Optional[int], Optional[int],
-                                 Optional[int], Optional[int], Optional[int]]]
-            move = await cursor.fetchone()
-            if move is None or (move[6] is None and move[7] is None):
-                yield 'Move Not Found'
-                return
-            yield '''\
-Move Name: {move[1]}, Move Index: {move[0]}, Type: {move[2]}, \
-Base Power: {move[3]}, PP: {move[4]}, Accuracy: {move[5]}'''
+        move: Optional[MoveRow] = await self.data.move(moveId)
+        if move is None:
+            yield 'Pokemon or Move Not Found'
+            return
+        yield _formatMove(move)
+
+        if isFullLearn:
+            for name, levelUp in await self.data.moveLearners(moveId,
+                                                              gameIds[0]):
+                level: str = '---' if levelUp == 1 else str(levelUp)
+                yield f'{name} learns at {level}'
+        else:
+            counts: Dict[bool, int]
+            counts = await self.data.moveLearnerCounts(moveId, gameIds[0])
+            if counts[True] > 0:
+                yield f'{counts[True]} Pokemon starts with this move'
+            if counts[False] > 0:
+                yield f'{counts[False]} Pokemon learns this move'
 
+        if move.tmNumber is not None or move.hmNumber is not None:
             item: str
-            if move[6] is not None:
-                item = f'TM{move[6]:02}'
+            if move.tmNumber is not None:
+                item = f'TM{move.tmNumber:02}'
             else:
-                item = f'HM{move[7]:02}'
-
-            params: Tuple[int, int] = (moveId, gameIds[0],)
-            if isFull:
-                query = '''
-SELECT p.name
-    FROM gen1_pokemon_tmhmcompatability AS l, gen1_pokemon AS p
-    WHERE p.pokedexNumber=l.pokedexNumber AND l.moveIndex=? AND l.gameIndex=?
-'''
-                pokemon: List[str] = []
-                name: str
-                async for name, in await cursor.execute(query, params):
-                    length: int
-                    length = sum(len(p) + 2 for p in pokemon) + len(name)
-                    length += len('These Pokemon learns TM00: ')
-                    if length > bot.config.messageLimit:
-                        yield (f'These Pokemon learns {item}: '
-                               + ', '.join(pokemon))
-                        pokemon.clear()
-                    pokemon.append(name)
-                yield f'These Pokemon learns {item}: ' + ', '.join(pokemon)
+                item = f'HM{move.hmNumber:02}'
+            if isFullTmHm:
+                async for message in self._tmhmLearners(move, item, gameIds):
+                    yield message
             else:
-                query = '''
-SELECT COUNT(DISTINCT pokedexNumber)
-    FROM gen1_pokemon_tmhmcompatability
-    WHERE moveIndex=? AND gameIndex=?
-'''
-                await cursor.execute(query, params)
-                tmhmCount: int
-                tmhmCount, = await cursor.fetchone() or (0,)
-                yield f'{tmhmCount} Pokemon learns {item}'
+                count: int
+                count = await self.data.tmhmLearnerCount(moveId, gameIds[0])
+                yield f'{count} Pokemon learns {item}'
 
-    async def pokemonTm(self, isFull: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
-        gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        moveId: Optional[int] = await self._queryMove(isTM=True)
-        if moveId is None:
+    async def _commonLearners(self,
+                              byLevelUp: bool,
+                              byTmHm: bool,
+                              gameIds: Tuple[int, int]) -> AsyncIterator[str]:
+        moves: List[MoveRow] = []
+        text: str
+        for text in _moveSeparator.split(self.query.strip()):
+            if not text:
+                continue
+            moveId: Optional[int] = await self._queryMove(text=text)
+            move: Optional[MoveRow] = None
+            if moveId is not None:
+                move = await self.data.move(moveId)
+            if move is None:
+                yield f'Move Not Found: {text}'
+                return
+            moves.append(move)
+        if not moves:
             yield 'Move Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT gameIndexNumber, name,
-        (SELECT typeName
-            FROM gen1_types
-            WHERE gen1_types.typeIndex=gen1_moves.typeIndex) AS type,
-        basePower, basePP, accuracy, tmNumber, hmNumber
-    FROM gen1_moves
-    WHERE gameIndexNumber=?
-'''
-            await cursor.execute(query, (int(moveId),))
-            move: Optional[Tuple[int, str, str, Optional[int], Optional[int],
-                                 Optional[int], Optional[int], Optional[int]]]
-            move = await cursor.fetchone()
-            if move is None or move[6] is None:
-                yield 'Move Not Found'
-                return
-            yield '''\
-Move Name: {move[1]}, Move Index: {move[0]}, Type: {move[2]}, \
-Base Power: {move[3]}, PP: {move[4]}, Accuracy: {move[5]}'''
-
-            item: str = f'TM{move[6]:02}'
-
-            params: Tuple[int, int] = (moveId, gameIds[0],)
-            if isFull:
-                query = '''
-SELECT p.name
-    FROM gen1_pokemon_tmhmcompatability AS l, gen1_pokemon AS p
-    WHERE p.pokedexNumber=l.pokedexNumber AND l.moveIndex=? AND l.gameIndex=?
-'''
-                pokemon: List[str] = []
-                name: str
-                async for name, in await cursor.execute(query, params):
-                    length: int
-                    length = sum(len(p) + 2 for p in pokemon) + len(name)
-                    length += len('These Pokemon learns TM00: ')
-                    if length > bot.config.messageLimit:
-                        yield (f'These Pokemon learns TM{move[6]:02}:'
-                               + ', '.join(pokemon))
-                        pokemon.clear()
-                    pokemon.append(name)
-                yield f'These Pokemon learns {item}:' + ', '.join(pokemon)
-            else:
-                query = '''
-SELECT COUNT(DISTINCT pokedexNumber)
-    FROM gen1_pokemon_tmhmcompatability
-    WHERE moveIndex=? AND gameIndex=?
-    '''
-                await cursor.execute(query, params)
-                tmhmCount: int
-                tmhmCount, = await cursor.fetchone() or (0,)
-                yield f'{tmhmCount} Pokemon learns {item}'
 
-    async def pokemonHm(self, isFull: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
+        index: LearnsetIndex = await self.data.learnsetIndex()
+        learners: List[str] = index.learners(
+            (move.gameIndexNumber for move in moves), gameIds[0], byLevelUp,
+            byTmHm)
+        names: str = ', '.join(move.name for move in moves)
+        if not learners:
+            yield f'No Pokemon learns {names}'
+            return
+        message: str
+        for message in pack(learners,
+                            f'{len(learners)} Pokemon learns {names}: '):
+            yield message
+
+    async def _tmhmLearners(self,
+                            move: MoveRow,
+                            item: str,
+                            gameIds: Tuple[int, int]) -> AsyncIterator[str]:
+        pokemon: List[str]
+        pokemon = await self.data.tmhmLearners(move.gameIndexNumber,
+                                               gameIds[0])
+        message: str
+        for message in pack(pokemon, f'These Pokemon learns {item}: '):
+            yield message
+
+    async def pokemonEvolve(self) -> AsyncIterator[str]:
+        pokemonId: Optional[int] = await self._queryPokemon()
+        if pokemonId is None:
+            yield 'Pokemon Not Found'
+            return
+        pokemon: Optional[PokemonRow] = await self.data.pokemon(pokemonId)
+        if pokemon is None:
+            yield 'Pokemon Not Found'
+            return
+        yield (f'Pokemon Name: {pokemon.name}, '
+               f'Pokedex Number: {pokemon.pokedexNumber}')
+        evolutions: List[EvolutionRow]
+        evolutions = await self.data.evolutions(pokemonId)
+        evolution: EvolutionRow
+        for evolution in evolutions:
+            if evolution.levelUp:
+                yield (f'Evolves to {evolution.pokemonName} at level '
+                       f'{evolution.levelUp}')
+            elif evolution.itemIndex:
+                yield (f'Evolves to {evolution.pokemonName} with item '
+                       f'{evolution.itemName}')
+            elif evolution.isTrade:
+                yield f'Evolves to {evolution.pokemonName} with trading'
+        if not evolutions:
+            yield f'{pokemon.name} has no evolutions'
+
+    async def _pokemonTmHm(self,
+                           isFull: bool,
+                           isTM: bool,
+                           isHM: bool) -> AsyncIterator[str]:
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        moveId = await self._queryMove(isTM=True)
+        moveId: Optional[int] = await self._queryMove(isTM=isTM, isHM=isHM)
         if moveId is None:
             yield 'Move Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT gameIndexNumber, name,
-        (SELECT typeName
-            FROM gen1_types
-            WHERE gen1_types.typeIndex=gen1_moves.typeIndex) AS type,
-        basePower, basePP, accuracy, tmNumber, hmNumber
-    FROM gen1_moves
-    WHERE gameIndexNumber=?
-'''
-            await cursor.execute(query, (int(moveId),))
-            move: Optional[Tuple[int, str, str, Optional[int], Optional[int],
-                                 Optional[int], Optional[int], Optional[int]]]
-            move = await cursor.fetchone()
-            if move is None or move[7] is None:
-                yield 'Move Not Found'
-                return
-            yield '''\
-Move Name: {move[1]}, Move Index: {move[0]}, Type: {move[2]}, \
-Base Power: {move[3]}, PP: {move[4]}, Accuracy: {move[5]}'''
-
-            item: str = f'HM{move[7]:02}'
-
-            params: Tuple[int, int] = (moveId, gameIds[0],)
-            if isFull:
-                query = '''
-SELECT p.name
-    FROM gen1_pokemon_tmhmcompatability AS l, gen1_pokemon AS p
-    WHERE p.pokedexNumber=l.pokedexNumber AND l.moveIndex=? AND l.gameIndex=?
-'''
-                pokemon: List[str] = []
-                name: str
-                async for name, in await cursor.execute(query, params):
-                    length: int
-                    length = sum(len(p) + 2 for p in pokemon) + len(name)
-                    length += len('These Pokemon learns TM00: ')
-                    if length > bot.config.messageLimit:
-                        yield (f'These Pokemon learns {item}:'
-                               + ', '.join(pokemon))
-                        pokemon.clear()
-                    pokemon.append(name)
-                yield f'These Pokemon learns {item}:' + ', '.join(pokemon)
-            else:
-                query = '''
-SELECT COUNT(DISTINCT pokedexNumber)
-    FROM gen1_pokemon_tmhmcompatability
-    WHERE moveIndex=? AND gameIndex=?
-'''
-                await cursor.execute(query, params)
-                tmhmCount: int
-                tmhmCount, = await cursor.fetchone() or (0,)
-                yield f'{tmhmCount} Pokemon learns {item}'
+        move: Optional[MoveRow] = await self.data.move(moveId)
+        isValid: bool
+        if move is None:
+            isValid = False
+        elif isTM:
+            isValid = move.tmNumber is not None
+        elif isHM:
+            isValid = move.hmNumber is not None
+        else:
+            isValid = move.tmNumber is not None or move.hmNumber is not None
+        if move is None or not isValid:
+            yield 'Move Not Found'
+            return
+        yield _formatMove(move)
+
+        item: str
+        if move.tmNumber is not None:
+            item = f'TM{move.tmNumber:02}'
+        else:
+            item = f'HM{move.hmNumber:02}'
+
+        if isFull:
+            message: str
+            async for message in self._tmhmLearners(move, item, gameIds):
+                yield message
+        else:
+            tmhmCount: int
+            tmhmCount = await self.data.tmhmLearnerCount(moveId, gameIds[0])
+            yield f'{tmhmCount} Pokemon learns {item}'
+
+    async def pokemonTmHm(self, isFull: bool) -> AsyncIterator[str]:
+        message: str
+        async for message in self._pokemonTmHm(isFull, False, False):
+            yield message
+
+    async def pokemonTm(self, isFull: bool) -> AsyncIterator[str]:
+        message: str
+        async for message in self._pokemonTmHm(isFull, True, False):
+            yield message
+
+    async def pokemonHm(self, isFull: bool) -> AsyncIterator[str]:
+        message: str
+        async for message in self._pokemonTmHm(isFull, False, True):
+            yield message
 
     async def pokemonLocation(self, isFull: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
         locationId: Optional[int] = await self._queryLocation(gameIds)
         if locationId is None:
             yield 'Location Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT mapIndex, name, height, width,
-        (SELECT COUNT(*)
-            FROM gen1_location_warps AS w
-            WHERE w.fromMapIndex=l.mapIndex AND w.versionId=?),
-        (SELECT grassEncounterRate
-            FROM gen1_location_used AS u
-            WHERE u.mapIndex=l.mapIndex AND u.versionId=?),
-        (SELECT waterEncounterRate
-            FROM gen1_location_used AS u
-            WHERE u.mapIndex=l.mapIndex AND u.versionId=?),
-        (SELECT COUNT(*)
-            FROM gen1_fishing AS f
-            WHERE f.locationId=l.mapIndex AND f.versionId=?)
-     FROM gen1_locations as l
-    WHERE mapIndex=?
-'''
-            await cursor.execute(query, (gameIds[0],) * 4 + (locationId,))
-            location: Optional[Tuple[int, str, int, int, int, Optional[int],
-                                     Optional[int], int]]
-            location = await cursor.fetchone()
-            if location is None:
-                yield 'Location Not Found'
-                return
-            msg: str = f'''\
-Location Name: {location[1]}, Index: {location[0]}, Height: {location[2]}, \
-Width: {location[3]}, Number of Warps: {location[4]}'''
-            if location[5]:
-                msg += f', Grass Encounter Rate: {location[5]}/256'
-            if location[6]:
-                msg += f', Water Encounter Rate: {location[6]}/256'
-            if location[7]:
-                msg += ', Has Super Rod Fishing'
-            yield msg
-
-            encounters: List[str]
-            name: str
-            minLevel: int
-            maxLevel: int
-            encRate: int
-            level: str
-            rate: float
-
-            params: Tuple[int, int] = (gameIds[0], locationId)
-            query = '''
-SELECT p.name, MIN(w.pokemonLevel), MAX(w.pokemonLevel),
-        SUM(CASE WHEN w.slotIndex IN (0, 1) THEN 51
-            WHEN w.slotIndex=2 THEN 39
-            WHEN w.slotIndex IN (3,4,5) THEN 25
-            WHEN w.slotIndex IN (6,7) THEN 13
-            WHEN w.slotIndex=8 THEN 11
-            WHEN w.slotIndex=9 THEN 3 ELSE 0
-            END) as encounterRate
-    FROM gen1_wild_encounters AS w, gen1_pokemon AS p
-    WHERE w.versionId=? AND w.locationId=? AND w.encounterType='grass'
-        AND p.pokedexNumber=w.pokedexNumber
-    GROUP BY w.pokedexNumber
-    ORDER BY encounterRate DESC
-'''
-            encounters = []
-            await cursor.execute(query, params)
-            async for name, minLevel, maxLevel, encRate in cursor:
-                if minLevel == maxLevel:
-                    level = f'L{minLevel}'
-                else:
-                    level = 'L{minLevel} - L{maxLevel}'
-                rate = round(encRate / 256 * 100, 1)
-                encounters.append(f'{name} {level} @ {rate}%')
-            if encounters:
-                yield 'Grass Encounters: ' + ', '.join(encounters)
-
-            query = '''
-SELECT p.name, MIN(w.pokemonLevel), MAX(w.pokemonLevel),
-        SUM(CASE WHEN w.slotIndex IN (0, 1) THEN 51
-            WHEN w.slotIndex=2 THEN 39
-            WHEN w.slotIndex IN (3,4,5) THEN 25
-            WHEN w.slotIndex IN (6,7) THEN 13
-            WHEN w.slotIndex=8 THEN 11
-            WHEN w.slotIndex=9 THEN 3
-            ELSE 0
-            END) as encounterRate
-    FROM gen1_wild_encounters AS w, gen1_pokemon AS p
-    WHERE w.versionId=? AND w.locationId=? AND w.encounterType='water'
-        AND p.pokedexNumber=w.pokedexNumber
-    GROUP BY w.pokedexNumber
-    ORDER BY encounterRate DESC
-'''
-            encounters = []
-            await cursor.execute(query, params)
-            async for name, minLevel, maxLevel, encRate in cursor:
-                if minLevel == maxLevel:
-                    level = f'L{minLevel}'
-                else:
-                    level = 'L{minLevel} - L{maxLevel}'
-                rate = round(encRate / 256 * 100, 1)
-                encounters.append(f'{name} {level} @ {rate}%')
-            if encounters:
-                yield 'Water Encounters: ' + ', '.join(encounters)
-
-            query = '''
-SELECT p.name, MIN(f.pokemonLevel), MAX(f.pokemonLevel),
-        COUNT(slotIndex) as encounterRatio
-    FROM gen1_fishing AS f, gen1_pokemon AS p
-    WHERE f.versionId=? AND f.locationId=? AND p.pokedexNumber=f.pokedexNumber
-    GROUP BY f.pokedexNumber
-    ORDER BY encounterRatio DESC
-'''
-            fishEnc: List[Tuple[str, int, int, int]] = []
-            encTotal: int = 0
-            await cursor.execute(query, params)
-            async for name, minLevel, maxLevel, encRate in cursor:
-                fishEnc.append((name, minLevel, maxLevel, encRate))
-                encTotal += encRate
+        location: Optional[LocationRow]
+        location = await self.data.location(locationId, gameIds[1])
+        if location is None:
+            yield 'Location Not Found'
+            return
+        properties: List[str] = [
+            f'Location Name: {location.name}',
+            f'Index: {location.mapIndex}',
+            f'Height: {location.height}',
+            f'Width: {location.width}',
+            f'Number of Warps: {location.warps}',
+            ]
+        if location.grassEncounterRate:
+            properties.append(
+                f'Grass Encounter Rate: {location.grassEncounterRate}/256')
+        if location.waterEncounterRate:
+            properties.append(
+                f'Water Encounter Rate: {location.waterEncounterRate}/256')
+        if location.fishing:
+            properties.append('Has Super Rod Fishing')
+        message: str
+        for message in pack(properties):
+            yield message
+
+        encounters: List[str]
+        summary: List[EncounterSummaryRow]
+        row: EncounterSummaryRow
+        rate: float
+        encounterType: str
+        title: str
+        for encounterType, title in [('grass', 'Grass'), ('water', 'Water')]:
+            summary = await self.data.encounterSummary(
+                gameIds[1], locationId, encounterType)
             encounters = []
-            for name, minLevel, maxLevel, encRate in fishEnc:
-                if minLevel == maxLevel:
-                    level = f'L{minLevel}'
-                else:
-                    level = 'L{minLevel} - L{maxLevel}'
-                rate = round(encRate / encTotal * 100, 1)
-                encounters.append(f'{name} {level} @ {rate}%')
-            if encounters:
-                yield 'Super Rod Encounters: ' + ', '.join(encounters)
+            for row in summary:
+                rate = round(row.rate / 256 * 100, 1)
+                level: str = _formatLevelRange(row.minLevel, row.maxLevel)
+                encounters.append(f'{row.name} {level} @ {rate}%')
+            for message in pack(encounters, f'{title} Encounters: '):
+                yield message
 
-    async def pokemonWild(self, isFull: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
+        summary = await self.data.fishingSummary(gameIds[1], locationId)
+        encTotal: int = sum(row.rate for row in summary)
+        encounters = []
+        for row in summary:
+            rate = round(row.rate / encTotal * 100, 1)
+            level = _formatLevelRange(row.minLevel, row.maxLevel)
+            encounters.append(f'{row.name} {level} @ {rate}%')
+        for message in pack(encounters, 'Super Rod Encounters: '):
+            yield message
+
+    async def _pokemonEncounters(self,
+                                 encounterType: str,
+                                 title: str) -> AsyncIterator[str]:
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        locationId = await self._queryLocation(gameIds)
+        locationId: Optional[int] = await self._queryLocation(gameIds)
         if locationId is None:
             yield 'Location Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT mapIndex, name,
-        (SELECT grassEncounterRate
-            FROM gen1_location_used AS u
-            WHERE u.mapIndex=l.mapIndex AND u.versionId=?)
-    FROM gen1_locations as l
-    WHERE mapIndex=?
-'''
-            params: Tuple[int, int] = (gameIds[0], locationId)
-            await cursor.execute(query, params)
-            location: Optional[Tuple[int, str, Optional[int]]]
-            location = await cursor.fetchone()
-            if location is None:
-                yield 'Location Not Found'
-                return
-            msg: str = f'Location Name: {location[1]}, Index: {location[0]}'
-            if location[2]:
-                msg += f', Grass Encounter Rate: {location[2]}/256'
-            yield msg
-
-            query = '''
-SELECT p.name, w.pokemonLevel, w.slotIndex
-    FROM gen1_wild_encounters AS w, gen1_pokemon AS p
-    WHERE w.versionId=? AND w.locationId=? AND w.encounterType='grass'
-        AND p.pokedexNumber=w.pokedexNumber
-    ORDER BY w.slotIndex ASC
-'''
-            first: bool = True
-            name: str
-            level: int
-            slot: int
-            rate: float
-            async for name, level, slot in await cursor.execute(query, params):
-                if first:
-                    yield 'Grass Encounters:'
-                    first = False
-                rate = round(_encounterRate256[slot] / 256 * 100, 1)
-                yield f'Pokemon: {name}, Level: L{level}, Rate: {rate}%'
-
-    async def pokemonSurf(self, isFull: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
-        gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        locationId = await self._queryLocation(gameIds)
-        if locationId is None:
+        location: Optional[LocationRow]
+        location = await self.data.location(locationId, gameIds[1])
+        if location is None:
             yield 'Location Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT mapIndex, name,
-        (SELECT waterEncounterRate
-            FROM gen1_location_used AS u
-            WHERE u.mapIndex=l.mapIndex AND u.versionId=?)
-    FROM gen1_locations as l
-    WHERE mapIndex=?
-'''
-            params: Tuple[int, int] = (gameIds[0], locationId)
-            await cursor.execute(query, params)
-            location: Optional[Tuple[int, str, Optional[int]]]
-            location = await cursor.fetchone()
-            if location is None:
-                yield 'Location Not Found'
-                return
-            msg: str = f'Location Name: {location[1]}, Index: {location[0]}'
-            if location[2]:
-                msg += f', Water Encounter Rate: {location[2]}/256'
-            yield msg
-
-            query = '''
-SELECT p.name, w.pokemonLevel, w.slotIndex
-    FROM gen1_wild_encounters AS w, gen1_pokemon AS p
-    WHERE w.versionId=? AND w.locationId=? AND w.encounterType='water'
-        AND p.pokedexNumber=w.pokedexNumber
-    ORDER BY w.slotIndex ASC
-'''
-            first: bool = True
-            name: str
-            level: int
-            slot: int
-            rate: float
-            async for name, level, slot in await cursor.execute(query, params):
-                if first:
-                    yield 'Water Encounters:'
-                    first = False
-                rate = round(_encounterRate256[slot] / 256 * 100, 1)
-                yield f'Pokemon: {name}, Level: L{level}, Rate: {rate}%'
+        encounterRate: Optional[int]
+        if encounterType == 'grass':
+            encounterRate = location.grassEncounterRate
+        else:
+            encounterRate = location.waterEncounterRate
+        msg: str
+        msg = f'Location Name: {location.name}, Index: {location.mapIndex}'
+        if encounterRate:
+            msg += f', {title} Encounter Rate: {encounterRate}/256'
+        yield msg
+
+        first: bool = True
+        rate: float
+        row: EncounterRow
+        for row in await self.data.encounters(gameIds[1], locationId,
+                                              encounterType):
+            if first:
+                yield f'{title} Encounters:'
+                first = False
+            rate = round(_encounterRate256[row.slotIndex] / 256 * 100, 1)
+            yield f'Pokemon: {row.name}, Level: L{row.level}, Rate: {rate}%'
+
+    async def pokemonWild(self, isFull: bool) -> AsyncIterator[str]:
+        message: str
+        async for message in self._pokemonEncounters('grass', 'Grass'):
+            yield message
+
+    async def pokemonSurf(self, isFull: bool) -> AsyncIterator[str]:
+        message: str
+        async for message in self._pokemonEncounters('water', 'Water'):
+            yield message
 
     async def pokemonFish(self, isFull: bool) -> AsyncIterator[str]:
-        await self._attachDatabase()
         gameIds: Tuple[int, int] = await self._getGameVersionIds()
-        locationId = await self._queryLocation(gameIds)
+        locationId: Optional[int] = await self._queryLocation(gameIds)
         if locationId is None:
             yield 'Location Not Found'
             return
-        cursor: aioodbc.cursor.Cursor
-        query: str
-        async with await self.database.cursor() as cursor:
-            query = '''
-SELECT mapIndex, name FROM gen1_locations as l WHERE mapIndex=?
-'''
-            params: Tuple[int, int] = (gameIds[0], locationId)
-            await cursor.execute(query, params)
-            location: Optional[Tuple[int, str]]
-            location = await cursor.fetchone()
-            if location is None:
-                yield 'Location Not Found'
+        location: Optional[LocationRow]
+        location = await self.data.location(locationId, gameIds[1])
+        if location is None:
+            yield 'Location Not Found'
+            return
+        yield f'Location Name: {location.name}, Index: {location.mapIndex}'
+        fishing: List[EncounterRow]
+        fishing = await self.data.fishing(gameIds[1], locationId)
+        first: bool = True
+        rate: float
+        row: EncounterRow
+        for row in fishing:
+            if first:
+                yield 'Super Rod Encounters:'
+                first = False
+            rate = round(1 / len(fishing) * 100, 1)
+            yield f'Pokemon: {row.name}, Level: L{row.level}, Rate: {rate}%'
+
+    async def _queryAttacker(self,
+                             chart: TypeChart,
+                             text: str) -> Optional[_Attacker]:
+        # Exact type and move names win over misspelled ones
+        fuzzy: bool
+        for fuzzy in False, True:
+            typeName: Optional[str] = chart.typeByName(text, fuzzy)
+            if typeName is not None:
+                return _Attacker(typeName, typeName)
+            moveId: Optional[int] = await self._queryMove(text=text,
+                                                          fuzzy=fuzzy)
+            if moveId is not None:
+                move: Optional[MoveRow] = await self.data.move(moveId)
+                if move is not None:
+                    return _Attacker(f'{move.name} ({move.type})', move.type)
+        return None
+
+    async def _queryDefender(self,
+                             chart: TypeChart,
+                             text: str) -> Optional[_Defender]:
+        # Exact type and pokemon names win over misspelled ones
+        fuzzy: bool
+        for fuzzy in False, True:
+            typeNames: List[Optional[str]] = [chart.typeByName(part, fuzzy)
+                                              for part in text.split('/')]
+            if all(typeNames):
+                # Normal/Normal is Normal, a type is only counted once
+                types: Tuple[str, ...] = tuple(
+                    t for i, t in enumerate(typeNames)
+                    if t is not None and t not in typeNames[:i])
+                return _Defender('/'.join(types), types, None)
+            pokemonId: Optional[int] = await self._queryPokemon(text, fuzzy)
+            if pokemonId is not None and pokemonId in chart.pokemon:
+                name: str
+                name, types = chart.pokemon[pokemonId]
+                return _Defender(f'{name} ({"/".join(types)})', types,
+                                 pokemonId)
+        return None
+
+    async def pokemonType(self) -> AsyncIterator[str]:
+        if self.query.count('/') >= _maxTypes:
+            yield f'A pokemon has at most {_maxTypes} types'
+            return
+        chart: TypeChart = await self.data.typeChart()
+        defender: Optional[_Defender]
+        defender = await self._queryDefender(chart, self.query)
+        if defender is None:
+            yield 'Type or Pokemon Not Found'
+            return
+        message: str
+        if defender.pokemonId is not None:
+            name: str = chart.pokemon[defender.pokemonId][0]
+            yield f'Pokemon Name: {name}, Type: {"/".join(defender.types)}'
+        elif len(defender.types) == 1:
+            position: int = chart.positions[defender.types[0].lower()]
+            category: str = ('Special' if chart.special[position]
+                             else 'Physical')
+            yield f'Type: {defender.name}, Category: {category}'
+            for message in pack(
+                    _formatMultipliers(chart.names, chart.matrix[position]),
+                    'Damage Dealt: ', '; '):
+                yield message
+        else:
+            yield f'Type: {defender.name}'
+        for message in pack(
+                _formatMultipliers(chart.names,
+                                   chart.profile(defender.types)),
+                'Damage Taken: ', '; '):
+            yield message
+
+    async def pokemonMatchup(self) -> AsyncIterator[str]:
+        chart: TypeChart = await self.data.typeChart()
+        # Fire vs Bulbasaur, Thunderbolt, Water/Flying or only an attacker
+        parts: List[str] = re.split(r'\s+vs\.?\s+|\s*,\s*',
+                                    self.query.strip(), maxsplit=1,
+                                    flags=re.IGNORECASE)
+        if '/' in parts[0]:
+            # A move has one type, so only one attacking type is matched up
+            yield 'Please specify one attacking type or move'
+            return
+        if len(parts) > 1 and parts[1].count('/') >= _maxTypes:
+            yield f'A pokemon has at most {_maxTypes} types'
+            return
+        attacker: Optional[_Attacker]
+        attacker = await self._queryAttacker(chart, parts[0])
+        if attacker is None:
+            yield 'Type or Move Not Found'
+            return
+
+        message: str
+        if len(parts) == 1 or not parts[1]:
+            groups: Dict[float, List[str]] = chart.affected(attacker.type)
+            multiplier: float
+            for multiplier in sorted(groups, reverse=True):
+                if multiplier == 1:
+                    continue
+                for message in pack(
+                        groups[multiplier],
+                        f'{attacker.name} {_formatMultiplier(multiplier)}: '):
+                    yield message
+            return
+
+        defender: Optional[_Defender]
+        defender = await self._queryDefender(chart, parts[1])
+        if defender is None:
+            yield 'Type or Pokemon Not Found'
+            return
+        multiplier = chart.multiplier(attacker.type, defender.types)
+        yield (f'{attacker.name} vs {defender.name}: '
+               f'{_formatMultiplier(multiplier)}')
+
+    async def _queryPokemonMove(self, text: str
+                                ) -> Optional[Tuple[int, Optional[int]]]:
+        # Pokemon and move names have spaces, so every place the words can
+        # be split at is tried unless a comma separates them
+        splits: List[Tuple[str, str]]
+        if ',' in text:
+            pokemonText: str
+            moveText: str
+            pokemonText, moveText = text.split(',', 1)
+            splits = [(pokemonText.strip(), moveText.strip())]
+        else:
+            words: List[str] = text.split()
+            splits = [(' '.join(words[:i]), ' '.join(words[i:]))
+                      for i in range(len(words) - 1, 0, -1)]
+            splits.append((text.strip(), ''))
+        fuzzy: bool
+        for fuzzy in False, True:
+            for pokemonText, moveText in splits:
+                if not pokemonText:
+                    continue
+                pokemonId: Optional[int]
+                pokemonId = await self._queryPokemon(pokemonText, fuzzy)
+                if pokemonId is None:
+                    continue
+                if not moveText:
+                    return pokemonId, None
+                moveId: Optional[int] = await self._queryMove(text=moveText,
+                                                              fuzzy=fuzzy)
+                if moveId is not None:
+                    return pokemonId, moveId
+        return None
+
+    async def pokemonDamage(self) -> AsyncIterator[str]:
+        # Pikachu Thunderbolt L50 vs Gyarados L45, without a move every
+        # damaging move is ranked against the defender
+        parts: List[str] = re.split(r'\s+vs\.?\s+', self.query.strip(),
+                                    maxsplit=1, flags=re.IGNORECASE)
+        if len(parts) < 2 or not parts[1]:
+            yield 'Please specify the defending pokemon after vs'
+            return
+        attackerText: str
+        attackerLevel: Optional[int]
+        attackerText, attackerLevel = _parseLevel(parts[0])
+        defenderText: str
+        defenderLevel: Optional[int]
+        defenderText, defenderLevel = _parseLevel(parts[1])
+        if attackerLevel is None:
+            attackerLevel = _defaultLevel
+        if defenderLevel is None:
+            defenderLevel = attackerLevel
+        if not (1 <= attackerLevel <= 100 and 1 <= defenderLevel <= 100):
+            yield 'Levels are from 1 to 100'
+            return
+
+        found: Optional[Tuple[int, Optional[int]]]
+        found = await self._queryPokemonMove(attackerText)
+        if found is None:
+            yield 'Pokemon or Move Not Found'
+            return
+        attackerRow: Optional[PokemonRow] = await self.data.pokemon(found[0])
+        defenderId: Optional[int] = await self._queryPokemon(defenderText)
+        defenderRow: Optional[PokemonRow] = None
+        if defenderId is not None:
+            defenderRow = await self.data.pokemon(defenderId)
+        if attackerRow is None or defenderRow is None:
+            yield 'Pokemon Not Found'
+            return
+
+        chart: TypeChart = await self.data.typeChart()
+        attacker: Combatant = combatant(attackerRow, attackerLevel)
+        defender: Combatant = combatant(defenderRow, defenderLevel)
+        versus: str = (f'{attacker.name} L{attacker.level} vs {defender.name} '
+                       f'L{defender.level} ({defender.hp} HP)')
+        damage: Optional[MoveDamage]
+        if found[1] is None:
+            damages: List[MoveDamage] = bestMoves(
+                chart, attacker, defender, await self.data.damagingMoves())
+            if not damages:
+                yield f'Best Moves of {versus}: None'
                 return
-            yield f'Location Name: {location[1]}, Index: {location[0]}'
-            query = '''
-SELECT p.name, f.pokemonLevel, f.slotIndex
-    FROM gen1_fishing AS f, gen1_pokemon AS p
-    WHERE f.versionId=? AND f.locationId=? AND p.pokedexNumber=f.pokedexNumber
-    ORDER BY f.slotIndex ASC
-'''
-            fishing: List[Tuple[str, int, int]] = []
-            encTotal: int = 0
-            name: str
-            level: int
-            slot: int
-            async for name, level, slot in await cursor.execute(query, params):
-                fishing.append((name, level, slot))
-                encTotal += 1
-            first: bool = True
-            rate: float
-            _slot: int
-            for name, level, _slot in fishing:
-                if first:
-                    yield 'Super Rod Encounters:'
-                    first = False
-                rate = round(1 / encTotal * 100, 1)
-                yield f'Pokemon: {name}, Level: L{level}, Rate: {rate}%'
+            message: str
+            for message in pack(
+                    (f'{damage.move.name} '
+                     f'{_formatDamage(damage.normal, defender.hp)}'
+                     f'{_formatHits(damage)}'
+                     for damage in damages[:_bestMoveCount]),
+                    f'Best Moves of {versus}: '):
+                yield message
+            return
+
+        move: Optional[MoveRow] = await self.data.move(found[1])
+        if move is None:
+            yield 'Move Not Found'
+            return
+        damage = moveDamage(chart, attacker, defender, move)
+        if damage is None:
+            yield f'{move.name} does not use the damage formula'
+            return
+        if not damage.multiplier:
+            yield f'{move.name} of {versus}: No Effect'
+            return
+        yield (f'{move.name} of {versus}: '
+               f'{_formatMultiplier(damage.multiplier)}, '
+               f'{_formatDamage(damage.normal, defender.hp)}'
+               f'{_formatHits(damage)}, Critical Hit '
+               f'({damage.criticalChance:.1%}): '
+               f'{_formatDamage(damage.critical, defender.hp)}')
+
+    async def pokemonCatch(self) -> AsyncIterator[str]:
+        query: _CatchQuery = _parseCatchQuery(self.query)
+        if not query.name:
+            yield 'Pokemon Not Found'
+            return
+        pokemonId: Optional[int] = await self._queryPokemon(query.name)
+        pokemon: Optional[PokemonRow] = None
+        if pokemonId is not None:
+            pokemon = await self.data.pokemon(pokemonId)
+        if pokemon is None:
+            yield 'Pokemon Not Found'
+            return
+        ball: Optional[Ball] = balls['Poke Ball']
+        if query.ball is not None:
+            ball = ballByName(query.ball)
+        if ball is None:
+            yield f'Ball Not Found: {query.ball}'
+            return
+        if not 1 <= query.level <= 100:
+            yield 'Levels are from 1 to 100'
+            return
+        if not 0 < query.hpPercent <= 100:
+            yield 'HP is a percentage above 0 and at most 100'
+            return
+
+        # A wild pokemon has average DVs
+        maxHP: int = averageStats(baseStats(pokemon), query.level)[0]
+        currentHP: int = min(max(round(maxHP * query.hpPercent / 100), 1),
+                             maxHP)
+        odds: CaptureOdds = captureOdds(captureChance(
+            pokemon.catchRate, ball, query.status, maxHP, currentHP))
+        result: str
+        if odds.balls90 is None:
+            result = 'it cannot be caught'
+        else:
+            result = (f'{odds.chance:.1%} per ball, '
+                      f'{odds.expectedBalls:.1f} balls on average, '
+                      f'{odds.balls90} ball{"" if odds.balls90 == 1 else "s"} '
+                      f'for a 90% chance')
+        yield (f'{pokemon.name} L{query.level} (Catch Rate '
+               f'{pokemon.catchRate}), {currentHP}/{maxHP} HP, '
+               f'{query.status.name}, {ball.name}: {result}')
@@ -0,0 +1,166 @@
+import math
+import mmap
+import struct
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional  # noqa: F401
+from typing import Sequence, Tuple, Union, overload  # noqa: F401
+
+Row = Tuple[Any, ...]
+
+# Layout of a compiled dataset, every number is little endian:
+#   header      magic, version, table count, string count, string offset
+#   directory   for each table: name, columns and types as string ids, row
+#               count and the offset of its rows
+#   rows        one fixed width struct array for each table
+#   strings     (offset, length) for each string id, then the UTF-8 bytes
+# Columns are typed i (int32), q (int64), d (float64) or s (string id).
+magic: bytes = b'PKDXGEN1'
+version: int = 1
+
+header: struct.Struct = struct.Struct('<8sIIIQ')
+directoryEntry: struct.Struct = struct.Struct('<IIIIQ')
+stringEntry: struct.Struct = struct.Struct('<II')
+formats: Dict[str, str] = {'i': 'i', 'q': 'q', 'd': 'd', 's': 'I'}
+nulls: Dict[str, Any] = {
+    'i': -2 ** 31, 'q': -2 ** 63, 'd': math.nan, 's': 2 ** 32 - 1}
+
+
+class BinaryTable(Sequence[Row]):
+    '''
+    Read-only view of one table in a compiled dataset
+
+    Rows are unpacked from the mapped file when they are read, nothing is
+    copied up front.
+    '''
+    def __init__(self,
+                 dataset: 'BinaryDataset',
+                 name: str,
+                 columns: List[str],
+                 types: str,
+                 count: int,
+                 offset: int,
+                 selected: Optional[List[int]]=None) -> None:
+        self.dataset: 'BinaryDataset' = dataset
+        self.name: str = name
+        self.columns: List[str] = columns
+        self.types: str = types
+        self._count: int = count
+        self._offset: int = offset
+        self._struct: struct.Struct = struct.Struct(
+            '<' + ''.join(formats[t] for t in types))
+        self._selected: List[int]
+        self._selected = (selected if selected is not None
+                          else list(range(len(columns))))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Row:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Row]:
+        ...
+
+    def __getitem__(self,
+                    index: Union[int, slice]) -> Union[Row, Sequence[Row]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        values: Tuple[Any, ...] = self._struct.unpack_from(
+            self.dataset.buffer, self._offset + index * self._struct.size)
+        return tuple(self._value(self.types[i], values[i])
+                     for i in self._selected)
+
+    def __iter__(self) -> Iterator[Row]:
+        index: int
+        for index in range(self._count):
+            yield self[index]
+
+    def _value(self, type: str, value: Any) -> Any:
+        if type == 'd':
+            return None if math.isnan(value) else value
+        if value == nulls[type]:
+            return None
+        if type == 's':
+            return self.dataset.string(value)
+        return value
+
+    def select(self, columns: Sequence[str]) -> 'BinaryTable':
+        # Same rows with only the given columns, in the given order
+        return BinaryTable(self.dataset, self.name, self.columns, self.types,
+                           self._count, self._offset,
+                           [self.columns.index(c) for c in columns])
+
+
+class BinaryDataset:
+    '''
+    A compiled Gen 1 dataset mapped into memory
+
+    Processes mapping the same file share one copy of it in the page cache.
+    '''
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.tables: Dict[str, BinaryTable] = {}
+        self._stringCount: int = 0
+        self._stringOffset: int = 0
+        self._stringData: int = 0
+        with open(path, 'rb') as file:
+            self.buffer: mmap.mmap = mmap.mmap(file.fileno(), 0,
+                                               access=mmap.ACCESS_READ)
+        try:
+            self._readDirectory()
+        except Exception:
+            self.buffer.close()
+            raise
+
+    def _readDirectory(self) -> None:
+        fileMagic: bytes
+        fileVersion: int
+        tableCount: int
+        (fileMagic, fileVersion, tableCount, self._stringCount,
+         self._stringOffset) = header.unpack_from(self.buffer, 0)
+        if fileMagic != magic:
+            raise ValueError(f'{self.path} is not a compiled pokedex')
+        if fileVersion != version:
+            raise ValueError(f'{self.path} is version {fileVersion}, '
+                             f'expected {version}')
+        self._stringData = (self._stringOffset
+                            + self._stringCount * stringEntry.size)
+        i: int
+        for i in range(tableCount):
+            nameId: int
+            columnsId: int
+            typesId: int
+            count: int
+            offset: int
+            nameId, columnsId, typesId, count, offset = (
+                directoryEntry.unpack_from(
+                    self.buffer, header.size + i * directoryEntry.size))
+            table: BinaryTable = BinaryTable(
+                self, self.string(nameId), self.string(columnsId).split(','),
+                self.string(typesId), count, offset)
+            self.tables[table.name] = table
+
+    def string(self, stringId: int) -> str:
+        if not 0 <= stringId < self._stringCount:
+            raise IndexError(stringId)
+        offset: int
+        length: int
+        offset, length = stringEntry.unpack_from(
+            self.buffer, self._stringOffset + stringId * stringEntry.size)
+        start: int = self._stringData + offset
+        return self.buffer[start:start + length].decode('utf-8')
+
+    def select(self,
+               columns: Mapping[str, Sequence[str]]
+               ) -> Dict[str, BinaryTable]:
+        return {name: self.tables[name].select(tableColumns)
+                for name, tableColumns in columns.items()}
+
+    def close(self) -> None:
+        self.buffer.close()
@@ -0,0 +1,528 @@
+import asyncio
+import os
+import time
+
+from bot import utils
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, Dict, List  # noqa: F401
+from typing import Mapping, Optional, Sequence, Set, Tuple  # noqa: F401
+
+from .backend import Cursor, Database
+from .config import config
+from .gen1binary import BinaryDataset
+from .gen1source import EncounterRow, EncounterSummaryRow, EvolutionRow
+from .gen1source import IndexRow, LocationRow, MoveRow, PokedexEntryRow
+from .gen1source import PokemonRow, Source, nameTables
+from .learnset import LearnsetIndex
+from .namematch import NameIndex
+from .typechart import TypeChart
+
+Row = Tuple[Any, ...]
+
+# Columns loaded for each table, every row is kept in this column order
+tables: Dict[str, Tuple[str, ...]] = {
+    'gen1_games': ('id', 'gameName', 'shortName'),
+    'gen1_game_versions': ('id', 'gameIndex', 'versionName', 'shortName'),
+    'gen1_types': ('typeIndex', 'typeName', 'isSpecial'),
+    'gen1_type_effectiveness': ('attackType', 'defendType', 'modifier'),
+    'gen1_experiencecurve': ('curveIndex', 'name'),
+    'gen1_pokemon': (
+        'pokedexNumber', 'gameIndexNumber', 'name', 'type1', 'type2',
+        'heightMeters', 'weightKilograms', 'catchRate', 'baseExperience',
+        'experienceCurve', 'baseHP', 'baseAttack', 'baseDefense', 'baseSpeed',
+        'baseSpecial'),
+    'gen1_pokedex_entries': ('pokedexNumber', 'versionId', 'entry'),
+    'gen1_moves': (
+        'gameIndexNumber', 'name', 'typeIndex', 'basePower', 'basePP',
+        'accuracy', 'tmNumber', 'hmNumber', 'targetEnemy', 'hasChargingTurn',
+        'healRate', 'drainRate', 'primaryEffect', 'secondEffect',
+        'secondEffectChance', 'staticDamage', 'effectMinTurns',
+        'effectMaxTurns', 'enemyStageModifier', 'attackStageModifier',
+        'defenseStageModifier', 'speedStageModifier', 'specialStageModifier',
+        'accuracyStageModifier', 'evasionStageModifier'),
+    'gen1_pokemon_levelup': (
+        'pokedexNumber', 'moveIndex', 'gameIndex', 'levelUp', 'levelUpOrder'),
+    'gen1_pokemon_tmhmcompatability': (
+        'pokedexNumber', 'moveIndex', 'gameIndex'),
+    'gen1_locations': ('mapIndex', 'name', 'width', 'height'),
+    'gen1_location_used': (
+        'mapIndex', 'versionId', 'grassEncounterRate', 'waterEncounterRate'),
+    'gen1_location_warps': (
+        'versionId', 'fromMapIndex', 'fromWarpIndex', 'toMapIndex',
+        'toWarpIndex'),
+    'gen1_wild_encounters': (
+        'versionId', 'locationId', 'encounterType', 'slotIndex',
+        'pokedexNumber', 'pokemonLevel'),
+    'gen1_fishing': (
+        'method', 'versionId', 'locationId', 'slotIndex', 'pokedexNumber',
+        'pokemonLevel'),
+    'gen1_items': ('hexIndex', 'name'),
+    'gen1_trainer_class': ('gameIndex', 'className'),
+    'gen1_pokemon_evolution': (
+        'fromPokedexNumber', 'toPokedexNumber', 'levelUp', 'itemIndex',
+        'isTrade'),
+    }
+
+_encounterRate256: Tuple[int, ...]
+_encounterRate256 = 51, 51, 39, 25, 25, 25, 13, 13, 11, 3
+
+_retryDelay: float = 300.0
+
+_snapshot: Optional['Snapshot'] = None
+# The mapped file a snapshot from loadFile reads from, it stays open for the
+# lifetime of the process
+_dataset: Optional[BinaryDataset] = None
+_lock: Optional[asyncio.Lock] = None
+_failedAt: Optional[float] = None
+_fileTried: bool = False
+
+
+class Snapshot(Source):
+    '''
+    Read-only Gen 1 dataset indexed by the keys the commands look up
+
+    The small tables are decoded into rows once. The large ones, pokedex
+    entries, level up moves and encounters, are only indexed by position and
+    each read fetches its rows from the table in rows. When rows are the
+    views of a mapped BinaryDataset those reads come from the file mapping,
+    which processes share through the page cache, instead of a copy per
+    process.
+    '''
+    def __init__(self, rows: Mapping[str, Sequence[Row]]) -> None:
+        self.rows: Mapping[str, Sequence[Row]] = rows
+        self.versions: Dict[str, Tuple[int, int]] = {}
+        self.types: Dict[int, str] = {}
+        self.curves: Dict[int, str] = {}
+        self.items: Dict[int, str] = {}
+        self.trainerClasses: Dict[int, str] = {}
+        self.pokemonById: Dict[int, PokemonRow] = {}
+        self.pokemonIdByIndex: Dict[int, int] = {}
+        self.pokemonIdByName: Dict[str, int] = {}
+        self.entries: Dict[Tuple[int, int], int] = {}
+        self.moves: Dict[int, MoveRow] = {}
+        self.moveIdByTm: Dict[int, int] = {}
+        self.moveIdByHm: Dict[int, int] = {}
+        self.moveIdByName: Dict[str, int] = {}
+        self.damaging: List[MoveRow] = []
+        # Positions of rows in their table, read with _read
+        self.levelUpByPokemon: DefaultDict[Tuple[int, int], List[int]]
+        self.levelUpByPokemon = defaultdict(list)
+        self.levelUpByMove: DefaultDict[Tuple[int, int], List[int]]
+        self.levelUpByMove = defaultdict(list)
+        self.tmhmByPokemon: DefaultDict[Tuple[int, int], List[int]]
+        self.tmhmByPokemon = defaultdict(list)
+        self.tmhmByMove: DefaultDict[Tuple[int, int], List[int]]
+        self.tmhmByMove = defaultdict(list)
+        self.locations: Dict[int, Row] = {}
+        self.locationIdsByName: DefaultDict[str, List[int]]
+        self.locationIdsByName = defaultdict(list)
+        self.locationUsed: Dict[Tuple[int, int], Row] = {}
+        self.warpCounts: DefaultDict[Tuple[int, int], int]
+        self.warpCounts = defaultdict(int)
+        self.wild: DefaultDict[Tuple[int, int, str], List[int]]
+        self.wild = defaultdict(list)
+        self.fishingSlots: DefaultDict[Tuple[int, int], List[int]]
+        self.fishingSlots = defaultdict(list)
+        self.evolutionsByPokemon: DefaultDict[int, List[EvolutionRow]]
+        self.evolutionsByPokemon = defaultdict(list)
+        self.names: Dict[str, NameIndex] = {}
+        self.chart: TypeChart
+        self.learnset: LearnsetIndex
+        self._build(rows)
+
+    def _build(self, rows: Mapping[str, Sequence[Row]]) -> None:
+        row: Row
+        gameIds: Set[int] = {row[0] for row in rows['gen1_games']}
+        for row in rows['gen1_game_versions']:
+            if row[1] in gameIds:
+                self.versions[row[3]] = row[1], row[0]
+        self.types = {row[0]: row[1] for row in rows['gen1_types']}
+        self.curves = {row[0]: row[1] for row in rows['gen1_experiencecurve']}
+        self.items = {row[0]: row[1] for row in rows['gen1_items']}
+        self.trainerClasses = {row[0]: row[1]
+                               for row in rows['gen1_trainer_class']}
+
+        for row in rows['gen1_pokemon']:
+            self.pokemonById[row[0]] = PokemonRow(
+                row[0], row[1], row[2], self.types[row[3]],
+                self.types.get(row[4]) if row[4] is not None else None,
+                self.curves[row[9]], row[7], row[5], row[6], row[10],
+                row[11], row[12], row[13], row[14])
+            self.pokemonIdByIndex.setdefault(row[1], row[0])
+            self.pokemonIdByName.setdefault(row[2].lower(), row[0])
+        i: int
+        for i, row in enumerate(rows['gen1_pokedex_entries']):
+            self.entries[row[0], row[1]] = i
+
+        for row in rows['gen1_moves']:
+            self.moves[row[0]] = MoveRow(row[0], row[1], self.types[row[2]],
+                                         *row[3:])
+            if row[6] is not None:
+                self.moveIdByTm[row[6]] = row[0]
+            if row[7] is not None:
+                self.moveIdByHm[row[7]] = row[0]
+            self.moveIdByName.setdefault(row[1].lower(), row[0])
+        self.damaging = [move for _, move in sorted(self.moves.items())
+                         if move.basePower is not None]
+
+        levelUp: Sequence[Row] = rows['gen1_pokemon_levelup']
+        for i in _ordered(levelUp, lambda r: (r[0], r[3], r[4])):
+            row = levelUp[i]
+            self.levelUpByPokemon[row[0], row[2]].append(i)
+            self.levelUpByMove[row[1], row[2]].append(i)
+        for row in sorted(rows['gen1_pokemon_tmhmcompatability']):
+            self.tmhmByPokemon[row[0], row[2]].append(row[1])
+            self.tmhmByMove[row[1], row[2]].append(row[0])
+
+        for row in sorted(rows['gen1_locations']):
+            self.locations[row[0]] = row
+            self.locationIdsByName[row[1].lower()].append(row[0])
+        for row in rows['gen1_location_used']:
+            self.locationUsed[row[0], row[1]] = row
+        for row in rows['gen1_location_warps']:
+            self.warpCounts[row[0], row[1]] += 1
+        wild: Sequence[Row] = rows['gen1_wild_encounters']
+        for i in _ordered(wild, lambda r: r[3]):
+            row = wild[i]
+            self.wild[row[0], row[1], row[2]].append(i)
+        fishing: Sequence[Row] = rows['gen1_fishing']
+        for i in _ordered(fishing, lambda r: r[3]):
+            row = fishing[i]
+            if row[2] is not None:
+                self.fishingSlots[row[1], row[2]].append(i)
+
+        for row in sorted(rows['gen1_pokemon_evolution']):
+            self.evolutionsByPokemon[row[0]].append(EvolutionRow(
+                row[1], row[2], row[3], row[4],
+                self.pokemonById[row[1]].name,
+                self.items.get(row[3]) if row[3] is not None else None))
+
+        kind: str
+        table: str
+        for kind, table in nameTables.items():
+            self.names[kind] = NameIndex(row[tables[table].index('name')]
+                                         for row in rows[table])
+
+        self.chart = TypeChart(
+            rows['gen1_types'], rows['gen1_type_effectiveness'],
+            ((p.pokedexNumber, p.name, p.type1, p.type2)
+             for p in self.pokemonById.values()))
+        self.learnset = LearnsetIndex(
+            ((p.pokedexNumber, p.name) for p in self.pokemonById.values()),
+            (row[:3] for row in rows['gen1_pokemon_levelup']),
+            rows['gen1_pokemon_tmhmcompatability'])
+
+    async def gameVersionIds(self, game: str) -> Tuple[int, int]:
+        return self.versions.get(game, (0, 0))
+
+    async def pokemonByIndex(self, gameIndex: int) -> Optional[int]:
+        return self.pokemonIdByIndex.get(gameIndex)
+
+    async def pokemonByName(self, name: str) -> Optional[int]:
+        return self.pokemonIdByName.get(name.lower())
+
+    async def moveByMachine(self,
+                            number: int,
+                            isTM: bool,
+                            isHM: bool) -> Optional[int]:
+        moveId: Optional[int] = None
+        if isHM:
+            moveId = self.moveIdByHm.get(number)
+        if isTM and moveId is None:
+            moveId = self.moveIdByTm.get(number)
+        return moveId
+
+    async def moveByName(self, name: str) -> Optional[int]:
+        return self.moveIdByName.get(name.lower())
+
+    async def locationByIndex(self,
+                              mapIndex: int,
+                              versionId: int) -> Optional[int]:
+        if (mapIndex, versionId) in self.locationUsed:
+            return mapIndex
+        return None
+
+    async def locationByName(self,
+                             name: str,
+                             versionId: int) -> Optional[int]:
+        mapIndex: int
+        for mapIndex in self.locationIdsByName.get(name.lower(), []):
+            if (mapIndex, versionId) in self.locationUsed:
+                return mapIndex
+        return None
+
+    async def closestName(self, kind: str, name: str) -> Optional[str]:
+        return self.names[kind].match(name)
+
+    async def pokedexEntry(self,
+                           pokemonId: int,
+                           versionId: int) -> Optional[PokedexEntryRow]:
+        pokemon: Optional[PokemonRow] = self.pokemonById.get(pokemonId)
+        if pokemon is None:
+            return None
+        return PokedexEntryRow(pokemon.pokedexNumber, pokemon.name,
+                               pokemon.heightMeters, pokemon.weightKilograms,
+                               self._entry(pokemonId, versionId))
+
+    async def pokemon(self, pokemonId: int) -> Optional[PokemonRow]:
+        return self.pokemonById.get(pokemonId)
+
+    async def levelUpCounts(self,
+                            pokemonId: int,
+                            gameId: int) -> List[Tuple[int, int]]:
+        counts: Dict[int, int] = {}
+        row: Row
+        for row in self._read('gen1_pokemon_levelup',
+                              self.levelUpByPokemon.get((pokemonId, gameId),
+                                                        [])):
+            counts[row[3]] = counts.get(row[3], 0) + 1
+        return sorted(counts.items())
+
+    async def levelUpMoves(self,
+                           pokemonId: int,
+                           gameId: int) -> List[Tuple[int, str]]:
+        return [(row[3], self.moves[row[1]].name)
+                for row in self._read(
+                    'gen1_pokemon_levelup',
+                    self.levelUpByPokemon.get((pokemonId, gameId), []))]
+
+    async def tmCount(self, pokemonId: int, gameId: int) -> int:
+        return sum(1 for moveId in self.tmhmByPokemon.get((pokemonId, gameId),
+                                                          [])
+                   if self.moves[moveId].tmNumber is not None)
+
+    async def tmMoves(self,
+                      pokemonId: int,
+                      gameId: int) -> List[Tuple[str, int]]:
+        moves: List[MoveRow]
+        moves = [self.moves[moveId]
+                 for moveId in self.tmhmByPokemon.get((pokemonId, gameId), [])
+                 if self.moves[moveId].tmNumber is not None]
+        return [(move.name, move.tmNumber)
+                for move in sorted(moves, key=lambda m: m.tmNumber)]
+
+    async def hmMoves(self,
+                      pokemonId: int,
+                      gameId: int) -> List[Tuple[str, int]]:
+        moves: List[MoveRow]
+        moves = [self.moves[moveId]
+                 for moveId in self.tmhmByPokemon.get((pokemonId, gameId), [])
+                 if self.moves[moveId].hmNumber is not None]
+        return [(move.name, move.hmNumber)
+                for move in sorted(moves, key=lambda m: m.hmNumber)]
+
+    async def index(self, number: int, versionId: int) -> IndexRow:
+        pokemonByDex: Optional[PokemonRow] = self.pokemonById.get(number)
+        pokemonByIndex: Optional[PokemonRow] = None
+        if number in self.pokemonIdByIndex:
+            pokemonByIndex = self.pokemonById[self.pokemonIdByIndex[number]]
+        move: Optional[MoveRow] = self.moves.get(number)
+        location: Optional[str] = None
+        if (number, versionId) in self.locationUsed:
+            location = self.locations[number][1]
+        return IndexRow(
+            pokemonByDex.name if pokemonByDex is not None else None,
+            pokemonByIndex.name if pokemonByIndex is not None else None,
+            move.name if move is not None else None,
+            self.items.get(number),
+            self.curves.get(number),
+            self.types.get(number),
+            self.trainerClasses.get(number),
+            location)
+
+    async def move(self, moveId: int) -> Optional[MoveRow]:
+        return self.moves.get(moveId)
+
+    async def damagingMoves(self) -> List[MoveRow]:
+        return self.damaging
+
+    async def moveLearnerCounts(self,
+                                moveId: int,
+                                gameId: int) -> Dict[bool, int]:
+        pokemon: Dict[bool, Set[int]] = {False: set(), True: set()}
+        row: Row
+        for row in self._read('gen1_pokemon_levelup',
+                              self.levelUpByMove.get((moveId, gameId), [])):
+            pokemon[row[3] == 1].add(row[0])
+        return {starts: len(ids) for starts, ids in pokemon.items()}
+
+    async def moveLearners(self,
+                           moveId: int,
+                           gameId: int) -> List[Tuple[str, int]]:
+        return [(self.pokemonById[row[0]].name, row[3])
+                for row in self._read(
+                    'gen1_pokemon_levelup',
+                    self.levelUpByMove.get((moveId, gameId), []))]
+
+    async def tmhmLearnerCount(self, moveId: int, gameId: int) -> int:
+        return len(set(self.tmhmByMove.get((moveId, gameId), [])))
+
+    async def tmhmLearners(self, moveId: int, gameId: int) -> List[str]:
+        return [self.pokemonById[pokemonId].name
+                for pokemonId in self.tmhmByMove.get((moveId, gameId), [])]
+
+    async def learnsetIndex(self) -> LearnsetIndex:
+        return self.learnset
+
+    async def evolutions(self, pokemonId: int) -> List[EvolutionRow]:
+        return list(self.evolutionsByPokemon.get(pokemonId, []))
+
+    async def location(self,
+                       locationId: int,
+                       versionId: int) -> Optional[LocationRow]:
+        location: Optional[Row] = self.locations.get(locationId)
+        if location is None:
+            return None
+        used: Optional[Row] = self.locationUsed.get((locationId, versionId))
+        return LocationRow(
+            location[0], location[1], location[3], location[2],
+            self.warpCounts.get((versionId, locationId), 0),
+            used[2] if used is not None else None,
+            used[3] if used is not None else None,
+            len(self.fishingSlots.get((versionId, locationId), [])))
+
+    async def encounterSummary(self,
+                               versionId: int,
+                               locationId: int,
+                               encounterType: str
+                               ) -> List[EncounterSummaryRow]:
+        return self._summarize(
+            ((row[4], row[5], _encounterRate256[row[3]])
+             for row in self._wild(versionId, locationId, encounterType)))
+
+    async def encounters(self,
+                         versionId: int,
+                         locationId: int,
+                         encounterType: str) -> List[EncounterRow]:
+        return [EncounterRow(self.pokemonById[row[4]].name, row[5], row[3])
+                for row in self._wild(versionId, locationId, encounterType)]
+
+    async def fishingSummary(self,
+                             versionId: int,
+                             locationId: int) -> List[EncounterSummaryRow]:
+        return self._summarize(
+            ((row[4], row[5], 1)
+             for row in self._fishing(versionId, locationId)))
+
+    async def fishing(self,
+                      versionId: int,
+                      locationId: int) -> List[EncounterRow]:
+        return [EncounterRow(self.pokemonById[row[4]].name, row[5], row[3])
+                for row in self._fishing(versionId, locationId)]
+
+    async def typeChart(self) -> TypeChart:
+        return self.chart
+
+    def _read(self, table: str, positions: Sequence[int]) -> List[Row]:
+        rows: Sequence[Row] = self.rows[table]
+        return [rows[i] for i in positions]
+
+    def _entry(self, pokemonId: int, versionId: int) -> Optional[str]:
+        position: Optional[int] = self.entries.get((pokemonId, versionId))
+        if position is None:
+            return None
+        return self.rows['gen1_pokedex_entries'][position][2]
+
+    def _wild(self,
+              versionId: int,
+              locationId: int,
+              encounterType: str) -> List[Row]:
+        return self._read('gen1_wild_encounters',
+                          self.wild.get((versionId, locationId,
+                                         encounterType), []))
+
+    def _fishing(self, versionId: int, locationId: int) -> List[Row]:
+        return self._read('gen1_fishing',
+                          self.fishingSlots.get((versionId, locationId), []))
+
+    def _summarize(self, slots: Any) -> List[EncounterSummaryRow]:
+        summary: Dict[int, List[int]] = {}
+        pokemonId: int
+        level: int
+        rate: int
+        for pokemonId, level, rate in slots:
+            if pokemonId not in summary:
+                summary[pokemonId] = [level, level, 0]
+            summary[pokemonId][0] = min(summary[pokemonId][0], level)
+            summary[pokemonId][1] = max(summary[pokemonId][1], level)
+            summary[pokemonId][2] += rate
+        ordered: List[int] = sorted(summary,
+                                    key=lambda p: (-summary[p][2], p))
+        return [EncounterSummaryRow(self.pokemonById[pokemonId].name,
+                                    *summary[pokemonId])
+                for pokemonId in ordered]
+
+
+def _ordered(rows: Sequence[Row], key: Callable[[Row], Any]) -> List[int]:
+    # Positions in the order of sorted(rows, key=key)
+    return sorted(range(len(rows)), key=lambda i: key(rows[i]))
+
+
+async def _readTables(database: Database) -> Dict[str, List[Row]]:
+    rows: Dict[str, List[Row]] = {}
+    cursor: Cursor
+    table: str
+    columns: Tuple[str, ...]
+    async with await database.cursor() as cursor:
+        for table, columns in tables.items():
+            query: str = f'SELECT {", ".join(columns)} FROM {table}'
+            await cursor.execute(query)
+            rows[table] = [tuple(row) async for row in cursor]
+    return rows
+
+
+def current() -> Optional[Snapshot]:
+    return _snapshot
+
+
+def loadFile() -> Optional[Snapshot]:
+    '''
+    Returns the process wide snapshot, building it from the compiled dataset
+    at config.binaryPath on first use
+
+    The file stays mapped and the snapshot reads its large tables from it.
+    The file is only tried once. None is returned if it does not exist or
+    cannot be read, then the snapshot is read from the database instead.
+    '''
+    global _snapshot, _dataset, _fileTried
+    if _snapshot is not None or _fileTried:
+        return _snapshot
+    _fileTried = True
+    if not os.path.isfile(config.binaryPath):
+        return None
+    try:
+        dataset: BinaryDataset = BinaryDataset(config.binaryPath)
+        try:
+            _snapshot = Snapshot(dataset.select(tables))
+        except Exception:
+            dataset.close()
+            raise
+        _dataset = dataset
+    except Exception:
+        utils.logException()
+    return _snapshot
+
+
+async def load(database: Database) -> Optional[Snapshot]:
+    '''
+    Returns the process wide snapshot, reading it with database on first use
+
+    If reading fails, None is returned and loading is not tried again for a
+    while so the commands can fall back to SQL.
+    '''
+    global _snapshot, _lock, _failedAt
+    if _snapshot is not None:
+        return _snapshot
+    if _failedAt is not None and time.monotonic() - _failedAt < _retryDelay:
+        return None
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        if _snapshot is None:
+            try:
+                _snapshot = Snapshot(await _readTables(database))
+                _failedAt = None
+            except Exception:
+                utils.logException()
+                _failedAt = time.monotonic()
+    return _snapshot
@@ -0,0 +1,249 @@
+from decimal import Decimal  # noqa: F401
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union  # noqa: F401
+from typing import TYPE_CHECKING  # noqa: F401
+
+if TYPE_CHECKING:
+    from .learnset import LearnsetIndex  # noqa: F401
+    from .typechart import TypeChart  # noqa: F401
+
+Number = Union[int, float, Decimal]
+
+# Tables whose names can be looked up by a misspelling
+nameTables: Dict[str, str] = {
+    'pokemon': 'gen1_pokemon',
+    'move': 'gen1_moves',
+    'location': 'gen1_locations',
+    'item': 'gen1_items',
+    }
+
+
+class PokedexEntryRow(NamedTuple):
+    pokedexNumber: int
+    name: str
+    heightMeters: Number
+    weightKilograms: Number
+    entry: str
+
+
+class PokemonRow(NamedTuple):
+    pokedexNumber: int
+    gameIndexNumber: int
+    name: str
+    type1: str
+    type2: Optional[str]
+    experienceCurve: str
+    catchRate: int
+    heightMeters: Number
+    weightKilograms: Number
+    baseHP: int
+    baseAttack: int
+    baseDefense: int
+    baseSpeed: int
+    baseSpecial: int
+
+
+class MoveRow(NamedTuple):
+    gameIndexNumber: int
+    name: str
+    type: str
+    basePower: Optional[int]
+    basePP: Optional[int]
+    accuracy: Optional[int]
+    tmNumber: Optional[int]
+    hmNumber: Optional[int]
+    targetEnemy: bool
+    hasChargingTurn: bool
+    healRate: Optional[Number]
+    drainRate: Optional[Number]
+    primaryEffect: Optional[str]
+    secondEffect: Optional[str]
+    secondEffectChance: Optional[Number]
+    staticDamage: Optional[Number]
+    effectMinTurns: Optional[Number]
+    effectMaxTurns: Optional[Number]
+    enemyStageModifier: Optional[bool]
+    attackStageModifier: Optional[int]
+    defenseStageModifier: Optional[int]
+    speedStageModifier: Optional[int]
+    specialStageModifier: Optional[int]
+    accuracyStageModifier: Optional[int]
+    evasionStageModifier: Optional[int]
+
+
+class IndexRow(NamedTuple):
+    pokemonByDex: Optional[str]
+    pokemonByIndex: Optional[str]
+    move: Optional[str]
+    item: Optional[str]
+    experienceCurve: Optional[str]
+    type: Optional[str]
+    trainerClass: Optional[str]
+    location: Optional[str]
+
+
+class EvolutionRow(NamedTuple):
+    toPokedexNumber: int
+    levelUp: Optional[int]
+    itemIndex: Optional[int]
+    isTrade: bool
+    pokemonName: str
+    itemName: Optional[str]
+
+
+class LocationRow(NamedTuple):
+    mapIndex: int
+    name: str
+    height: int
+    width: int
+    warps: int
+    grassEncounterRate: Optional[int]
+    waterEncounterRate: Optional[int]
+    fishing: int
+
+
+class EncounterSummaryRow(NamedTuple):
+    name: str
+    minLevel: int
+    maxLevel: int
+    rate: int
+
+
+class EncounterRow(NamedTuple):
+    name: str
+    level: int
+    slotIndex: int
+
+
+class Source:
+    '''
+    Read access to the Gen 1 dataset used by Generation1
+
+    Every method returns plain rows so the same formatting code can be used
+    regardless of where the data comes from.
+    '''
+    async def gameVersionIds(self, game: str) -> Tuple[int, int]:
+        raise NotImplementedError()
+
+    async def pokemonByIndex(self, gameIndex: int) -> Optional[int]:
+        raise NotImplementedError()
+
+    async def pokemonByName(self, name: str) -> Optional[int]:
+        raise NotImplementedError()
+
+    async def moveByMachine(self,
+                            number: int,
+                            isTM: bool,
+                            isHM: bool) -> Optional[int]:
+        # An HM wins over a TM with the same number
+        raise NotImplementedError()
+
+    async def moveByName(self, name: str) -> Optional[int]:
+        raise NotImplementedError()
+
+    async def locationByIndex(self,
+                              mapIndex: int,
+                              versionId: int) -> Optional[int]:
+        raise NotImplementedError()
+
+    async def locationByName(self,
+                             name: str,
+                             versionId: int) -> Optional[int]:
+        raise NotImplementedError()
+
+    async def closestName(self, kind: str, name: str) -> Optional[str]:
+        # kind is one of nameTables, the spelling in the dataset is returned
+        raise NotImplementedError()
+
+    async def pokedexEntry(self,
+                           pokemonId: int,
+                           versionId: int) -> Optional[PokedexEntryRow]:
+        raise NotImplementedError()
+
+    async def pokemon(self, pokemonId: int) -> Optional[PokemonRow]:
+        raise NotImplementedError()
+
+    async def levelUpCounts(self,
+                            pokemonId: int,
+                            gameId: int) -> List[Tuple[int, int]]:
+        raise NotImplementedError()
+
+    async def levelUpMoves(self,
+                           pokemonId: int,
+                           gameId: int) -> List[Tuple[int, str]]:
+        raise NotImplementedError()
+
+    async def tmCount(self, pokemonId: int, gameId: int) -> int:
+        raise NotImplementedError()
+
+    async def tmMoves(self,
+                      pokemonId: int,
+                      gameId: int) -> List[Tuple[str, int]]:
+        raise NotImplementedError()
+
+    async def hmMoves(self,
+                      pokemonId: int,
+                      gameId: int) -> List[Tuple[str, int]]:
+        raise NotImplementedError()
+
+    async def index(self, number: int, versionId: int) -> IndexRow:
+        raise NotImplementedError()
+
+    async def move(self, moveId: int) -> Optional[MoveRow]:
+        raise NotImplementedError()
+
+    async def damagingMoves(self) -> List[MoveRow]:
+        # Moves with a base power, by game index
+        raise NotImplementedError()
+
+    async def moveLearnerCounts(self,
+                                moveId: int,
+                                gameId: int) -> Dict[bool, int]:
+        raise NotImplementedError()
+
+    async def moveLearners(self,
+                           moveId: int,
+                           gameId: int) -> List[Tuple[str, int]]:
+        raise NotImplementedError()
+
+    async def tmhmLearnerCount(self, moveId: int, gameId: int) -> int:
+        raise NotImplementedError()
+
+    async def tmhmLearners(self, moveId: int, gameId: int) -> List[str]:
+        raise NotImplementedError()
+
+    async def learnsetIndex(self) -> 'LearnsetIndex':
+        raise NotImplementedError()
+
+    async def evolutions(self, pokemonId: int) -> List[EvolutionRow]:
+        raise NotImplementedError()
+
+    async def location(self,
+                       locationId: int,
+                       versionId: int) -> Optional[LocationRow]:
+        raise NotImplementedError()
+
+    async def encounterSummary(self,
+                               versionId: int,
+                               locationId: int,
+                               encounterType: str
+                               ) -> List[EncounterSummaryRow]:
+        raise NotImplementedError()
+
+    async def encounters(self,
+                         versionId: int,
+                         locationId: int,
+                         encounterType: str) -> List[EncounterRow]:
+        raise NotImplementedError()
+
+    async def fishingSummary(self,
+                             versionId: int,
+                             locationId: int) -> List[EncounterSummaryRow]:
+        raise NotImplementedError()
+
+    async def fishing(self,
+                      versionId: int,
+                      locationId: int) -> List[EncounterRow]:
+        raise NotImplementedError()
+
+    async def typeChart(self) -> 'TypeChart':
+        raise NotImplementedError()
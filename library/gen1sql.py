@@ -0,0 +1,499 @@
+import time
+
+from typing import Any, Dict, List, Optional, Tuple  # noqa: F401
+
+from . import slowquery
+from .backend import Cursor, Database
+from .gen1source import EncounterRow, EncounterSummaryRow, EvolutionRow
+from .gen1source import IndexRow, LocationRow, MoveRow, PokedexEntryRow
+from .gen1source import PokemonRow, Source, nameTables
+from .learnset import LearnsetIndex
+from .metrics import QueryStatistics
+from .namematch import NameIndex
+from .typechart import TypeChart
+
+# The game versions never change, resolved once for the whole process
+_versionIds: Optional[Dict[str, Tuple[int, int]]] = None
+# Neither do the names, each index is built the first time it is needed
+_names: Dict[str, NameIndex] = {}
+_typeChart: Optional[TypeChart] = None
+_damagingMoves: Optional[List[MoveRow]] = None
+_learnsetIndex: Optional[LearnsetIndex] = None
+
+
+class SqlSource(Source):
+    def __init__(self,
+                 database: Database,
+                 statistics: Optional[QueryStatistics]=None) -> None:
+        self.database: Database = database
+        self.statistics: QueryStatistics = statistics or QueryStatistics()
+
+    async def _fetchone(self, query: str, params: Tuple[Any, ...]) -> Any:
+        start: float = time.perf_counter()
+        row: Any
+        cursor: Cursor
+        async with await self.database.cursor() as cursor:
+            await cursor.execute(query, params)
+            row = await cursor.fetchone()
+        await self._record(query, params, start, int(row is not None))
+        return row
+
+    async def _fetchall(self,
+                        query: str,
+                        params: Tuple[Any, ...]) -> List[Any]:
+        start: float = time.perf_counter()
+        rows: List[Any]
+        cursor: Cursor
+        async with await self.database.cursor() as cursor:
+            await cursor.execute(query, params)
+            rows = [row async for row in cursor]
+        await self._record(query, params, start, len(rows))
+        return rows
+
+    async def _record(self,
+                      query: str,
+                      params: Tuple[Any, ...],
+                      start: float,
+                      rows: int) -> None:
+        duration: float = time.perf_counter() - start
+        self.statistics.add(duration, rows)
+        log: Optional[slowquery.SlowQueryLog] = slowquery.shared()
+        if log is not None and duration >= log.threshold:
+            await log.log(self.database, query, params, duration)
+
+    async def _scalar(self, query: str, params: Tuple[Any, ...]) -> Any:
+        row: Optional[Tuple[Any, ...]] = await self._fetchone(query, params)
+        return row[0] if row is not None else None
+
+    async def gameVersionIds(self, game: str) -> Tuple[int, int]:
+        global _versionIds
+        if _versionIds is None:
+            query: str = '''
+SELECT gen1_game_versions.shortName, gen1_games.id, gen1_game_versions.id
+    FROM gen1_game_versions, gen1_games
+    WHERE gen1_games.id=gen1_game_versions.gameIndex'''
+            _versionIds = {shortName: (gameId, versionId)
+                           for shortName, gameId, versionId
+                           in await self._fetchall(query, ())}
+        return _versionIds.get(game, (0, 0))
+
+    async def pokemonByIndex(self, gameIndex: int) -> Optional[int]:
+        query: str = '''
+SELECT pokedexNumber FROM gen1_pokemon WHERE gameIndexNumber=?
+'''
+        return await self._scalar(query, (gameIndex,))
+
+    async def pokemonByName(self, name: str) -> Optional[int]:
+        query: str = '''
+SELECT pokedexNumber FROM gen1_pokemon WHERE LOWER(name)=?
+'''
+        return await self._scalar(query, (name.lower(),))
+
+    async def moveByMachine(self,
+                            number: int,
+                            isTM: bool,
+                            isHM: bool) -> Optional[int]:
+        query: str = '''
+SELECT gameIndexNumber
+    FROM gen1_moves
+    WHERE hmNumber=? OR tmNumber=?
+    ORDER BY CASE WHEN hmNumber IS NULL THEN 1 ELSE 0 END ASC
+'''
+        params: Tuple[Optional[int], ...]
+        params = number if isHM else None, number if isTM else None
+        return await self._scalar(query, params)
+
+    async def moveByName(self, name: str) -> Optional[int]:
+        query: str = '''
+SELECT gameIndexNumber FROM gen1_moves WHERE LOWER(name)=?
+'''
+        return await self._scalar(query, (name.lower(),))
+
+    async def locationByIndex(self,
+                              mapIndex: int,
+                              versionId: int) -> Optional[int]:
+        query: str = '''
+SELECT l.mapIndex
+    FROM gen1_locations AS l
+        JOIN gen1_location_used AS u
+            ON u.mapIndex=l.mapIndex AND u.versionId=?
+    WHERE l.mapIndex=?
+'''
+        return await self._scalar(query, (versionId, mapIndex))
+
+    async def locationByName(self,
+                             name: str,
+                             versionId: int) -> Optional[int]:
+        query: str = '''
+SELECT l.mapIndex
+    FROM gen1_locations AS l
+        JOIN gen1_location_used AS u
+            ON u.mapIndex=l.mapIndex AND u.versionId=?
+    WHERE LOWER(l.name)=?
+    ORDER BY l.mapIndex ASC
+'''
+        return await self._scalar(query, (versionId, name.lower()))
+
+    async def closestName(self, kind: str, name: str) -> Optional[str]:
+        if kind not in _names:
+            query: str = f'SELECT name FROM {nameTables[kind]}'
+            rows: List[Tuple[str]] = await self._fetchall(query, ())
+            _names[kind] = NameIndex(row[0] for row in rows)
+        return _names[kind].match(name)
+
+    async def pokedexEntry(self,
+                           pokemonId: int,
+                           versionId: int) -> Optional[PokedexEntryRow]:
+        query: str = '''
+SELECT p.pokedexNumber, p.name, p.heightMeters, p.weightKilograms, e.entry
+    FROM gen1_pokemon AS p
+        LEFT JOIN gen1_pokedex_entries AS e
+            ON e.pokedexNumber=p.pokedexNumber AND e.versionId=?
+    WHERE p.pokedexNumber=?
+'''
+        row: Optional[Tuple[Any, ...]]
+        row = await self._fetchone(query, (versionId, pokemonId))
+        return PokedexEntryRow(*row) if row is not None else None
+
+    async def pokemon(self, pokemonId: int) -> Optional[PokemonRow]:
+        query: str = '''
+SELECT p.pokedexNumber, p.gameIndexNumber, p.name, t1.typeName, t2.typeName,
+        c.name, p.catchRate, p.heightMeters, p.weightKilograms, p.baseHP,
+        p.baseAttack, p.baseDefense, p.baseSpeed, p.baseSpecial
+    FROM gen1_pokemon AS p
+        LEFT JOIN gen1_types AS t1 ON t1.typeIndex=p.type1
+        LEFT JOIN gen1_types AS t2 ON t2.typeIndex=p.type2
+        LEFT JOIN gen1_experiencecurve AS c
+            ON c.curveIndex=p.experienceCurve
+    WHERE p.pokedexNumber=?
+'''
+        row: Optional[Tuple[Any, ...]]
+        row = await self._fetchone(query, (pokemonId,))
+        return PokemonRow(*row) if row is not None else None
+
+    async def levelUpCounts(self,
+                            pokemonId: int,
+                            gameId: int) -> List[Tuple[int, int]]:
+        query: str = '''
+SELECT levelUp, COUNT(*)
+    FROM gen1_pokemon_levelup
+    WHERE pokedexNumber=?
+        AND gameIndex=?
+    GROUP BY levelUp
+    ORDER BY levelUp ASC
+'''
+        return [(int(level), int(count)) for level, count
+                in await self._fetchall(query, (pokemonId, gameId))]
+
+    async def levelUpMoves(self,
+                           pokemonId: int,
+                           gameId: int) -> List[Tuple[int, str]]:
+        query: str = '''
+SELECT l.levelUp, m.name
+    FROM gen1_pokemon_levelup AS l, gen1_moves AS m
+    WHERE l.moveIndex=m.gameIndexNumber
+        AND l.pokedexNumber=?
+        AND l.gameIndex=?
+    ORDER BY l.levelUp ASC, l.levelUpOrder ASC
+'''
+        return [(int(level), name) for level, name
+                in await self._fetchall(query, (pokemonId, gameId))]
+
+    async def tmCount(self, pokemonId: int, gameId: int) -> int:
+        query: str = '''
+SELECT COUNT(*)
+    FROM gen1_pokemon_tmhmcompatability AS c
+        JOIN gen1_moves AS m ON m.gameIndexNumber=c.moveIndex
+    WHERE c.pokedexNumber=?
+        AND c.gameIndex=?
+        AND m.tmNumber IS NOT NULL
+'''
+        return int(await self._scalar(query, (pokemonId, gameId)) or 0)
+
+    async def tmMoves(self,
+                      pokemonId: int,
+                      gameId: int) -> List[Tuple[str, int]]:
+        query: str = '''
+SELECT m.name, m.tmNumber
+    FROM gen1_pokemon_tmhmcompatability AS c, gen1_moves AS m
+    WHERE c.pokedexNumber=?
+        AND c.gameIndex=?
+        AND m.gameIndexNumber=c.moveIndex
+        AND m.tmNumber IS NOT NULL
+    ORDER BY tmNumber
+'''
+        return [(name, int(number)) for name, number
+                in await self._fetchall(query, (pokemonId, gameId))]
+
+    async def hmMoves(self,
+                      pokemonId: int,
+                      gameId: int) -> List[Tuple[str, int]]:
+        query: str = '''
+SELECT m.name, m.hmNumber
+    FROM gen1_pokemon_tmhmcompatability AS c, gen1_moves AS m
+    WHERE c.pokedexNumber=?
+        AND c.gameIndex=?
+        AND m.gameIndexNumber=c.moveIndex
+        AND m.hmNumber IS NOT NULL ORDER BY hmNumber
+'''
+        return [(name, int(number)) for name, number
+                in await self._fetchall(query, (pokemonId, gameId))]
+
+    async def index(self, number: int, versionId: int) -> IndexRow:
+        queries: List[str] = [
+            'SELECT name FROM gen1_pokemon WHERE pokedexNumber=?',
+            'SELECT name FROM gen1_pokemon WHERE gameIndexNumber=?',
+            'SELECT name FROM gen1_moves WHERE gameIndexNumber=?',
+            'SELECT name FROM gen1_items WHERE hexIndex=?',
+            'SELECT name FROM gen1_experiencecurve WHERE curveIndex=?',
+            'SELECT typeName FROM gen1_types WHERE typeIndex=?',
+            'SELECT className FROM gen1_trainer_class WHERE gameIndex=?',
+            ]
+        names: List[Optional[str]] = []
+        query: str
+        for query in queries:
+            names.append(await self._scalar(query, (number,)))
+        query = '''
+SELECT name
+    FROM gen1_locations
+    WHERE mapIndex=?
+        AND EXISTS(
+            SELECT 1
+                FROM gen1_location_used
+                WHERE gen1_locations.mapIndex=gen1_location_used.mapIndex
+                    AND gen1_location_used.versionId=?)
+'''
+        names.append(await self._scalar(query, (number, versionId)))
+        return IndexRow(*names)
+
+    async def move(self, moveId: int) -> Optional[MoveRow]:
+        query: str = '''
+SELECT m.gameIndexNumber, m.name, t.typeName, m.basePower, m.basePP,
+        m.accuracy, m.tmNumber, m.hmNumber, m.targetEnemy, m.hasChargingTurn,
+        m.healRate, m.drainRate, m.primaryEffect, m.secondEffect,
+        m.secondEffectChance, m.staticDamage, m.effectMinTurns,
+        m.effectMaxTurns, m.enemyStageModifier, m.attackStageModifier,
+        m.defenseStageModifier, m.speedStageModifier, m.specialStageModifier,
+        m.accuracyStageModifier, m.evasionStageModifier
+    FROM gen1_moves AS m
+        LEFT JOIN gen1_types AS t ON t.typeIndex=m.typeIndex
+    WHERE m.gameIndexNumber=?'''
+        row: Optional[Tuple[Any, ...]] = await self._fetchone(query, (moveId,))
+        return MoveRow(*row) if row is not None else None
+
+    async def damagingMoves(self) -> List[MoveRow]:
+        global _damagingMoves
+        if _damagingMoves is None:
+            query: str = '''
+SELECT m.gameIndexNumber, m.name, t.typeName, m.basePower, m.basePP,
+        m.accuracy, m.tmNumber, m.hmNumber, m.targetEnemy, m.hasChargingTurn,
+        m.healRate, m.drainRate, m.primaryEffect, m.secondEffect,
+        m.secondEffectChance, m.staticDamage, m.effectMinTurns,
+        m.effectMaxTurns, m.enemyStageModifier, m.attackStageModifier,
+        m.defenseStageModifier, m.speedStageModifier, m.specialStageModifier,
+        m.accuracyStageModifier, m.evasionStageModifier
+    FROM gen1_moves AS m
+        LEFT JOIN gen1_types AS t ON t.typeIndex=m.typeIndex
+    WHERE m.basePower IS NOT NULL
+    ORDER BY m.gameIndexNumber
+'''
+            _damagingMoves = [MoveRow(*row)
+                              for row in await self._fetchall(query, ())]
+        return _damagingMoves
+
+    async def moveLearnerCounts(self,
+                                moveId: int,
+                                gameId: int) -> Dict[bool, int]:
+        query: str = '''
+SELECT COUNT(DISTINCT pokedexNumber), levelUp=1
+    FROM gen1_pokemon_levelup
+    WHERE moveIndex=? AND gameIndex=?
+    GROUP BY levelUp=1
+    ORDER BY levelUp=1
+'''
+        count: Dict[bool, int] = {False: 0, True: 0}
+        moveCount: int
+        starts: bool
+        for moveCount, starts in await self._fetchall(query, (moveId, gameId)):
+            count[bool(starts)] = int(moveCount)
+        return count
+
+    async def moveLearners(self,
+                           moveId: int,
+                           gameId: int) -> List[Tuple[str, int]]:
+        query: str = '''
+SELECT p.name, l.levelUp
+    FROM gen1_pokemon_levelup AS l, gen1_pokemon AS p
+    WHERE p.pokedexNumber=l.pokedexNumber AND l.moveIndex=? AND l.gameIndex=?
+    ORDER BY l.pokedexNumber ASC, l.levelUp ASC, l.levelUpOrder ASC
+'''
+        return [(name, int(level)) for name, level
+                in await self._fetchall(query, (moveId, gameId))]
+
+    async def tmhmLearnerCount(self, moveId: int, gameId: int) -> int:
+        query: str = '''
+SELECT COUNT(DISTINCT pokedexNumber)
+    FROM gen1_pokemon_tmhmcompatability
+    WHERE moveIndex=? AND gameIndex=?
+'''
+        return int(await self._scalar(query, (moveId, gameId)) or 0)
+
+    async def tmhmLearners(self, moveId: int, gameId: int) -> List[str]:
+        query: str = '''
+SELECT p.name
+    FROM gen1_pokemon_tmhmcompatability AS l, gen1_pokemon AS p
+    WHERE p.pokedexNumber=l.pokedexNumber AND l.moveIndex=? AND l.gameIndex=?
+    ORDER BY l.pokedexNumber ASC
+'''
+        return [name for name,
+                in await self._fetchall(query, (moveId, gameId))]
+
+    async def learnsetIndex(self) -> LearnsetIndex:
+        global _learnsetIndex
+        if _learnsetIndex is None:
+            query: str = '''
+SELECT pokedexNumber, name FROM gen1_pokemon
+'''
+            pokemon: List[Tuple[int, str]] = await self._fetchall(query, ())
+            query = '''
+SELECT DISTINCT pokedexNumber, moveIndex, gameIndex FROM gen1_pokemon_levelup
+'''
+            levelUp: List[Tuple[int, int, int]]
+            levelUp = await self._fetchall(query, ())
+            query = '''
+SELECT pokedexNumber, moveIndex, gameIndex
+    FROM gen1_pokemon_tmhmcompatability
+'''
+            _learnsetIndex = LearnsetIndex(pokemon, levelUp,
+                                           await self._fetchall(query, ()))
+        return _learnsetIndex
+
+    async def evolutions(self, pokemonId: int) -> List[EvolutionRow]:
+        query: str = '''
+SELECT evo.toPokedexNumber, evo.levelUp, evo.itemIndex, evo.isTrade, p.name,
+        i.name
+    FROM gen1_pokemon_evolution AS evo
+        LEFT JOIN gen1_pokemon AS p ON p.pokedexNumber=evo.toPokedexNumber
+        LEFT JOIN gen1_items AS i ON i.hexIndex=evo.itemIndex
+    WHERE evo.fromPokedexNumber=?
+    ORDER BY evo.toPokedexNumber ASC
+'''
+        return [EvolutionRow(*row)
+                for row in await self._fetchall(query, (pokemonId,))]
+
+    async def location(self,
+                       locationId: int,
+                       versionId: int) -> Optional[LocationRow]:
+        query: str = '''
+SELECT l.mapIndex, l.name, l.height, l.width, COALESCE(w.warps, 0),
+        u.grassEncounterRate, u.waterEncounterRate, COALESCE(f.fishing, 0)
+    FROM gen1_locations AS l
+        LEFT JOIN gen1_location_used AS u
+            ON u.mapIndex=l.mapIndex AND u.versionId=?
+        LEFT JOIN (SELECT fromMapIndex, COUNT(*) AS warps
+                FROM gen1_location_warps
+                WHERE versionId=? AND fromMapIndex=?
+                GROUP BY fromMapIndex) AS w
+            ON w.fromMapIndex=l.mapIndex
+        LEFT JOIN (SELECT locationId, COUNT(*) AS fishing
+                FROM gen1_fishing
+                WHERE versionId=? AND locationId=?
+                GROUP BY locationId) AS f
+            ON f.locationId=l.mapIndex
+    WHERE l.mapIndex=?
+'''
+        params: Tuple[int, ...] = (versionId, versionId, locationId,
+                                   versionId, locationId, locationId)
+        row: Optional[Tuple[Any, ...]] = await self._fetchone(query, params)
+        return LocationRow(*row) if row is not None else None
+
+    async def encounterSummary(self,
+                               versionId: int,
+                               locationId: int,
+                               encounterType: str
+                               ) -> List[EncounterSummaryRow]:
+        query: str = '''
+SELECT p.name, MIN(w.pokemonLevel), MAX(w.pokemonLevel),
+        SUM(CASE WHEN w.slotIndex IN (0, 1) THEN 51
+            WHEN w.slotIndex=2 THEN 39
+            WHEN w.slotIndex IN (3,4,5) THEN 25
+            WHEN w.slotIndex IN (6,7) THEN 13
+            WHEN w.slotIndex=8 THEN 11
+            WHEN w.slotIndex=9 THEN 3
+            ELSE 0
+            END) as encounterRate
+    FROM gen1_wild_encounters AS w, gen1_pokemon AS p
+    WHERE w.versionId=? AND w.locationId=? AND w.encounterType=?
+        AND p.pokedexNumber=w.pokedexNumber
+    GROUP BY p.pokedexNumber, p.name
+    ORDER BY encounterRate DESC, p.pokedexNumber ASC
+'''
+        params: Tuple[int, int, str] = versionId, locationId, encounterType
+        return [EncounterSummaryRow(*row)
+                for row in await self._fetchall(query, params)]
+
+    async def encounters(self,
+                         versionId: int,
+                         locationId: int,
+                         encounterType: str) -> List[EncounterRow]:
+        query: str = '''
+SELECT p.name, w.pokemonLevel, w.slotIndex
+    FROM gen1_wild_encounters AS w, gen1_pokemon AS p
+    WHERE w.versionId=? AND w.locationId=? AND w.encounterType=?
+        AND p.pokedexNumber=w.pokedexNumber
+    ORDER BY w.slotIndex ASC
+'''
+        params: Tuple[int, int, str] = versionId, locationId, encounterType
+        return [EncounterRow(*row)
+                for row in await self._fetchall(query, params)]
+
+    async def fishingSummary(self,
+                             versionId: int,
+                             locationId: int) -> List[EncounterSummaryRow]:
+        query: str = '''
+SELECT p.name, MIN(f.pokemonLevel), MAX(f.pokemonLevel),
+        COUNT(slotIndex) as encounterRatio
+    FROM gen1_fishing AS f, gen1_pokemon AS p
+    WHERE f.versionId=? AND f.locationId=? AND p.pokedexNumber=f.pokedexNumber
+    GROUP BY p.pokedexNumber, p.name
+    ORDER BY encounterRatio DESC, p.pokedexNumber ASC
+'''
+        params: Tuple[int, int] = versionId, locationId
+        return [EncounterSummaryRow(*row)
+                for row in await self._fetchall(query, params)]
+
+    async def fishing(self,
+                      versionId: int,
+                      locationId: int) -> List[EncounterRow]:
+        query: str = '''
+SELECT p.name, f.pokemonLevel, f.slotIndex
+    FROM gen1_fishing AS f, gen1_pokemon AS p
+    WHERE f.versionId=? AND f.locationId=? AND p.pokedexNumber=f.pokedexNumber
+    ORDER BY f.slotIndex ASC
+'''
+        params: Tuple[int, int] = versionId, locationId
+        return [EncounterRow(*row)
+                for row in await self._fetchall(query, params)]
+
+    async def typeChart(self) -> TypeChart:
+        global _typeChart
+        if _typeChart is None:
+            query: str = '''
+SELECT typeIndex, typeName, isSpecial FROM gen1_types
+'''
+            types: List[Tuple[int, str, bool]]
+            types = await self._fetchall(query, ())
+            query = '''
+SELECT attackType, defendType, modifier FROM gen1_type_effectiveness
+'''
+            effectiveness: List[Tuple[int, int, Any]]
+            effectiveness = await self._fetchall(query, ())
+            query = '''
+SELECT p.pokedexNumber, p.name, t1.typeName, t2.typeName
+    FROM gen1_pokemon AS p
+        JOIN gen1_types AS t1 ON t1.typeIndex=p.type1
+        LEFT JOIN gen1_types AS t2 ON t2.typeIndex=p.type2
+'''
+            _typeChart = TypeChart(types, effectiveness,
+                                   await self._fetchall(query, ()))
+        return _typeChart
@@ -0,0 +1,63 @@
+from typing import Dict, Iterable, Iterator, List, Tuple  # noqa: F401
+
+# pokedexNumber, moveIndex, gameIndex
+LearnRow = Tuple[int, int, int]
+
+
+class LearnsetIndex:
+    '''
+    The pokemon that learn each move in each game as bitsets
+
+    Bit n - 1 of a bitset is pokedex number n, there is one bitset by level
+    up and one by TM or HM for every move and game. The pokemon that learn
+    several moves are the AND of their bitsets.
+    '''
+    def __init__(self,
+                 pokemon: Iterable[Tuple[int, str]],
+                 levelUp: Iterable[LearnRow],
+                 tmhm: Iterable[LearnRow]) -> None:
+        self.names: Dict[int, str] = dict(pokemon)
+        self.levelUp: Dict[Tuple[int, int], int] = _bitsets(levelUp)
+        self.tmhm: Dict[Tuple[int, int], int] = _bitsets(tmhm)
+
+    def learners(self,
+                 moveIds: Iterable[int],
+                 gameId: int,
+                 byLevelUp: bool=True,
+                 byTmHm: bool=True) -> List[str]:
+        '''
+        Names of the pokemon that learn every move of moveIds, by pokedex
+        number
+        '''
+        learners: int = -1
+        moveId: int
+        for moveId in moveIds:
+            bitset: int = 0
+            if byLevelUp:
+                bitset |= self.levelUp.get((moveId, gameId), 0)
+            if byTmHm:
+                bitset |= self.tmhm.get((moveId, gameId), 0)
+            learners &= bitset
+        if learners == -1:
+            return []
+        return [self.names[number] for number in _numbers(learners)
+                if number in self.names]
+
+
+def _bitsets(rows: Iterable[LearnRow]) -> Dict[Tuple[int, int], int]:
+    bitsets: Dict[Tuple[int, int], int] = {}
+    pokedexNumber: int
+    moveId: int
+    gameId: int
+    for pokedexNumber, moveId, gameId in rows:
+        bitsets[moveId, gameId] = (bitsets.get((moveId, gameId), 0)
+                                   | 1 << pokedexNumber - 1)
+    return bitsets
+
+
+def _numbers(bitset: int) -> Iterator[int]:
+    # Lowest bit first, so in pokedex order
+    while bitset:
+        lowest: int = bitset & -bitset
+        yield lowest.bit_length()
+        bitset ^= lowest
@@ -0,0 +1,33 @@
+import bot
+
+from typing import Iterable, Iterator, List, Optional  # noqa: F401
+
+
+def pack(items: Iterable[str],
+         prefix: str='',
+         separator: str=', ',
+         limit: Optional[int]=None) -> Iterator[str]:
+    '''
+    Joins items into as few chat messages as fit in limit characters
+
+    Every message starts with prefix, limit defaults to
+    bot.config.messageLimit. An item too long to fit in a message by itself
+    is cut at the limit, a prefix too long to leave room for an item is cut
+    too.
+    '''
+    if limit is None:
+        limit = bot.config.messageLimit
+    prefix = prefix[:max(limit - 1, 0)]
+    room: int = max(limit - len(prefix), 1)
+    line: List[str] = []
+    length: int = 0
+    item: str
+    for item in items:
+        item = item[:room]
+        if line and length + len(separator) + len(item) > room:
+            yield prefix + separator.join(line)
+            line = []
+        length = length + len(separator) + len(item) if line else len(item)
+        line.append(item)
+    if line:
+        yield prefix + separator.join(line)
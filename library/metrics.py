@@ -0,0 +1,204 @@
+import bisect
+import time
+
+from collections import deque
+from typing import Deque, Dict, Iterator, List, NamedTuple  # noqa: F401
+from typing import Optional, Sequence, Tuple  # noqa: F401
+
+from .config import config
+
+# Seconds, from 0.1 ms to 13 s doubling each bucket
+timeBounds: Tuple[float, ...] = tuple(0.0001 * 2 ** i for i in range(18))
+# Statements, rows and bytes, from 0 to 65536 doubling each bucket
+countBounds: Tuple[float, ...] = (0,) + tuple(2 ** i for i in range(17))
+
+
+class QueryStatistics:
+    '''
+    Statements executed for one command and the time spent in the database
+    '''
+    def __init__(self) -> None:
+        self.statements: int = 0
+        self.rows: int = 0
+        self.time: float = 0.0
+
+    def add(self, duration: float, rows: int) -> None:
+        self.statements += 1
+        self.rows += rows
+        self.time += duration
+
+
+class Sample(NamedTuple):
+    wallTime: float
+    databaseTime: float
+    statements: int
+    rows: int
+    bytes: int
+    # False when the response came from the cache or a shared render
+    rendered: bool
+
+
+class Summary(NamedTuple):
+    count: int
+    total: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class _Slice:
+    def __init__(self, start: float, buckets: int) -> None:
+        self.start: float = start
+        self.counts: List[int] = [0] * buckets
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+
+class RollingHistogram:
+    '''
+    Counts values into fixed buckets over a rolling window
+
+    The window is split into slices and the oldest slice is dropped when a
+    new one starts, so the histogram covers the last slices * sliceDuration
+    seconds. Percentiles are the upper bound of the bucket they fall in.
+    '''
+    def __init__(self,
+                 bounds: Sequence[float],
+                 slices: int,
+                 sliceDuration: float) -> None:
+        self.bounds: Sequence[float] = bounds
+        self.slices: int = slices
+        self.sliceDuration: float = sliceDuration
+        self._slices: Deque[_Slice] = deque()
+
+    def add(self, value: float, now: Optional[float]=None) -> None:
+        if now is None:
+            now = time.monotonic()
+        self._expire(now)
+        if (not self._slices
+                or now - self._slices[-1].start >= self.sliceDuration):
+            # One bucket more than bounds for values above the last one
+            self._slices.append(_Slice(now, len(self.bounds) + 1))
+        current: _Slice = self._slices[-1]
+        current.counts[bisect.bisect_left(self.bounds, value)] += 1
+        current.total += value
+        current.max = max(current.max, value)
+
+    def _expire(self, now: float) -> None:
+        window: float = self.slices * self.sliceDuration
+        while self._slices and now - self._slices[0].start >= window:
+            self._slices.popleft()
+
+    def summary(self, now: Optional[float]=None) -> Summary:
+        if now is None:
+            now = time.monotonic()
+        self._expire(now)
+        counts: List[int] = [0] * (len(self.bounds) + 1)
+        total: float = 0.0
+        maximum: float = 0.0
+        slice_: _Slice
+        for slice_ in self._slices:
+            counts = [a + b for a, b in zip(counts, slice_.counts)]
+            total += slice_.total
+            maximum = max(maximum, slice_.max)
+        count: int = sum(counts)
+
+        def percentile(percent: float) -> float:
+            if not count:
+                return 0.0
+            rank: float = percent / 100 * count
+            seen: int = 0
+            i: int
+            for i in range(len(counts)):
+                seen += counts[i]
+                if seen and seen >= rank:
+                    break
+            if i == len(self.bounds):
+                return maximum
+            return min(self.bounds[i], maximum)
+
+        return Summary(count, total, percentile(50), percentile(95),
+                       percentile(99), maximum)
+
+
+class CommandMetrics:
+    def __init__(self, slices: int, sliceDuration: float) -> None:
+        self.wallTime: RollingHistogram
+        self.wallTime = RollingHistogram(timeBounds, slices, sliceDuration)
+        self.databaseTime: RollingHistogram
+        self.databaseTime = RollingHistogram(timeBounds, slices,
+                                             sliceDuration)
+        self.statements: RollingHistogram
+        self.statements = RollingHistogram(countBounds, slices, sliceDuration)
+        self.rows: RollingHistogram
+        self.rows = RollingHistogram(countBounds, slices, sliceDuration)
+        self.bytes: RollingHistogram
+        self.bytes = RollingHistogram(countBounds, slices, sliceDuration)
+        self.rendered: RollingHistogram
+        self.rendered = RollingHistogram((0,), slices, sliceDuration)
+
+    def add(self, sample: Sample, now: float) -> None:
+        self.wallTime.add(sample.wallTime, now)
+        self.bytes.add(sample.bytes, now)
+        self.rendered.add(int(sample.rendered), now)
+        if sample.rendered:
+            self.databaseTime.add(sample.databaseTime, now)
+            self.statements.add(sample.statements, now)
+            self.rows.add(sample.rows, now)
+
+
+class Metrics:
+    '''
+    Rolling histograms for each command and game
+    '''
+    def __init__(self, slices: int, sliceDuration: float) -> None:
+        self.slices: int = slices
+        self.sliceDuration: float = sliceDuration
+        self.commands: Dict[Tuple[str, str], CommandMetrics] = {}
+
+    def record(self, command: str, game: str, sample: Sample) -> None:
+        key: Tuple[str, str] = command, game
+        if key not in self.commands:
+            self.commands[key] = CommandMetrics(self.slices,
+                                                self.sliceDuration)
+        self.commands[key].add(sample, time.monotonic())
+
+    def clear(self) -> None:
+        self.commands.clear()
+
+    def report(self, only: Optional[str]=None) -> Iterator[str]:
+        now: float = time.monotonic()
+        command: str
+        game: str
+        for command, game in sorted(self.commands):
+            if only is not None and command != only:
+                continue
+            metrics: CommandMetrics = self.commands[command, game]
+            wallTime: Summary = metrics.wallTime.summary(now)
+            if not wallTime.count:
+                continue
+            rendered: Summary = metrics.rendered.summary(now)
+            databaseTime: Summary = metrics.databaseTime.summary(now)
+            statements: Summary = metrics.statements.summary(now)
+            rows: Summary = metrics.rows.summary(now)
+            bytes_: Summary = metrics.bytes.summary(now)
+            yield (f'{command} {game}: {wallTime.count} calls, '
+                   f'{rendered.total:.0f} rendered, wall '
+                   f'p50 {wallTime.p50 * 1000:.1f}ms '
+                   f'p95 {wallTime.p95 * 1000:.1f}ms '
+                   f'p99 {wallTime.p99 * 1000:.1f}ms '
+                   f'max {wallTime.max * 1000:.1f}ms, db '
+                   f'p95 {databaseTime.p95 * 1000:.1f}ms, statements '
+                   f'p95 {statements.p95:.0f} max {statements.max:.0f}, '
+                   f'rows p95 {rows.p95:.0f}, bytes p95 {bytes_.p95:.0f}')
+
+
+_metrics: Optional[Metrics] = None
+
+
+def shared() -> Metrics:
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics(config.metricsSlices, config.metricsSliceDuration)
+    return _metrics
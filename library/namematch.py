@@ -0,0 +1,109 @@
+import bisect
+import unicodedata
+
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List, Optional, Set
+
+
+def normalize(name: str) -> str:
+    '''
+    Reduces a name to lowercase letters and digits
+
+    Accents, spaces and punctuation are dropped so "Mr. Mime", "mr mime" and
+    "MrMime" are the same name.
+    '''
+    name = name.replace('♀', 'f').replace('♂', 'm')
+    name = unicodedata.normalize('NFKD', name.lower())
+    return ''.join(c for c in name if c.isalnum())
+
+
+def trigrams(normalized: str) -> Set[str]:
+    padded: str = f'  {normalized} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def distance(a: str, b: str) -> int:
+    previous: List[int] = list(range(len(b) + 1))
+    i: int
+    ca: str
+    for i, ca in enumerate(a, 1):
+        current: List[int] = [i]
+        j: int
+        cb: str
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    '''
+    Matches misspelled or partial names against a fixed list of names
+
+    A lookup tries the normalized name, then a name it is the only prefix of,
+    then the name sharing the most trigrams with it. The index is built once
+    from the names and never changes.
+    '''
+    def __init__(self,
+                 names: Iterable[str],
+                 threshold: float=0.5,
+                 minPrefix: int=3) -> None:
+        self.threshold: float = threshold
+        self.minPrefix: int = minPrefix
+        self._names: Dict[str, str] = {}
+        self._trigrams: DefaultDict[str, List[str]] = defaultdict(list)
+        self._sizes: Dict[str, int] = {}
+        name: str
+        for name in names:
+            key: str = normalize(name)
+            if not key or key in self._names:
+                continue
+            self._names[key] = name
+            grams: Set[str] = trigrams(key)
+            self._sizes[key] = len(grams)
+            gram: str
+            for gram in grams:
+                self._trigrams[gram].append(key)
+        self._sorted: List[str] = sorted(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def match(self, query: str) -> Optional[str]:
+        key: str = normalize(query)
+        if not key:
+            return None
+        if key in self._names:
+            return self._names[key]
+
+        if len(key) >= self.minPrefix:
+            start: int = bisect.bisect_left(self._sorted, key)
+            prefixed: List[str] = []
+            for name in self._sorted[start:start + 2]:
+                if name.startswith(key):
+                    prefixed.append(name)
+            if len(prefixed) == 1:
+                return self._names[prefixed[0]]
+
+        grams: Set[str] = trigrams(key)
+        shared: DefaultDict[str, int] = defaultdict(int)
+        gram: str
+        for gram in grams:
+            for name in self._trigrams.get(gram, []):
+                shared[name] += 1
+        scores: Dict[str, float] = {}
+        count: int
+        for name, count in shared.items():
+            score: float = 2 * count / (len(grams) + self._sizes[name])
+            if score >= self.threshold:
+                scores[name] = score
+        if not scores:
+            return None
+        # Edit distance only breaks ties between the best scoring names
+        bestScore: float = max(scores.values())
+        best: str = min((name for name, score in scores.items()
+                         if score == bestScore),
+                        key=lambda name: (distance(key, name), len(name),
+                                          name))
+        return self._names[best]
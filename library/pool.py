@@ -0,0 +1,159 @@
+import asyncio
+import time
+
+import aioodbc.cursor  # noqa: F401
+
+from collections import deque
+from typing import Deque, Optional, Set
+
+from lib.database import DatabaseMain
+
+from .config import config
+
+
+class PooledConnection:
+    def __init__(self, database: DatabaseMain) -> None:
+        self.database: DatabaseMain = database
+        self.createdAt: float = time.monotonic()
+        self.lastUsed: float = self.createdAt
+        self.lastChecked: Optional[float] = self.createdAt
+        # Databases attached to this connection, they stay attached for its
+        # lifetime
+        self.attached: Set[str] = set()
+
+
+class ConnectionPool:
+    '''
+    Keeps connected DatabaseMain instances warm between commands
+
+    At most maxSize connections are lent out at once, idle connections above
+    minSize are closed after idleTimeout seconds and connections that have
+    not been used for healthCheckInterval seconds are checked before they are
+    lent out again. Connections are opened up to minSize after the first
+    acquire and again whenever closing unhealthy ones drops the pool below
+    it. Closing idle connections and opening new ones runs in the background
+    so a borrower never waits for it.
+    '''
+    def __init__(self,
+                 minSize: int,
+                 maxSize: int,
+                 idleTimeout: float,
+                 healthCheckInterval: float) -> None:
+        self.minSize: int = minSize
+        self.maxSize: int = maxSize
+        self.idleTimeout: float = idleTimeout
+        self.healthCheckInterval: float = healthCheckInterval
+        self._idle: Deque[PooledConnection] = deque()
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(maxSize)
+        self._inUse: int = 0
+        # Evicts and fills, at most one runs at a time
+        self._maintenance: Optional['asyncio.Future[None]'] = None
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + self._inUse
+
+    async def acquire(self) -> PooledConnection:
+        await self._semaphore.acquire()
+        try:
+            connection: Optional[PooledConnection] = None
+            while self._idle and connection is None:
+                connection = self._idle.pop()
+                if not await self._isHealthy(connection):
+                    await self._close(connection)
+                    connection = None
+            if connection is None:
+                connection = await self._open()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self._inUse += 1
+        self._maintain()
+        return connection
+
+    async def release(self,
+                      connection: PooledConnection,
+                      healthy: bool=True) -> None:
+        '''
+        Returns a connection to the pool
+
+        Pass healthy=False when the borrower hit an error so the connection
+        is checked before it is lent out again.
+        '''
+        self._inUse -= 1
+        now: float = time.monotonic()
+        connection.lastUsed = now
+        connection.lastChecked = now if healthy else None
+        self._idle.append(connection)
+        self._semaphore.release()
+        self._maintain()
+
+    async def close(self) -> None:
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        while self._idle:
+            await self._close(self._idle.popleft())
+
+    async def _open(self) -> PooledConnection:
+        database: DatabaseMain = DatabaseMain.acquire()
+        await database.connect()
+        return PooledConnection(database)
+
+    async def _close(self, connection: PooledConnection) -> None:
+        try:
+            await connection.database.close()
+        except Exception:
+            pass
+
+    async def _isHealthy(self, connection: PooledConnection) -> bool:
+        now: float = time.monotonic()
+        if (connection.lastChecked is not None
+                and now - connection.lastChecked < self.healthCheckInterval):
+            return True
+        cursor: aioodbc.cursor.Cursor
+        try:
+            async with await connection.database.cursor() as cursor:
+                await cursor.execute('SELECT 1')
+                await cursor.fetchone()
+        except Exception:
+            return False
+        connection.lastChecked = now
+        return True
+
+    def _maintain(self) -> None:
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.ensure_future(self._runMaintenance())
+
+    async def _runMaintenance(self) -> None:
+        await self._evict(time.monotonic())
+        await self._fill()
+
+    async def _evict(self, now: float) -> None:
+        # The oldest idle connections are at the left, borrowers take from
+        # the right so the busiest connections stay warm
+        while (self._idle and self.size > self.minSize
+               and now - self._idle[0].lastUsed >= self.idleTimeout):
+            await self._close(self._idle.popleft())
+
+    async def _fill(self) -> None:
+        # Failing to open a spare connection is not an error of the borrower,
+        # the next acquire or release tries again
+        while self.size < self.minSize:
+            try:
+                connection: PooledConnection = await self._open()
+            except Exception:
+                return
+            self._idle.appendleft(connection)
+
+
+_pool: Optional[ConnectionPool] = None
+
+
+def shared() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(config.poolMinSize, config.poolMaxSize,
+                               config.poolIdleTimeout,
+                               config.poolHealthCheckInterval)
+    return _pool
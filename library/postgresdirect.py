@@ -0,0 +1,161 @@
+import asyncio
+import re
+
+from types import TracebackType
+from typing import Any, Dict, List, Match, Optional, Pattern  # noqa: F401
+from typing import Sequence, Tuple, Type  # noqa: F401
+
+from bot import utils
+
+from .config import config
+
+Row = Tuple[Any, ...]
+
+# String literals and quoted names are skipped so only placeholders match
+_placeholders: Pattern[str] = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\?")
+
+
+def convertPlaceholders(query: str) -> str:
+    '''
+    Numbers the ? placeholders of query as $1, $2, ... for PostgreSQL
+    '''
+    count: int = 0
+
+    def number(match: Match[str]) -> str:
+        nonlocal count
+        if match.group() != '?':
+            return match.group()
+        count += 1
+        return f'${count}'
+
+    return _placeholders.sub(number, query)
+
+
+class PostgresCursor:
+    '''
+    The parts of an aioodbc cursor the pokedex uses
+
+    Each statement is fetched in one call, the fetch methods only read the
+    rows back.
+    '''
+    def __init__(self, database: 'PostgresDatabase') -> None:
+        self.database: PostgresDatabase = database
+        self._rows: List[Row] = []
+        self._position: int = 0
+
+    async def __aenter__(self) -> 'PostgresCursor':
+        return self
+
+    async def __aexit__(self,
+                        type: Optional[Type[BaseException]],
+                        value: Optional[BaseException],
+                        traceback: Optional[TracebackType]) -> None:
+        self._rows = []
+
+    async def execute(self,
+                      query: str,
+                      params: Sequence[Any]=()) -> 'PostgresCursor':
+        self._rows = await self.database.fetch(query, tuple(params))
+        self._position = 0
+        return self
+
+    async def fetchone(self) -> Optional[Row]:
+        if self._position >= len(self._rows):
+            return None
+        self._position += 1
+        return self._rows[self._position - 1]
+
+    async def fetchall(self) -> List[Row]:
+        rows: List[Row] = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def __aiter__(self) -> 'PostgresCursor':
+        return self
+
+    async def __anext__(self) -> Row:
+        row: Optional[Row] = await self.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+
+class PostgresDatabase:
+    '''
+    Reads the Gen 1 tables from PostgreSQL with asyncpg instead of ODBC
+
+    asyncpg prepares every statement on the server the first time a pooled
+    connection runs it and keeps it in that connection's statement cache,
+    so the fixed queries are planned once per connection. Rows come back in
+    the binary protocol. Only cursor() and isSqlite of DatabaseMain are
+    provided, which is all the pokedex reads with.
+    '''
+    isSqlite: bool = False
+
+    def __init__(self,
+                 dsn: str,
+                 minSize: int,
+                 maxSize: int,
+                 statementCacheSize: int) -> None:
+        self.dsn: str = dsn
+        self.minSize: int = minSize
+        self.maxSize: int = maxSize
+        self.statementCacheSize: int = statementCacheSize
+        self._pool: Any = None
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._queries: Dict[str, str] = {}
+
+    async def cursor(self) -> PostgresCursor:
+        return PostgresCursor(self)
+
+    async def _getPool(self) -> Any:
+        # asyncpg is optional, shared() checked it can be imported
+        import asyncpg
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn, min_size=self.minSize,
+                        max_size=self.maxSize,
+                        statement_cache_size=self.statementCacheSize)
+        return self._pool
+
+    async def fetch(self, query: str, params: Tuple[Any, ...]) -> List[Row]:
+        if query not in self._queries:
+            self._queries[query] = convertPlaceholders(query)
+        pool: Any = await self._getPool()
+        connection: Any
+        async with pool.acquire() as connection:
+            return [tuple(record) for record
+                    in await connection.fetch(self._queries[query], *params)]
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+_database: Optional[PostgresDatabase] = None
+_unavailable: bool = False
+
+
+def shared() -> Optional[PostgresDatabase]:
+    '''
+    Returns the process wide asyncpg reader, or None unless [POSTGRESQL] dsn
+    is set and asyncpg is installed
+    '''
+    global _database, _unavailable
+    if _database is None and config.postgresDsn is not None:
+        if _unavailable:
+            return None
+        try:
+            import asyncpg  # noqa: F401
+        except ImportError:
+            utils.logException('asyncpg is not installed, using ODBC')
+            _unavailable = True
+            return None
+        _database = PostgresDatabase(
+            config.postgresDsn, config.postgresMinSize,
+            config.postgresMaxSize, config.postgresStatementCacheSize)
+    return _database
@@ -0,0 +1,70 @@
+import time
+
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple  # noqa: F401
+
+from .config import config
+
+Messages = Tuple[str, ...]
+
+
+def normalizeQuery(query: str) -> str:
+    # Lookups ignore case and the fuzzy matcher ignores spacing. Responses
+    # are rendered from the normalized query, so text echoed back from it
+    # is the same for every query with the same key.
+    return ' '.join(query.lower().split())
+
+
+class ResponseCache:
+    '''
+    Least recently used cache of rendered command responses
+
+    The dataset never changes so a response only depends on the command, the
+    game, the query and the flags. Entries still expire after duration
+    seconds to bound how long a stale response lives after an upgrade.
+    '''
+    def __init__(self, maxSize: int, duration: float) -> None:
+        self.maxSize: int = maxSize
+        self.duration: float = duration
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[Messages, float]]'
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Messages]:
+        entry: Optional[Tuple[Messages, float]] = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, messages: Messages) -> None:
+        if self.maxSize <= 0:
+            return
+        self._entries[key] = messages, time.monotonic() + self.duration
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def shared() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(config.responseCacheSize,
+                               config.responseCacheDuration)
+    return _cache
@@ -0,0 +1,43 @@
+import asyncio
+
+from typing import Any, Awaitable, Callable, Dict, Hashable  # noqa: F401
+from typing import Optional, TypeVar  # noqa: F401
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    '''
+    Runs at most one call for each key at a time
+
+    Callers arriving while a call for their key is in flight wait for that
+    call and share its result, or its exception, instead of starting another.
+    The call runs as its own task, so cancelling any caller, the one that
+    started it too, leaves it running for the others.
+    '''
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.shared: int = 0
+        self._inFlight: Dict[Hashable, 'asyncio.Future[Any]'] = {}
+
+    def __len__(self) -> int:
+        return len(self._inFlight)
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task: Optional['asyncio.Future[T]'] = self._inFlight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(call())
+            self._inFlight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: 'asyncio.Future[Any]') -> None:
+        if self._inFlight.get(key) is task:
+            del self._inFlight[key]
+        if not task.cancelled():
+            # Retrieve it so asyncio does not complain when every caller was
+            # cancelled
+            task.exception()
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import threading
+import time
+
+from datetime import datetime
+from types import FrameType  # noqa: F401
+from typing import Any, Dict, List, Optional, Tuple  # noqa: F401
+
+from bot import utils
+
+from .backend import Cursor, Database
+from .config import config
+from .gen import Generation
+
+
+class SlowQueryLog:
+    '''
+    Appends statements slower than threshold seconds to a log file
+
+    Each entry has the bind parameters, the Generation method the statement
+    ran for and the plan of the statement. A plan is captured at most once
+    every explainInterval seconds for each statement, on PostgreSQL EXPLAIN
+    ANALYZE runs the statement again. The file is written on the default
+    executor, the command does not wait for it.
+    '''
+    def __init__(self,
+                 threshold: float,
+                 path: str,
+                 explainInterval: float) -> None:
+        self.threshold: float = threshold
+        self.path: str = path
+        self.explainInterval: float = explainInterval
+        self.logged: int = 0
+        self._explainedAt: Dict[str, float] = {}
+        # Writes from executor threads must not interleave
+        self._lock: threading.Lock = threading.Lock()
+
+    async def log(self,
+                  database: Database,
+                  query: str,
+                  params: Tuple[Any, ...],
+                  duration: float) -> None:
+        caller: str = _caller(sys._getframe(1)) or 'unknown'
+        lines: List[str] = [
+            f'{datetime.now():%Y-%m-%d %H:%M:%S} {duration * 1000:.1f}ms in '
+            f'{caller}',
+            f'    params: {params!r}',
+            ]
+        lines.extend('    ' + line for line in query.strip().splitlines())
+        now: float = time.monotonic()
+        explainedAt: Optional[float] = self._explainedAt.get(query)
+        if explainedAt is None or now - explainedAt >= self.explainInterval:
+            self._explainedAt[query] = now
+            try:
+                plan: List[str] = await explain(database, query, params)
+            except Exception as e:
+                plan = [f'EXPLAIN failed: {e!r}']
+            lines.append('    plan:')
+            lines.extend('        ' + line for line in plan)
+        self.logged += 1
+        asyncio.get_event_loop().run_in_executor(
+            None, self._write, '\n'.join(lines) + '\n')
+
+    def _write(self, text: str) -> None:
+        # Runs on an executor thread
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as file:
+                file.write(text)
+        except OSError:
+            utils.logException()
+
+
+def _caller(frame: Optional[FrameType]) -> Optional[str]:
+    # The awaiting coroutines are on the stack while a statement resumes, so
+    # the command is the innermost pokemon* method of a Generation
+    while frame is not None:
+        self: Any = frame.f_locals.get('self')
+        if (frame.f_code.co_name.startswith('pokemon')
+                and isinstance(self, Generation)):
+            return f'{type(self).__name__}.{frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+async def explain(database: Database,
+                  query: str,
+                  params: Tuple[Any, ...]) -> List[str]:
+    cursor: Cursor
+    async with await database.cursor() as cursor:
+        if database.isSqlite:
+            await cursor.execute('EXPLAIN QUERY PLAN ' + query, params)
+            # id, parent, notused, detail
+            return [str(row[3]) async for row in cursor]
+        await cursor.execute('EXPLAIN ANALYZE ' + query, params)
+        return [str(row[0]) async for row in cursor]
+
+
+_log: Optional[SlowQueryLog] = None
+
+
+def shared() -> Optional[SlowQueryLog]:
+    '''
+    Returns the slow query log, or None unless [SLOWQUERY] threshold is set
+    '''
+    global _log
+    if _log is None and config.slowQueryThreshold is not None:
+        _log = SlowQueryLog(config.slowQueryThreshold, config.slowQueryLog,
+                            config.slowQueryExplainInterval)
+    return _log
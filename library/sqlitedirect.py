@@ -0,0 +1,143 @@
+import asyncio
+import sqlite3
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, List, Optional, Sequence, Tuple, Type  # noqa: F401
+from urllib.request import pathname2url
+
+from .config import config
+
+Row = Tuple[Any, ...]
+
+
+class SqliteCursor:
+    '''
+    The parts of an aioodbc cursor the pokedex uses
+
+    Each statement runs on the pool thread in one call and its rows are
+    fetched there, the fetch methods only read them back.
+    '''
+    def __init__(self, database: 'SqliteDatabase') -> None:
+        self.database: SqliteDatabase = database
+        self.description: Optional[Sequence[Tuple[Any, ...]]] = None
+        self._rows: List[Row] = []
+        self._position: int = 0
+
+    async def __aenter__(self) -> 'SqliteCursor':
+        return self
+
+    async def __aexit__(self,
+                        type: Optional[Type[BaseException]],
+                        value: Optional[BaseException],
+                        traceback: Optional[TracebackType]) -> None:
+        self._rows = []
+
+    async def execute(self,
+                      query: str,
+                      params: Sequence[Any]=()) -> 'SqliteCursor':
+        self._rows, self.description = await self.database.run(
+            query, tuple(params))
+        self._position = 0
+        return self
+
+    async def fetchone(self) -> Optional[Row]:
+        if self._position >= len(self._rows):
+            return None
+        self._position += 1
+        return self._rows[self._position - 1]
+
+    async def fetchall(self) -> List[Row]:
+        rows: List[Row] = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def __aiter__(self) -> 'SqliteCursor':
+        return self
+
+    async def __anext__(self) -> Row:
+        row: Optional[Row] = await self.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+
+class SqliteDatabase:
+    '''
+    Reads sqlite/gen1.sqlite with the sqlite3 module instead of through ODBC
+
+    Statements run on a small thread pool, every thread opens its own
+    read-only connection and keeps its prepared statements. Only cursor()
+    and isSqlite of DatabaseMain are provided, which is all the pokedex
+    reads with.
+    '''
+    isSqlite: bool = True
+
+    def __init__(self, path: str, threads: int, cacheSize: int) -> None:
+        self.path: str = path
+        self.cacheSize: int = cacheSize
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix='pokedex-sqlite')
+        self._local: threading.local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    async def cursor(self) -> SqliteCursor:
+        return SqliteCursor(self)
+
+    async def run(self,
+                  query: str,
+                  params: Tuple[Any, ...]
+                  ) -> Tuple[List[Row], Optional[Sequence[Tuple[Any, ...]]]]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, self._execute,
+                                          query, params)
+
+    def _execute(self,
+                 query: str,
+                 params: Tuple[Any, ...]
+                 ) -> Tuple[List[Row], Optional[Sequence[Tuple[Any, ...]]]]:
+        # Runs on a pool thread
+        cursor: sqlite3.Cursor = self._connection().execute(query, params)
+        try:
+            return cursor.fetchall(), cursor.description
+        finally:
+            cursor.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: Optional[sqlite3.Connection]
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # sqlite3 keeps the last cached_statements statements prepared,
+            # only this thread uses the connection until close()
+            connection = sqlite3.connect(
+                f'file:{pathname2url(self.path)}?mode=ro', uri=True,
+                cached_statements=256, check_same_thread=False)
+            connection.execute(f'PRAGMA cache_size = {-self.cacheSize}')
+            connection.execute('PRAGMA query_only = ON')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            while self._connections:
+                self._connections.pop().close()
+
+
+_database: Optional[SqliteDatabase] = None
+
+
+def shared() -> Optional[SqliteDatabase]:
+    '''
+    Returns the process wide direct reader, or None unless [SQLITE] direct
+    is on
+    '''
+    global _database
+    if _database is None and config.sqliteDirect:
+        _database = SqliteDatabase(config.sqlitePath, config.sqliteThreads,
+                                   config.sqliteCacheSize)
+    return _database
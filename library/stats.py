@@ -0,0 +1,115 @@
+import math
+
+from functools import lru_cache
+from itertools import product
+from typing import Callable, List, NamedTuple, Sequence, Set  # noqa: F401
+from typing import Tuple  # noqa: F401
+
+from .gen1source import PokemonRow
+
+maxDV: int = 15
+maxStatExp: int = 65535
+statNames: Tuple[str, ...] = 'HP', 'Attack', 'Defense', 'Speed', 'Special'
+dvCombinations: int = (maxDV + 1) ** 4
+
+
+class DVInference(NamedTuple):
+    # The possible DVs of each stat in statNames order
+    dvs: Tuple[Tuple[int, ...], ...]
+    combinations: int
+
+
+def statExpBonus(statExp: int) -> int:
+    # ceil(sqrt(statExp)) / 4, the most stat experience adds is 63
+    root: int = int(math.sqrt(statExp))
+    if root * root < statExp:
+        root += 1
+    return min(root, 255) // 4
+
+
+def statValue(base: int, dv: int, level: int, statExp: int=0) -> int:
+    return ((base + dv) * 2 + statExpBonus(statExp)) * level // 100 + 5
+
+
+def hpValue(base: int, dv: int, level: int, statExp: int=0) -> int:
+    return (((base + dv) * 2 + statExpBonus(statExp)) * level // 100
+            + level + 10)
+
+
+def baseStats(pokemon: PokemonRow) -> Tuple[int, ...]:
+    return (pokemon.baseHP, pokemon.baseAttack, pokemon.baseDefense,
+            pokemon.baseSpeed, pokemon.baseSpecial)
+
+
+def hpDV(attack: int, defense: int, speed: int, special: int) -> int:
+    # The HP DV is the lowest bit of each other DV
+    return ((attack & 1) << 3 | (defense & 1) << 2 | (speed & 1) << 1
+            | special & 1)
+
+
+def statValues(bases: Sequence[int],
+               dv: int,
+               level: int,
+               statExp: int=0) -> Tuple[int, ...]:
+    '''
+    The stats in statNames order with the same DV and stat experience in
+    each of them
+    '''
+    return ((hpValue(bases[0], dv, level, statExp),)
+            + tuple(statValue(base, dv, level, statExp)
+                    for base in bases[1:]))
+
+
+def averageStats(bases: Sequence[int], level: int) -> Tuple[int, ...]:
+    # Every DV is as likely, the HP DV too since it comes from the others
+    totals: List[int] = [0] * len(bases)
+    dv: int
+    for dv in range(maxDV + 1):
+        i: int
+        value: int
+        for i, value in enumerate(statValues(bases, dv, level)):
+            totals[i] += value
+    return tuple(round(total / (maxDV + 1)) for total in totals)
+
+
+@lru_cache(maxsize=4096)
+def inferDVs(bases: Tuple[int, ...],
+             level: int,
+             stats: Tuple[int, ...],
+             statExp: int=0) -> DVInference:
+    '''
+    The DVs that give stats at level, in statNames order
+
+    The 16 values of each stat are matched on their own, the HP DV only
+    ties the lowest bits of the others together. So instead of all 16 ** 4
+    DV combinations only the 16 combinations of lowest bits are checked.
+    '''
+    matches: List[List[int]] = []
+    i: int
+    base: int
+    for i, base in enumerate(bases):
+        value: Callable[[int, int, int, int], int]
+        value = hpValue if i == 0 else statValue
+        matches.append([dv for dv in range(maxDV + 1)
+                        if value(base, dv, level, statExp) == stats[i]])
+    possible: List[Set[int]] = [set() for _ in bases]
+    combinations: int = 0
+    bits: Tuple[int, ...]
+    for bits in product((0, 1), repeat=4):
+        # DVs of Attack, Defense, Speed and Special with these lowest bits
+        others: List[List[int]] = [[dv for dv in matches[i + 1]
+                                    if dv & 1 == bit]
+                                   for i, bit in enumerate(bits)]
+        hp: int = hpDV(*bits)
+        if hp not in matches[0] or not all(others):
+            continue
+        count: int = 1
+        dvs: List[int]
+        for dvs in others:
+            count *= len(dvs)
+        combinations += count
+        possible[0].add(hp)
+        for i, dvs in enumerate(others):
+            possible[i + 1].update(dvs)
+    return DVInference(tuple(tuple(sorted(dvs)) for dvs in possible),
+                       combinations)
@@ -0,0 +1,83 @@
+from typing import Dict, Iterable, List, Optional, Sequence  # noqa: F401
+from typing import Tuple  # noqa: F401
+
+from .gen1source import Number
+from .namematch import NameIndex
+
+# pokedexNumber, name, type1, type2
+PokemonTypes = Tuple[int, str, str, Optional[str]]
+
+
+class TypeChart:
+    '''
+    Gen 1 type effectiveness as a dense attack by defend matrix
+
+    Pairs missing from gen1_type_effectiveness are neutral. The defensive
+    profile of every pokemon, its multiplier against each attacking type,
+    is computed once so a matchup is a lookup in a row and "what is weak to
+    a type" is one column of the profiles.
+    '''
+    def __init__(self,
+                 types: Iterable[Tuple[int, str, bool]],
+                 effectiveness: Iterable[Tuple[int, int, Number]],
+                 pokemon: Iterable[PokemonTypes]) -> None:
+        rows: List[Tuple[int, str, bool]] = sorted(types)
+        # Type names in typeIndex order, positions index the matrix
+        self.names: List[str] = [name for _, name, _ in rows]
+        self.special: List[bool] = [bool(s) for _, _, s in rows]
+        self.positions: Dict[str, int] = {name.lower(): i
+                                          for i, name in enumerate(self.names)}
+        byIndex: Dict[int, int] = {index: i
+                                   for i, (index, _, _) in enumerate(rows)}
+        self.matrix: List[List[float]] = [[1.0] * len(rows) for _ in rows]
+        attack: int
+        defend: int
+        modifier: Number
+        for attack, defend, modifier in effectiveness:
+            self.matrix[byIndex[attack]][byIndex[defend]] = float(modifier)
+
+        self.pokemon: Dict[int, Tuple[str, Tuple[str, ...]]] = {}
+        self.profiles: Dict[int, Tuple[float, ...]] = {}
+        number: int
+        name: str
+        type1: str
+        type2: Optional[str]
+        for number, name, type1, type2 in sorted(pokemon):
+            defending: Tuple[str, ...] = ((type1,) if type2 in (None, type1)
+                                          else (type1, type2))
+            self.pokemon[number] = name, defending
+            self.profiles[number] = self.profile(defending)
+        self._names: NameIndex = NameIndex(self.names, minPrefix=2)
+
+    def typeByName(self, name: str, fuzzy: bool=True) -> Optional[str]:
+        position: Optional[int] = self.positions.get(name.strip().lower())
+        if position is not None:
+            return self.names[position]
+        return self._names.match(name) if fuzzy else None
+
+    def profile(self, defending: Sequence[str]) -> Tuple[float, ...]:
+        # Multiplier of every attacking type, in names order
+        columns: List[int] = [self.positions[t.lower()] for t in defending]
+        result: List[float] = []
+        row: List[float]
+        for row in self.matrix:
+            multiplier: float = 1.0
+            column: int
+            for column in columns:
+                multiplier *= row[column]
+            result.append(multiplier)
+        return tuple(result)
+
+    def multiplier(self, attacking: str, defending: Sequence[str]) -> float:
+        return self.profile(defending)[self.positions[attacking.lower()]]
+
+    def affected(self, attacking: str) -> Dict[float, List[str]]:
+        # Pokemon names grouped by the multiplier attacking hits them for
+        position: int = self.positions[attacking.lower()]
+        groups: Dict[float, List[str]] = {}
+        number: int
+        profile: Tuple[float, ...]
+        for number, profile in self.profiles.items():
+            groups.setdefault(profile[position], []).append(
+                self.pokemon[number][0])
+        return groups
@@ -0,0 +1,24 @@
+from typing import List, Optional  # noqa: F401
+
+from lib.data import ManageBotArgs
+
+from .library import metrics
+
+
+async def managePokedexStats(args: ManageBotArgs) -> bool:
+    # !managebot pokedexstats [reset | command]
+    only: Optional[str] = None
+    if len(args.message) > 2:
+        only = args.message.lower[2]
+        if only == 'reset':
+            metrics.shared().clear()
+            args.send('Pokedex command statistics cleared')
+            return True
+        if not only.startswith('!'):
+            only = '!' + only
+    lines: List[str] = list(metrics.shared().report(only))
+    if not lines:
+        args.send('No pokedex commands recorded')
+        return True
+    args.send(lines)
+    return True
@@ -0,0 +1,81 @@
+'''
+The Gen 1 dataset the tests read, loaded from gen1pokedex-sqlite.sql once for
+the whole test run
+'''
+
+import asyncio
+import atexit
+import os
+import shutil
+import tempfile
+import unittest
+
+from typing import Any, Awaitable, Optional, TypeVar  # noqa: F401
+
+from ..library.gen1binary import BinaryDataset
+from ..library.gen1snapshot import Snapshot, _readTables, tables
+from ..library.gen1sql import SqlSource
+from ..library.sqlitedirect import SqliteDatabase
+from ..tools import compilebinary, loaddump
+
+T = TypeVar('T')
+
+dumpPath: str = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                             'gen1pokedex-sqlite.sql')
+
+_directory: Optional[str] = None
+_database: Optional[SqliteDatabase] = None
+_dataset: Optional[BinaryDataset] = None
+
+
+def directory() -> str:
+    global _directory
+    if _directory is None:
+        _directory = tempfile.mkdtemp(prefix='pokedex-test-')
+        atexit.register(shutil.rmtree, _directory, True)
+        script: str
+        with open(dumpPath, encoding='utf-8') as file:
+            script = file.read()
+        dump: loaddump.Dump = loaddump.parse(script)
+        loaddump.loadSqlite(dump, os.path.join(_directory, 'gen1.sqlite'))
+        with open(os.path.join(_directory, 'gen1.bin'), 'wb') as file:
+            file.write(compilebinary.compile(dump))
+    return _directory
+
+
+def database() -> SqliteDatabase:
+    global _database
+    if _database is None:
+        _database = SqliteDatabase(
+            os.path.join(directory(), 'gen1.sqlite'), 1, 2000)
+        atexit.register(_database.close)
+    return _database
+
+
+def sqlSource() -> SqlSource:
+    return SqlSource(database())
+
+
+async def databaseSnapshot() -> Snapshot:
+    return Snapshot(await _readTables(database()))
+
+
+def binarySnapshot() -> Snapshot:
+    global _dataset
+    if _dataset is None:
+        _dataset = BinaryDataset(os.path.join(directory(), 'gen1.bin'))
+        atexit.register(_dataset.close)
+    return Snapshot(_dataset.select(tables))
+
+
+class AsyncTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self) -> None:
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_until_complete(self, coroutine: Awaitable[T]) -> T:
+        return self.loop.run_until_complete(coroutine)
@@ -0,0 +1,60 @@
+import math
+import unittest
+
+from typing import List  # noqa: F401
+
+from ..library.capture import CaptureOdds, balls, ballByName, captureChance
+from ..library.capture import captureOdds, noStatus, statusByName
+
+
+class TestNames(unittest.TestCase):
+    def test_ball(self) -> None:
+        self.assertEqual(ballByName('ultra').name, 'Ultra Ball')
+        self.assertEqual(ballByName('pokeball').name, 'Poke Ball')
+        self.assertEqual(ballByName('Great Ball').name, 'Great Ball')
+        self.assertIsNone(ballByName('xyz'))
+
+    def test_status(self) -> None:
+        self.assertEqual(statusByName('slp').name, 'Asleep')
+        self.assertEqual(statusByName('PARALYSIS').name, 'Paralyzed')
+        self.assertEqual(statusByName('none'), noStatus)
+        self.assertIsNone(statusByName('confused'))
+
+
+class TestCaptureChance(unittest.TestCase):
+    def test_pikachu_full_hp_poke_ball(self) -> None:
+        # R1 up to 190 of 256 is checked, F is 110 * 255 // 12 // 27 = 86
+        self.assertAlmostEqual(
+            captureChance(190, balls['Poke Ball'], noStatus, 110, 110),
+            191 * 87 / 65536)
+
+    def test_mewtwo_asleep_ultra_ball(self) -> None:
+        # 25 of 151 catch outright, the 4 up to 28 pass with F at 255
+        self.assertAlmostEqual(
+            captureChance(3, balls['Ultra Ball'], statusByName('sleep'),
+                          238, 2),
+            29 / 151)
+
+    def test_great_ball(self) -> None:
+        # R1 up to 45 of 201 is checked, F is 100 * 255 // 8 // 25 = 127
+        self.assertAlmostEqual(
+            captureChance(45, balls['Great Ball'], noStatus, 100, 100),
+            46 * 128 / 256 / 201)
+
+    def test_great_ball_above_poke_ball(self) -> None:
+        # At full HP the Great Ball even beats the Ultra Ball in Gen 1
+        chances: List[float] = [
+            captureChance(45, balls[name], noStatus, 100, 100)
+            for name in ['Poke Ball', 'Ultra Ball', 'Great Ball']]
+        self.assertEqual(chances, sorted(chances))
+
+    def test_master_ball(self) -> None:
+        self.assertEqual(
+            captureChance(3, balls['Master Ball'], noStatus, 238, 238), 1.0)
+
+
+class TestCaptureOdds(unittest.TestCase):
+    def test_odds(self) -> None:
+        self.assertEqual(captureOdds(0.5), CaptureOdds(0.5, 2.0, 4))
+        self.assertEqual(captureOdds(1.0), CaptureOdds(1.0, 1.0, 1))
+        self.assertEqual(captureOdds(0.0), CaptureOdds(0.0, math.inf, None))
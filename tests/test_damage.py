@@ -0,0 +1,93 @@
+import unittest
+
+from typing import List, Optional  # noqa: F401
+
+from ..library.damage import Combatant, DamageRange, MoveDamage, baseDamage
+from ..library.damage import bestMoves
+from ..library.damage import combatant, criticalChance, expectedHits
+from ..library.damage import moveDamage, rollDamage
+from ..library.gen1snapshot import Snapshot
+from ..library.gen1source import MoveRow
+from .dataset import binarySnapshot
+
+
+class TestFormula(unittest.TestCase):
+    def test_base_damage(self) -> None:
+        # Pikachu L50 Special 70 Thunderbolt against Gyarados Special 120
+        self.assertEqual(baseDamage(50, 95, 70, 120, False, ()), 26)
+        self.assertEqual(baseDamage(50, 95, 70, 120, True, ()), 39)
+        self.assertEqual(baseDamage(50, 95, 70, 120, True, (2.0, 2.0)), 156)
+        self.assertEqual(baseDamage(50, 95, 70, 120, True, (0.5,)), 19)
+
+    def test_stats_above_255(self) -> None:
+        # Both are divided by 4, 300 and 200 become 75 and 50
+        self.assertEqual(baseDamage(100, 100, 300, 200, False, ()),
+                         baseDamage(100, 100, 75, 50, False, ()))
+
+    def test_roll(self) -> None:
+        self.assertEqual(rollDamage(156)[:2], (132, 156))
+        self.assertEqual(rollDamage(1), DamageRange(1, 1, 1.0))
+        self.assertEqual(rollDamage(0), DamageRange(0, 0, 0.0))
+
+    def test_critical_chance(self) -> None:
+        self.assertEqual(criticalChance(90, False), 45 / 256)
+        self.assertEqual(criticalChance(90, True), 255 / 256)
+        self.assertEqual(criticalChance(45, True), 176 / 256)
+
+
+class TestMoveDamage(unittest.TestCase):
+    snapshot: Snapshot
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.snapshot = binarySnapshot()
+
+    def pokemon(self, name: str, level: int=50) -> Combatant:
+        return combatant(self.snapshot.pokemonById[
+            self.snapshot.pokemonIdByName[name]], level)
+
+    def move(self, name: str) -> MoveRow:
+        return self.snapshot.moves[self.snapshot.moveIdByName[name]]
+
+    def damage(self,
+               attacker: str,
+               move: str,
+               defender: str) -> Optional[MoveDamage]:
+        return moveDamage(self.snapshot.chart, self.pokemon(attacker),
+                          self.pokemon(defender), self.move(move))
+
+    def test_pikachu_thunderbolt_gyarados(self) -> None:
+        self.assertEqual(self.pokemon('gyarados').hp, 170)
+        damage: Optional[MoveDamage] = self.damage(
+            'pikachu', 'thunderbolt', 'gyarados')
+        assert damage is not None
+        self.assertEqual(damage.multiplier, 4.0)
+        self.assertEqual(damage.normal[:2], (132, 156))
+        self.assertEqual(damage.critical[:2], (245, 288))
+        self.assertEqual(damage.criticalChance, 45 / 256)
+        self.assertEqual(damage.hits, (1, 1))
+
+    def test_immune(self) -> None:
+        damage: Optional[MoveDamage] = self.damage(
+            'tauros', 'body slam', 'gengar')
+        assert damage is not None
+        self.assertEqual(damage.multiplier, 0)
+        self.assertEqual(damage.normal, DamageRange(0, 0, 0.0))
+        self.assertEqual(damage.expected, 0)
+
+    def test_status_move(self) -> None:
+        self.assertIsNone(self.damage('pikachu', 'thunder wave', 'onix'))
+
+    def test_multihit(self) -> None:
+        self.assertEqual(expectedHits(self.move('fury attack')), (2, 5, 3.0))
+        self.assertEqual(expectedHits(self.move('tackle')), (1, 1, 1.0))
+
+    def test_best_moves(self) -> None:
+        moves: List[MoveDamage] = bestMoves(
+            self.snapshot.chart, self.pokemon('tauros'),
+            self.pokemon('gengar'), self.snapshot.damaging)
+        self.assertTrue(moves)
+        self.assertNotIn('Body Slam', [d.move.name for d in moves])
+        self.assertEqual(
+            [d.expected for d in moves],
+            sorted((d.expected for d in moves), reverse=True))
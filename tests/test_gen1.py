@@ -0,0 +1,123 @@
+from typing import Any, Dict, List, Tuple  # noqa: F401
+
+from ..library.gen1 import Generation1
+from ..library.gen1source import Source
+from .dataset import AsyncTestCase, binarySnapshot, databaseSnapshot
+from .dataset import sqlSource
+
+queries: List[str] = [
+    '1', '25', '151', '152', '0', '0x54', '0xa5', 'pikachu', 'Mr.Mime',
+    'pikchu', 'mew', 'surf', 'Thunderbolt', 'thundrbolt', 'cut', '15', '57',
+    'tackle', 'growl', 'pallet town', 'viridian forest', 'route 12', '0x0c',
+    'safari zone center', 'seafoam islands 1f', 'cerulean city', 'xyz', '',
+    ]
+
+methods: List[Tuple[str, Tuple[Any, ...]]] = [
+    ('pokemonDex', ()), ('pokemonEntry', ()), ('pokemonIndex', ()),
+    ('pokemonMove', ()), ('pokemonStats', ()), ('pokemonEvolve', ()),
+    ('pokemonLearn', (False, False, False, False)),
+    ('pokemonLearn', (True, True, True, True)),
+    ('pokemonTmHm', (True,)), ('pokemonTm', (False,)),
+    ('pokemonHm', (True,)), ('pokemonLocation', (True,)),
+    ('pokemonWild', (True,)), ('pokemonSurf', (False,)),
+    ('pokemonFish', (True,)), ('pokemonType', ()), ('pokemonMatchup', ()),
+    ('pokemonDamage', ()), ('pokemonCatch', ()),
+    ]
+
+# Queries only some commands understand
+commands: List[Tuple[str, str, Tuple[Any, ...]]] = [
+    ('pokemonLearn', 'surf, strength', (False, True, False, False)),
+    ('pokemonLearn', 'thunderbolt + thunder wave', (True, True, True, True)),
+    ('pokemonStats', 'pikachu L50 95 60 45 95 60', ()),
+    ('pokemonType', 'water/flying', ()),
+    ('pokemonType', 'normal/normal', ()),
+    ('pokemonMatchup', 'thunderbolt vs gyarados', ()),
+    ('pokemonMatchup', 'fire vs grass/poison', ()),
+    ('pokemonDamage', 'pikachu thunderbolt vs gyarados', ()),
+    ('pokemonDamage', 'mewtwo L70 vs alakazam L65', ()),
+    ('pokemonCatch', 'mewtwo L70 sleep 1% ultra', ()),
+    ('pokemonCatch', 'pikachu great ball', ()),
+    ]
+
+
+async def respond(source: Source,
+                  game: str,
+                  query: str,
+                  method: str,
+                  args: Tuple[Any, ...]) -> List[str]:
+    info: Generation1 = Generation1(query, game)
+    info.data = source
+    # An exception fails the test, every source raising the same one is not
+    # parity
+    return [message async for message in getattr(info, method)(*args)]
+
+
+async def respondAll(source: Source) -> Dict[str, List[str]]:
+    responses: Dict[str, List[str]] = {}
+    game: str
+    query: str
+    method: str
+    args: Tuple[Any, ...]
+    for game in 'red', 'yellow':
+        for query in queries:
+            for method, args in methods:
+                responses[f'{game} {method}{args} {query}'] = await respond(
+                    source, game, query, method, args)
+        for method, query, args in commands:
+            responses[f'{game} {method}{args} {query}'] = await respond(
+                source, game, query, method, args)
+    return responses
+
+
+class TestSourceParity(AsyncTestCase):
+    def test_snapshot(self) -> None:
+        expected: Dict[str, List[str]]
+        expected = self.run_until_complete(respondAll(sqlSource()))
+        actual: Dict[str, List[str]] = self.run_until_complete(
+            respondAll(self.run_until_complete(databaseSnapshot())))
+        key: str
+        for key in expected:
+            with self.subTest(key=key):
+                self.assertEqual(actual[key], expected[key])
+
+    def test_binary_snapshot(self) -> None:
+        expected: Dict[str, List[str]]
+        expected = self.run_until_complete(respondAll(sqlSource()))
+        actual: Dict[str, List[str]] = self.run_until_complete(
+            respondAll(binarySnapshot()))
+        key: str
+        for key in expected:
+            with self.subTest(key=key):
+                self.assertEqual(actual[key], expected[key])
+
+
+class TestNamePrecedence(AsyncTestCase):
+    def learn(self, source: Source, query: str) -> List[str]:
+        return self.run_until_complete(respond(
+            source, 'red', query, 'pokemonLearn',
+            (False, False, False, False)))
+
+    def test_exact_move_before_fuzzy_pokemon(self) -> None:
+        move: str
+        for move in ['Growl', 'Growth', 'Dig', 'Slash', 'Splash', 'Counter',
+                     'Sing', 'Lick', 'Hypnosis', 'Twineedle', 'Dragon Rage']:
+            with self.subTest(move=move):
+                messages: List[str] = self.learn(sqlSource(), move)
+                self.assertTrue(
+                    messages[0].startswith(f'Move Name: {move},'),
+                    messages)
+
+    def test_exact_pokemon_before_exact_move(self) -> None:
+        messages: List[str] = self.learn(sqlSource(), 'pikachu')
+        self.assertTrue(messages[0].startswith('Pokemon Name: Pikachu,'),
+                        messages)
+
+    def test_fuzzy_pokemon_before_fuzzy_move(self) -> None:
+        messages: List[str] = self.learn(sqlSource(), 'growlith')
+        self.assertTrue(messages[0].startswith('Pokemon Name: Growlithe,'),
+                        messages)
+
+    def test_fuzzy_move(self) -> None:
+        messages: List[str] = self.learn(sqlSource(), 'thundrbolt')
+        self.assertTrue(messages[0].startswith('Move Name: Thunderbolt,'),
+                        messages)
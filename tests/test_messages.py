@@ -0,0 +1,31 @@
+import unittest
+
+from ..library.messages import pack
+
+
+class TestPack(unittest.TestCase):
+    def test_empty(self) -> None:
+        self.assertEqual(list(pack([], 'Moves: ', limit=20)), [])
+
+    def test_one_message(self) -> None:
+        self.assertEqual(list(pack(['a', 'b', 'c'], 'Moves: ', limit=20)),
+                         ['Moves: a, b, c'])
+
+    def test_split_at_limit(self) -> None:
+        messages = list(pack(['aaaa', 'bbbb', 'cccc'], '> ', limit=12))
+        self.assertEqual(messages, ['> aaaa, bbbb', '> cccc'])
+        self.assertTrue(all(len(m) <= 12 for m in messages))
+
+    def test_separator(self) -> None:
+        self.assertEqual(list(pack(['a', 'b'], separator=' | ', limit=20)),
+                         ['a | b'])
+
+    def test_long_item_is_cut(self) -> None:
+        self.assertEqual(list(pack(['abcdefghij', 'k'], '> ', limit=6)),
+                         ['> abcd', '> k'])
+
+    def test_long_prefix_is_cut(self) -> None:
+        messages = list(pack(['a', 'b'], 'Pokemon learns: ', limit=8))
+        self.assertEqual(messages, ['Pokemona', 'Pokemonb'])
+        self.assertEqual(list(pack(['a'], 'abcdefgh', limit=8)),
+                         ['abcdefga'])
@@ -0,0 +1,49 @@
+import unittest
+
+from ..library.namematch import NameIndex, distance, normalize
+
+
+class TestNormalize(unittest.TestCase):
+    def test_normalize(self) -> None:
+        self.assertEqual(normalize('Mr. Mime'), 'mrmime')
+        self.assertEqual(normalize('mr mime'), 'mrmime')
+        self.assertEqual(normalize('Nidoran♀'), 'nidoranf')
+        self.assertEqual(normalize('Poké Ball'), 'pokeball')
+
+    def test_distance(self) -> None:
+        self.assertEqual(distance('pikachu', 'pikachu'), 0)
+        self.assertEqual(distance('pikchu', 'pikachu'), 1)
+        self.assertEqual(distance('', 'abc'), 3)
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = NameIndex([
+            'Pikachu', 'Raichu', 'Mr. Mime', 'Nidoran♀', 'Nidoran♂',
+            'Growlithe', 'Charmander', 'Charmeleon', 'Charizard', 'Seaking'])
+
+    def test_exact(self) -> None:
+        self.assertEqual(self.index.match('pikachu'), 'Pikachu')
+        self.assertEqual(self.index.match('MR MIME'), 'Mr. Mime')
+        self.assertEqual(self.index.match('nidoranf'), 'Nidoran♀')
+
+    def test_unique_prefix(self) -> None:
+        self.assertEqual(self.index.match('growl'), 'Growlithe')
+        self.assertEqual(self.index.match('chariz'), 'Charizard')
+
+    def test_ambiguous_prefix(self) -> None:
+        # Falls back to trigrams, the tie is broken by edit distance, length
+        # and then name
+        self.assertEqual(self.index.match('charm'), 'Charmander')
+
+    def test_misspelled(self) -> None:
+        self.assertEqual(self.index.match('pikchu'), 'Pikachu')
+        self.assertEqual(self.index.match('charizrd'), 'Charizard')
+
+    def test_below_threshold(self) -> None:
+        self.assertIsNone(self.index.match('sing'))
+        self.assertIsNone(self.index.match('xyz'))
+        self.assertIsNone(self.index.match(''))
+
+    def test_duplicates(self) -> None:
+        self.assertEqual(len(NameIndex(['Pikachu', 'pikachu', ''])), 1)
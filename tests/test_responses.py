@@ -0,0 +1,59 @@
+import unittest
+
+from unittest.mock import patch
+
+from ..library.responses import ResponseCache, normalizeQuery
+
+
+class TestNormalizeQuery(unittest.TestCase):
+    def test_normalize(self) -> None:
+        self.assertEqual(normalizeQuery('  Mr.   MIME '), 'mr. mime')
+        self.assertEqual(normalizeQuery('pikachu'), 'pikachu')
+        self.assertEqual(normalizeQuery(''), '')
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = patch('time.monotonic', return_value=1000.0)
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_put(self) -> None:
+        cache = ResponseCache(2, 60)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', ('A',))
+        self.assertEqual(cache.get('a'), ('A',))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used(self) -> None:
+        cache = ResponseCache(2, 60)
+        cache.put('a', ('A',))
+        cache.put('b', ('B',))
+        cache.get('a')
+        cache.put('c', ('C',))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), ('A',))
+        self.assertEqual(cache.get('c'), ('C',))
+
+    def test_expires(self) -> None:
+        cache = ResponseCache(2, 60)
+        cache.put('a', ('A',))
+        self.monotonic.return_value = 1059.0
+        self.assertEqual(cache.get('a'), ('A',))
+        self.monotonic.return_value = 1060.0
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled(self) -> None:
+        cache = ResponseCache(0, 60)
+        cache.put('a', ('A',))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self) -> None:
+        cache = ResponseCache(2, 60)
+        cache.put('a', ('A',))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
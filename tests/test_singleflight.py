@@ -0,0 +1,80 @@
+import asyncio
+
+from typing import List  # noqa: F401
+
+from ..library.singleflight import SingleFlight
+from .dataset import AsyncTestCase
+
+
+class TestSingleFlight(AsyncTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.flight = SingleFlight()
+        self.started: List[str] = []
+
+    async def call(self, key: str) -> str:
+        self.started.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    async def fail(self) -> str:
+        self.started.append('fail')
+        await asyncio.sleep(0.01)
+        raise ValueError('fail')
+
+    def test_shares_call(self) -> None:
+        results: List[str] = self.run_until_complete(asyncio.gather(
+            self.flight.run('a', lambda: self.call('a')),
+            self.flight.run('a', lambda: self.call('a')),
+            self.flight.run('b', lambda: self.call('b'))))
+        self.assertEqual(results, ['A', 'A', 'B'])
+        self.assertEqual(self.started, ['a', 'b'])
+        self.assertEqual(self.flight.calls, 2)
+        self.assertEqual(self.flight.shared, 1)
+        self.assertEqual(len(self.flight), 0)
+
+    def test_runs_again_after_call(self) -> None:
+        self.run_until_complete(self.flight.run('a', lambda: self.call('a')))
+        self.run_until_complete(self.flight.run('a', lambda: self.call('a')))
+        self.assertEqual(self.started, ['a', 'a'])
+        self.assertEqual(self.flight.shared, 0)
+
+    def test_shares_exception(self) -> None:
+        results = self.run_until_complete(asyncio.gather(
+            self.flight.run('a', self.fail),
+            self.flight.run('a', self.fail),
+            return_exceptions=True))
+        self.assertEqual(self.started, ['fail'])
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(len(self.flight), 0)
+
+    def test_cancelled_waiter(self) -> None:
+        async def run() -> str:
+            first: asyncio.Future = asyncio.ensure_future(
+                self.flight.run('a', lambda: self.call('a')))
+            waiter: asyncio.Future = asyncio.ensure_future(
+                self.flight.run('a', lambda: self.call('a')))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await first
+
+        self.assertEqual(self.run_until_complete(run()), 'A')
+        self.assertEqual(self.started, ['a'])
+
+    def test_cancelled_leader(self) -> None:
+        async def run() -> str:
+            leader: asyncio.Future = asyncio.ensure_future(
+                self.flight.run('a', lambda: self.call('a')))
+            await asyncio.sleep(0)
+            waiter: asyncio.Future = asyncio.ensure_future(
+                self.flight.run('a', lambda: self.call('a')))
+            await asyncio.sleep(0)
+            leader.cancel()
+            result: str = await waiter
+            self.assertTrue(leader.cancelled())
+            return result
+
+        self.assertEqual(self.run_until_complete(run()), 'A')
+        self.assertEqual(self.started, ['a'])
+        self.assertEqual(len(self.flight), 0)
@@ -0,0 +1,75 @@
+import unittest
+
+from typing import Tuple  # noqa: F401
+
+from ..library.gen1source import PokemonRow
+from ..library.stats import DVInference, baseStats, hpDV, hpValue, inferDVs
+from ..library.stats import statExpBonus, statValue, statValues
+
+pikachu: PokemonRow = PokemonRow(
+    25, 84, 'Pikachu', 'Electric', None, 'Medium Fast', 190, 0.4, 6.0,
+    35, 55, 30, 90, 50)
+mewtwo: PokemonRow = PokemonRow(
+    150, 131, 'Mewtwo', 'Psychic', None, 'Slow', 3, 2.0, 122.0,
+    106, 110, 90, 130, 154)
+
+
+class TestStats(unittest.TestCase):
+    def test_stat_exp_bonus(self) -> None:
+        self.assertEqual(statExpBonus(0), 0)
+        self.assertEqual(statExpBonus(15), 1)
+        self.assertEqual(statExpBonus(16), 1)
+        self.assertEqual(statExpBonus(17), 1)
+        self.assertEqual(statExpBonus(65535), 63)
+
+    def test_pikachu_level_50(self) -> None:
+        self.assertEqual(hpValue(pikachu.baseHP, 0, 50), 95)
+        self.assertEqual(hpValue(pikachu.baseHP, 15, 50), 110)
+        self.assertEqual(statValues(baseStats(pikachu), 15, 50),
+                         (110, 75, 50, 110, 70))
+        self.assertEqual(statValues(baseStats(pikachu), 0, 50),
+                         (95, 60, 35, 95, 55))
+
+    def test_mewtwo_level_100_max(self) -> None:
+        self.assertEqual(hpValue(mewtwo.baseHP, 15, 100, 65535), 415)
+        self.assertEqual(statValue(mewtwo.baseSpecial, 15, 100, 65535), 406)
+        self.assertEqual(statValue(mewtwo.baseSpeed, 15, 100, 65535), 358)
+
+    def test_hp_dv(self) -> None:
+        self.assertEqual(hpDV(15, 15, 15, 15), 15)
+        self.assertEqual(hpDV(14, 15, 14, 15), 5)
+        self.assertEqual(hpDV(0, 0, 0, 1), 1)
+
+
+class TestInferDVs(unittest.TestCase):
+    def test_exact(self) -> None:
+        self.assertEqual(
+            inferDVs(baseStats(pikachu), 50, (110, 75, 50, 110, 70)),
+            DVInference(((15,),) * 5, 1))
+        self.assertEqual(
+            inferDVs(baseStats(pikachu), 50, (102, 74, 50, 110, 70)),
+            DVInference(((7,), (14,), (15,), (15,), (15,)), 1))
+
+    def test_inconsistent_hp(self) -> None:
+        # An Attack DV of 14 makes the HP DV 7, not 15
+        self.assertEqual(
+            inferDVs(baseStats(pikachu), 50, (110, 74, 50, 110, 70)),
+            DVInference(((),) * 5, 0))
+
+    def test_range(self) -> None:
+        # At level 5 several DVs give the same stats
+        stats: Tuple[int, ...] = statValues(baseStats(pikachu), 12, 5)
+        inference: DVInference = inferDVs(baseStats(pikachu), 5, stats)
+        self.assertIn(12, inference.dvs[1])
+        self.assertGreater(len(inference.dvs[1]), 1)
+        brute: int = sum(
+            1
+            for attack in range(16) for defense in range(16)
+            for speed in range(16) for special in range(16)
+            if hpValue(pikachu.baseHP,
+                       hpDV(attack, defense, speed, special), 5) == stats[0]
+            and statValue(pikachu.baseAttack, attack, 5) == stats[1]
+            and statValue(pikachu.baseDefense, defense, 5) == stats[2]
+            and statValue(pikachu.baseSpeed, speed, 5) == stats[3]
+            and statValue(pikachu.baseSpecial, special, 5) == stats[4])
+        self.assertEqual(inference.combinations, brute)
@@ -0,0 +1,51 @@
+import unittest
+
+from typing import Dict, List, Set  # noqa: F401
+
+from ..library.typechart import TypeChart
+from .dataset import binarySnapshot
+
+
+class TestTypeChart(unittest.TestCase):
+    chart: TypeChart
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.chart = binarySnapshot().chart
+
+    def test_multiplier(self) -> None:
+        self.assertEqual(self.chart.multiplier('Electric', ['Water']), 2.0)
+        self.assertEqual(
+            self.chart.multiplier('Electric', ['Water', 'Flying']), 4.0)
+        self.assertEqual(
+            self.chart.multiplier('Fire', ['Grass', 'Poison']), 2.0)
+        self.assertEqual(self.chart.multiplier('Normal', ['Ghost']), 0.0)
+
+    def test_generation_1(self) -> None:
+        # Ghost does not affect Psychic, Bug and Poison are super effective
+        # against each other and Ice is neutral against Fire
+        self.assertEqual(self.chart.multiplier('Ghost', ['Psychic']), 0.0)
+        self.assertEqual(self.chart.multiplier('Bug', ['Poison']), 2.0)
+        self.assertEqual(self.chart.multiplier('Poison', ['Bug']), 2.0)
+        self.assertEqual(self.chart.multiplier('Ice', ['Fire']), 1.0)
+
+    def test_special(self) -> None:
+        special: Set[str] = {
+            name for name, isSpecial in zip(self.chart.names,
+                                            self.chart.special)
+            if isSpecial}
+        self.assertIn('Fire', special)
+        self.assertIn('Psychic', special)
+        self.assertNotIn('Normal', special)
+        self.assertNotIn('Ghost', special)
+
+    def test_type_by_name(self) -> None:
+        self.assertEqual(self.chart.typeByName('electric'), 'Electric')
+        self.assertEqual(self.chart.typeByName('elec'), 'Electric')
+        self.assertIsNone(self.chart.typeByName('elec', fuzzy=False))
+
+    def test_affected(self) -> None:
+        groups: Dict[float, List[str]] = self.chart.affected('Electric')
+        self.assertIn('Gyarados', groups[4.0])
+        self.assertIn('Onix', groups[0.0])
+        self.assertEqual(sum(len(names) for names in groups.values()), 151)
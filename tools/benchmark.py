@@ -0,0 +1,408 @@
+'''
+Benchmarks every !poke* command against a local copy of the Gen 1 dataset
+
+    python -m pkg.pokedex.tools.benchmark \
+        pkg/pokedex/gen1pokedex-sqlite.sql --output bench.json
+    python -m pkg.pokedex.tools.benchmark \
+        pkg/pokedex/gen1pokedex-sqlite.sql --compare bench.json
+
+The dump is bulk loaded into a temporary SQLite database and every
+Generation1 method is driven with a mix of names, misspelled names, dex
+numbers, 0x indexes, TM/HM numbers and locations, in every game, for both
+the SQL source and the in-memory snapshot. Latency percentiles, statements
+executed and peak memory allocated are reported for each command.
+
+The database is read with sqlite3 on the event loop thread, so the numbers
+cover the library and SQLite but not the ODBC driver.
+'''
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Any, Dict, Iterator, List, NamedTuple  # noqa: F401
+from typing import Optional, Sequence, TextIO, Tuple, cast  # noqa: F401
+
+from lib.database import DatabaseMain
+
+from ..library import gen1snapshot
+from ..library.gen1 import Generation1
+from ..library.gen1source import Source
+from ..library.gen1sql import SqlSource
+from .loaddump import loadSqlite, parse
+
+games: Tuple[str, ...] = 'red', 'blue', 'yellow'
+
+pokemonQueries: Tuple[str, ...] = (
+    'pikachu', 'Bulbasaur', 'mr. mime', 'nidoran♀', 'charizrd', 'mewtwo',
+    '1', '25', '151', '0x54', '0xa5', 'missingno')
+moveQueries: Tuple[str, ...] = (
+    'surf', 'Thunderbolt', 'razor leaf', 'hyperbeam', 'psychic', '57',
+    '0x39', '165', 'splash')
+machineQueries: Tuple[str, ...] = (
+    '1', '3', '5', '15', '24', '29', '50', 'surf', 'thunder wave', '99')
+locationQueries: Tuple[str, ...] = (
+    'pallet town', 'viridian forest', 'route 1', 'route 12',
+    'safari zone center', 'seafoam islands 1f', 'cerulean city', '12',
+    '0x0c', '0x3b', '0xdd', 'nowhere')
+indexQueries: Tuple[str, ...] = ('1', '25', '84', '0x54', '0xa5', '0xff')
+statsQueries: Tuple[str, ...] = (
+    'pikachu L50', 'mewtwo lv. 70', '25 level 5', 'charizrd L36',
+    'pikachu L50 102 68 42 102 62', 'pikachu L5 19 11 8 14 10')
+catchQueries: Tuple[str, ...] = (
+    'pikachu', 'mewtwo ultra ball 1% asleep L70', 'chansey safari 50%',
+    'zapdos great ball 10% paralyzed', 'snorlax grate ball 30% slp',
+    'caterpie 1% frz l3')
+learnersQueries: Tuple[str, ...] = (
+    'surf,strength,fly', 'cut + surf + strength', 'thunderbolt, thunder',
+    'body slam, earthquake, blizzard', '57, 0x46', 'thundrbolt, body slam')
+typeQueries: Tuple[str, ...] = (
+    'fire', 'Water/Flying', 'ghost', 'elec', 'charizard', 'gengar', '130')
+matchupQueries: Tuple[str, ...] = (
+    'fire vs bulbasaur', 'thunderbolt vs gyarados', 'ground, ghost/poison',
+    'ice', 'surf', 'electric vs charizrd')
+damageQueries: Tuple[str, ...] = (
+    'pikachu thunderbolt vs gyarados', 'mewtwo psychic L70 vs alakazam L65',
+    'tauros vs chansey', 'mr. mime, psychic vs jynx', 'pikchu surf vs onix',
+    'gengar L100 vs snorlax L100')
+
+
+class Command(NamedTuple):
+    method: str
+    flags: Tuple[bool, ...]
+    queries: Tuple[str, ...]
+
+
+commands: Dict[str, Command] = {
+    '!pokedex': Command('pokemonDex', (), pokemonQueries),
+    '!pokeentry': Command('pokemonEntry', (), pokemonQueries),
+    '!pokeindex': Command('pokemonIndex', (), indexQueries),
+    '!pokemove': Command('pokemonMove', (), moveQueries),
+    '!pokestats': Command('pokemonStats', (), pokemonQueries),
+    '!pokestats-level': Command('pokemonStats', (), statsQueries),
+    '!pokeevolve': Command('pokemonEvolve', (), pokemonQueries),
+    '!pokelearn': Command('pokemonLearn', (False,) * 4,
+                          pokemonQueries + moveQueries),
+    '!pokelearn-full': Command('pokemonLearn', (True,) * 4,
+                               pokemonQueries + moveQueries),
+    # Several moves at once, answered from the learnset bitsets
+    '!pokelearn-moves': Command('pokemonLearn', (False,) * 4,
+                                learnersQueries),
+    '!poketmhm': Command('pokemonTmHm', (False,), machineQueries),
+    '!poketmhm-full': Command('pokemonTmHm', (True,), machineQueries),
+    '!poketm': Command('pokemonTm', (False,), machineQueries),
+    '!poketm-full': Command('pokemonTm', (True,), machineQueries),
+    '!pokehm': Command('pokemonHm', (False,), machineQueries),
+    '!pokehm-full': Command('pokemonHm', (True,), machineQueries),
+    '!pokelocation': Command('pokemonLocation', (False,), locationQueries),
+    '!pokewild': Command('pokemonWild', (False,), locationQueries),
+    '!pokesurf': Command('pokemonSurf', (False,), locationQueries),
+    '!pokefish': Command('pokemonFish', (False,), locationQueries),
+    '!poketype': Command('pokemonType', (), typeQueries),
+    '!pokematchup': Command('pokemonMatchup', (), matchupQueries),
+    '!pokedamage': Command('pokemonDamage', (), damageQueries),
+    '!pokecatch': Command('pokemonCatch', (), catchQueries),
+    }
+
+
+class Case(NamedTuple):
+    command: str
+    game: str
+    query: str
+
+
+class Measurement(NamedTuple):
+    queries: int
+    messages: int
+    bytes: int
+    allocated: int
+
+
+class _Cursor:
+    # The parts of an aioodbc cursor the library uses, over sqlite3
+    def __init__(self, database: 'FixtureDatabase') -> None:
+        self._database: FixtureDatabase = database
+        self._cursor: sqlite3.Cursor = database.connection.cursor()
+
+    async def __aenter__(self) -> '_Cursor':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self._cursor.close()
+
+    async def execute(self, query: str, params: Sequence[Any]=()) -> None:
+        self._database.queries += 1
+        self._cursor.execute(query, params)
+
+    async def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        return self._cursor.fetchone()
+
+    async def fetchall(self) -> List[Tuple[Any, ...]]:
+        return self._cursor.fetchall()
+
+    def __aiter__(self) -> '_Cursor':
+        return self
+
+    async def __anext__(self) -> Tuple[Any, ...]:
+        row: Optional[Tuple[Any, ...]] = self._cursor.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+
+class FixtureDatabase:
+    '''
+    Stands in for DatabaseMain over the temporary SQLite database and counts
+    the statements executed
+    '''
+    isSqlite: bool = True
+
+    def __init__(self, path: str) -> None:
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.queries: int = 0
+
+    async def cursor(self) -> _Cursor:
+        return _Cursor(self)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def cases() -> Iterator[Case]:
+    name: str
+    command: Command
+    game: str
+    query: str
+    for name, command in commands.items():
+        for game in games:
+            for query in command.queries:
+                yield Case(name, game, query)
+
+
+async def runCase(source: Source, case: Case) -> List[str]:
+    command: Command = commands[case.command]
+    info: Generation1 = Generation1(case.query, case.game)
+    # The source is given directly, there is no connection pool to enter
+    info.data = source
+    return [message async for message
+            in getattr(info, command.method)(*command.flags)]
+
+
+async def measure(source: Source,
+                  database: FixtureDatabase,
+                  allCases: List[Case]) -> Dict[Case, Measurement]:
+    # Separate from the timed rounds, tracing allocations slows everything
+    measurements: Dict[Case, Measurement] = {}
+    case: Case
+    tracemalloc.start()
+    try:
+        for case in allCases:
+            queries: int = database.queries
+            tracemalloc.clear_traces()
+            messages: List[str] = await runCase(source, case)
+            allocated: int = tracemalloc.get_traced_memory()[1]
+            measurements[case] = Measurement(
+                database.queries - queries, len(messages),
+                sum(len(m.encode('utf-8')) for m in messages), allocated)
+    finally:
+        tracemalloc.stop()
+    return measurements
+
+
+async def timeCases(source: Source,
+                    allCases: List[Case],
+                    rounds: int,
+                    seed: int) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = {name: [] for name in commands}
+    order: List[Case] = list(allCases)
+    shuffle: random.Random = random.Random(seed)
+    case: Case
+    for _ in range(rounds):
+        shuffle.shuffle(order)
+        for case in order:
+            start: float = time.perf_counter()
+            await runCase(source, case)
+            latencies[case.command].append(time.perf_counter() - start)
+    return latencies
+
+
+def percentile(samples: Sequence[float], percent: float) -> float:
+    # Nearest rank, samples must be sorted
+    rank: int = max(math.ceil(percent / 100 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+def summarize(latencies: Dict[str, List[float]],
+              measurements: Dict[Case, Measurement]
+              ) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    name: str
+    samples: List[float]
+    for name, samples in latencies.items():
+        samples = sorted(samples)
+        measured: List[Measurement] = [m for c, m in measurements.items()
+                                       if c.command == name]
+        results[name] = {
+            'samples': len(samples),
+            'mean': sum(samples) / len(samples) * 1000,
+            'p50': percentile(samples, 50) * 1000,
+            'p95': percentile(samples, 95) * 1000,
+            'p99': percentile(samples, 99) * 1000,
+            'queries': sum(m.queries for m in measured) / len(measured),
+            'maxQueries': max(m.queries for m in measured),
+            'messages': sum(m.messages for m in measured) / len(measured),
+            'bytes': sum(m.bytes for m in measured) / len(measured),
+            'allocated': sum(m.allocated for m in measured) / len(measured),
+            'maxAllocated': max(m.allocated for m in measured),
+            }
+    return results
+
+
+async def benchmark(path: str,
+                    sources: Sequence[str],
+                    rounds: int,
+                    seed: int) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    allCases: List[Case] = list(cases())
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    database: FixtureDatabase = FixtureDatabase(path)
+    try:
+        name: str
+        for name in sources:
+            source: Source
+            if name == 'sql':
+                source = SqlSource(cast(DatabaseMain, database))
+            else:
+                snapshot: Optional[gen1snapshot.Snapshot]
+                snapshot = await gen1snapshot.load(
+                    cast(DatabaseMain, database))
+                if snapshot is None:
+                    raise RuntimeError('the snapshot could not be loaded')
+                source = snapshot
+            # One untimed pass so every cache is as warm as on a live bot
+            case: Case
+            for case in allCases:
+                await runCase(source, case)
+            measurements: Dict[Case, Measurement]
+            measurements = await measure(source, database, allCases)
+            latencies: Dict[str, List[float]]
+            latencies = await timeCases(source, allCases, rounds, seed)
+            results[name] = summarize(latencies, measurements)
+    finally:
+        database.close()
+    return results
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            universal_newlines=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+    print(f'{"source":<9}{"command":<17}{"p50 ms":>9}{"p95 ms":>9}'
+          f'{"p99 ms":>9}{"queries":>9}{"KiB":>9}')
+    source: str
+    commandResults: Dict[str, Dict[str, Any]]
+    for source, commandResults in results.items():
+        name: str
+        result: Dict[str, Any]
+        for name, result in commandResults.items():
+            print(f'{source:<9}{name:<17}{result["p50"]:>9.3f}'
+                  f'{result["p95"]:>9.3f}{result["p99"]:>9.3f}'
+                  f'{result["queries"]:>9.1f}'
+                  f'{result["allocated"] / 1024:>9.1f}')
+
+
+def compare(results: Dict[str, Dict[str, Dict[str, Any]]],
+            baseline: Dict[str, Dict[str, Dict[str, Any]]],
+            threshold: float) -> int:
+    '''
+    Prints the commands whose p95 latency or statement count grew by more
+    than threshold compared to baseline, returns how many there are
+    '''
+    regressions: int = 0
+    source: str
+    commandResults: Dict[str, Dict[str, Any]]
+    for source, commandResults in results.items():
+        name: str
+        result: Dict[str, Any]
+        for name, result in commandResults.items():
+            before: Optional[Dict[str, Any]]
+            before = baseline.get(source, {}).get(name)
+            if before is None:
+                continue
+            key: str
+            for key in 'p95', 'queries':
+                if result[key] > before[key] * threshold:
+                    regressions += 1
+                    print(f'{source} {name} {key}: {before[key]:.3f} -> '
+                          f'{result[key]:.3f}')
+    return regressions
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Benchmark the !poke* commands')
+    parser.add_argument('dump', help='gen1pokedex-sqlite.sql file')
+    parser.add_argument('--source', choices=['sql', 'snapshot', 'both'],
+                        default='both')
+    parser.add_argument('--rounds', type=int, default=20,
+                        help='timed passes over every case')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--compare',
+                        help='JSON results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='ratio to the earlier run that is a regression')
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    sources: List[str]
+    sources = ['sql', 'snapshot'] if args.source == 'both' else [args.source]
+    script: str
+    with open(args.dump, encoding='utf-8') as file:
+        script = file.read()
+    results: Dict[str, Dict[str, Dict[str, Any]]]
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'gen1.sqlite')
+        loadSqlite(parse(script), path)
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        results = loop.run_until_complete(
+            benchmark(path, sources, args.rounds, args.seed))
+    report(results)
+
+    if args.output is not None:
+        output: TextIO
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump({
+                'commit': _commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'rounds': args.rounds,
+                'seed': args.seed,
+                'results': results,
+                }, output, indent=2, ensure_ascii=False)
+    if args.compare is not None:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline: Dict[str, Any] = json.load(file)
+        if compare(results, baseline['results'], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+'''
+Renders every deterministic !poke* response ahead of time
+
+    python -m pkg.pokedex.tools.compileanswers build \
+        pkg/pokedex/gen1pokedex-sqlite.sql sqlite/gen1-answers.json.gz
+    python -m pkg.pokedex.tools.compileanswers verify \
+        sqlite/gen1.sqlite sqlite/gen1-answers.json.gz
+
+build renders every command in every game over every pokemon, move and
+location, by name, by number and by 0x index, from the in-memory snapshot.
+It then checks the table against the SQL queries unless --no-verify is
+given. verify checks an existing table against a dump or an SQLite
+database, run it after the data changes.
+
+The bot serves a query found in the table at [ANSWERS] path without
+rendering it, anything else is rendered as before.
+'''
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from typing import Any, Iterator, List, NamedTuple, Optional  # noqa: F401
+from typing import Set, Tuple  # noqa: F401
+
+from ..library import gen1snapshot
+from ..library.answers import AnswerTable, AnswerTableBuilder
+from ..library.gen1 import Generation1
+from ..library.gen1source import Source
+from ..library.gen1sql import SqlSource
+from ..library.responses import Messages
+from ..library.sqlitedirect import SqliteDatabase
+from .loaddump import loadSqlite, parse
+
+games: Tuple[str, ...] = 'red', 'blue', 'yellow'
+
+
+class Variant(NamedTuple):
+    method: str
+    flags: Tuple[bool, ...]
+    # pokemon, move, index or location
+    kinds: Tuple[str, ...]
+
+
+# Every method and flags a command in items/channel.py calls
+variants: Tuple[Variant, ...] = (
+    Variant('pokemonDex', (), ('pokemon',)),
+    Variant('pokemonEntry', (), ('pokemon',)),
+    Variant('pokemonIndex', (), ('index',)),
+    Variant('pokemonMove', (), ('move',)),
+    Variant('pokemonStats', (), ('pokemon',)),
+    Variant('pokemonEvolve', (), ('pokemon',)),
+    Variant('pokemonLearn', (False, False, False, False),
+            ('pokemon', 'move')),
+    Variant('pokemonLearn', (True, False, False, False), ('pokemon', 'move')),
+    Variant('pokemonLearn', (False, True, False, False), ('pokemon', 'move')),
+    Variant('pokemonLearn', (False, False, True, False), ('pokemon', 'move')),
+    Variant('pokemonLearn', (False, False, False, True), ('pokemon', 'move')),
+    Variant('pokemonLearn', (True, True, True, True), ('pokemon', 'move')),
+    Variant('pokemonTmHm', (False,), ('move',)),
+    Variant('pokemonTmHm', (True,), ('move',)),
+    Variant('pokemonTm', (False,), ('move',)),
+    Variant('pokemonTm', (True,), ('move',)),
+    Variant('pokemonHm', (False,), ('move',)),
+    Variant('pokemonHm', (True,), ('move',)),
+    Variant('pokemonLocation', (False,), ('location',)),
+    Variant('pokemonLocation', (True,), ('location',)),
+    Variant('pokemonWild', (False,), ('location',)),
+    Variant('pokemonWild', (True,), ('location',)),
+    Variant('pokemonSurf', (False,), ('location',)),
+    Variant('pokemonSurf', (True,), ('location',)),
+    Variant('pokemonFish', (False,), ('location',)),
+    Variant('pokemonFish', (True,), ('location',)),
+    )
+
+
+def queries(snapshot: gen1snapshot.Snapshot, kind: str) -> Set[str]:
+    # The names, numbers and 0x indexes a command of kind resolves
+    keys: Set[str] = set()
+    if kind == 'pokemon':
+        keys.update(p.name.lower() for p in snapshot.pokemonById.values())
+        keys.update(str(number) for number in snapshot.pokemonById)
+        keys.update(f'0x{number:x}' for number in snapshot.pokemonIdByIndex)
+    elif kind == 'move':
+        keys.update(m.name.lower() for m in snapshot.moves.values())
+        keys.update(str(number) for number in snapshot.moves)
+        keys.update(f'0x{number:x}' for number in snapshot.moves)
+    elif kind == 'index':
+        keys.update(str(number) for number in range(256))
+        keys.update(f'0x{number:x}' for number in range(256))
+    elif kind == 'location':
+        keys.update(name for name in snapshot.locationIdsByName)
+        keys.update(str(number) for number in snapshot.locations)
+        keys.update(f'0x{number:x}' for number in snapshot.locations)
+    return keys
+
+
+async def render(source: Source,
+                 method: str,
+                 flags: Tuple[bool, ...],
+                 game: str,
+                 query: str) -> Messages:
+    info: Generation1 = Generation1(query, game)
+    # The source is given directly, there is no connection pool to enter
+    info.data = source
+    return tuple([message async for message
+                  in getattr(info, method)(*flags)])
+
+
+async def build(snapshot: gen1snapshot.Snapshot) -> AnswerTable:
+    builder: AnswerTableBuilder = AnswerTableBuilder()
+    variant: Variant
+    for variant in variants:
+        keys: Set[str] = set()
+        kind: str
+        for kind in variant.kinds:
+            keys |= queries(snapshot, kind)
+        game: str
+        query: str
+        for game in games:
+            for query in sorted(keys):
+                builder.add(variant.method, variant.flags, game, query,
+                            await render(snapshot, variant.method,
+                                         variant.flags, game, query))
+    return builder.build()
+
+
+async def verify(table: AnswerTable, source: Source) -> List[str]:
+    '''
+    Renders every key of table with source, returns the keys that differ
+    '''
+    mismatches: List[str] = []
+    key: str
+    index: int
+    for key, index in table.keys.items():
+        method: str
+        flags: str
+        game: str
+        query: str
+        method, flags, game, query = key.split('|', 3)
+        messages: Messages = await render(
+            source, method, tuple(f == '1' for f in flags), game, query)
+        if messages != table.responses[index]:
+            mismatches.append(key)
+    return mismatches
+
+
+def _isSqlite(path: str) -> bool:
+    with open(path, 'rb') as file:
+        return file.read(16) == b'SQLite format 3\0'
+
+
+async def run(args: argparse.Namespace, path: str) -> int:
+    database: SqliteDatabase = SqliteDatabase(path, 1, 65536)
+    try:
+        start: float = time.perf_counter()
+        table: AnswerTable
+        if args.command == 'build':
+            snapshot: Optional[gen1snapshot.Snapshot]
+            snapshot = await gen1snapshot.load(database)
+            if snapshot is None:
+                print('the dataset could not be read', file=sys.stderr)
+                return 1
+            table = await build(snapshot)
+            table.write(args.answers)
+            print(f'{len(table)} keys, {len(table.responses)} responses, '
+                  f'{os.path.getsize(args.answers)} bytes, '
+                  f'{time.perf_counter() - start:.1f}s', file=sys.stderr)
+            if args.no_verify:
+                return 0
+            start = time.perf_counter()
+        else:
+            table = AnswerTable.read(args.answers)
+        mismatches: List[str] = await verify(table, SqlSource(database))
+        key: str
+        for key in mismatches:
+            print(f'mismatch: {key}')
+        print(f'{len(table) - len(mismatches)} of {len(table)} keys match '
+              f'the SQL queries, {time.perf_counter() - start:.1f}s',
+              file=sys.stderr)
+        return 1 if mismatches else 0
+    finally:
+        database.close()
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Render the !poke* responses into an answer table')
+    parser.add_argument('command', choices=['build', 'verify'])
+    parser.add_argument('data',
+                        help='gen1pokedex-sqlite.sql or a gen1.sqlite '
+                             'database')
+    parser.add_argument('answers', help='answer table to write or verify')
+    parser.add_argument('--no-verify', action='store_true',
+                        help='skip checking a built table against SQL')
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    if _isSqlite(args.data):
+        return loop.run_until_complete(run(args, args.data))
+    script: str
+    with open(args.data, encoding='utf-8') as file:
+        script = file.read()
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'gen1.sqlite')
+        loadSqlite(parse(script), path)
+        return loop.run_until_complete(run(args, path))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+'''
+Compiles a Gen 1 pokedex dump into the binary format read by
+library/gen1binary.py
+
+    python -m pkg.pokedex.tools.compilebinary \
+        pkg/pokedex/gen1pokedex-sqlite.sql sqlite/gen1.bin
+
+Every table of the dump is written as a fixed width struct array, strings
+go to one shared pool. The bot maps the file instead of reading the tables
+from the database when it exists at [SNAPSHOT] binaryPath in pokedex.ini.
+'''
+
+import argparse
+import struct
+import sys
+import time
+
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple  # noqa: F401
+
+from ..library import gen1binary
+from .loaddump import Dump, Table, parse
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.data: List[bytes] = []
+
+    def add(self, value: str) -> int:
+        if value not in self.ids:
+            self.ids[value] = len(self.data)
+            self.data.append(value.encode('utf-8'))
+        return self.ids[value]
+
+
+def _columnType(table: Table, column: int) -> str:
+    values: List[Any] = [row[column] for row in table.rows
+                         if row[column] is not None]
+    if any(isinstance(v, str) for v in values):
+        if not all(isinstance(v, str) for v in values):
+            raise ValueError(f'{table.name}.{table.columns[column]} mixes '
+                             f'strings and numbers')
+        return 's'
+    if any(isinstance(v, (Decimal, float)) for v in values):
+        return 'd'
+    if all(-2 ** 31 < v < 2 ** 31 for v in values):
+        return 'i'
+    return 'q'
+
+
+def _value(type: str, value: Any, strings: _Strings) -> Any:
+    if value is None:
+        return gen1binary.nulls[type]
+    if type == 's':
+        return strings.add(value)
+    if type == 'd':
+        return float(value)
+    return int(value)
+
+
+def compile(dump: Dump) -> bytes:
+    strings: _Strings = _Strings()
+    directory: List[bytes] = []
+    arrays: List[Tuple[int, bytes]] = []
+    offset: int = (gen1binary.header.size
+                   + len(dump.tables) * gen1binary.directoryEntry.size)
+    table: Table
+    for table in dump.tables:
+        types: str = ''.join(_columnType(table, i)
+                             for i in range(len(table.columns)))
+        rowStruct: struct.Struct = struct.Struct(
+            '<' + ''.join(gen1binary.formats[t] for t in types))
+        # Every array starts on an 8 byte boundary
+        offset += -offset % 8
+        directory.append(gen1binary.directoryEntry.pack(
+            strings.add(table.name), strings.add(','.join(table.columns)),
+            strings.add(types), len(table.rows), offset))
+        array: bytes = b''.join(
+            rowStruct.pack(*[_value(t, v, strings)
+                             for t, v in zip(types, row)])
+            for row in table.rows)
+        arrays.append((offset, array))
+        offset += len(array)
+    offset += -offset % 8
+
+    body: bytearray = bytearray(gen1binary.header.pack(
+        gen1binary.magic, gen1binary.version, len(dump.tables),
+        len(strings.data), offset))
+    body += b''.join(directory)
+    start: int
+    for start, array in arrays:
+        body += b'\0' * (start - len(body))
+        body += array
+    body += b'\0' * (offset - len(body))
+
+    stringOffset: int = 0
+    data: bytes
+    for data in strings.data:
+        body += gen1binary.stringEntry.pack(stringOffset, len(data))
+        stringOffset += len(data)
+    body += b''.join(strings.data)
+    return bytes(body)
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Compile a Gen 1 pokedex dump into a binary dataset')
+    parser.add_argument('dump', help='gen1pokedex-*.sql file')
+    parser.add_argument('output', help='binary dataset to write')
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    start: float = time.perf_counter()
+    script: str
+    with open(args.dump, encoding='utf-8') as file:
+        script = file.read()
+    compiled: bytes = compile(parse(script))
+    with open(args.output, 'wb') as output:
+        output.write(compiled)
+
+    dataset: gen1binary.BinaryDataset = gen1binary.BinaryDataset(args.output)
+    rows: int = sum(len(table) for table in dataset.tables.values())
+    dataset.close()
+    print(f'{rows} rows in {len(dataset.tables)} tables, '
+          f'{len(compiled)} bytes, {time.perf_counter() - start:.2f}s',
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
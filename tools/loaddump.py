@@ -0,0 +1,345 @@
+'''
+Bulk loads gen1pokedex-sqlite.sql or gen1pokedex-postgresql.sql
+
+Replaying the dumps statement by statement sends every row on its own. This
+parses a dump once and loads each table in bulk inside one transaction,
+building the secondary indexes after the data and analyzing at the end.
+
+    python -m pkg.pokedex.tools.loaddump sqlite \
+        pkg/pokedex/gen1pokedex-sqlite.sql sqlite/gen1.sqlite
+    python -m pkg.pokedex.tools.loaddump postgresql \
+        pkg/pokedex/gen1pokedex-postgresql.sql | psql botgotsthis
+
+SQLite is loaded directly with executemany. For PostgreSQL a psql script
+with one COPY block for each table is written to the output file, or to
+stdout, so no database driver is needed besides psql.
+'''
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, TextIO
+from typing import DefaultDict, Match, Tuple  # noqa: F401
+
+Value = Any
+
+_statementPattern = re.compile(r"'(?:[^']|'')*'|--[^\n]*|;|[^';-]+|-")
+_insertPattern = re.compile(
+    r'INSERT\s+INTO\s+(\w+)\s+VALUES\s*\((.*)\)\s*$', re.DOTALL)
+_createTablePattern = re.compile(
+    r'CREATE\s+TABLE\s+(\w+)\s*\((.*)\)\s*$', re.DOTALL)
+_updatePattern = re.compile(
+    r'UPDATE\s+(\w+)\s+SET\s+(.*?)\s+WHERE\s+(.*)$', re.DOTALL)
+_assignmentPattern = re.compile(r'\s*(\w+)\s*=\s*(.*?)\s*$', re.DOTALL)
+_valuePattern = re.compile(r'''
+    \s*(?:
+        '(?P<string>(?:[^']|'')*)'
+      | CAST\(\s*x'(?P<bits>[0-9A-Fa-f]+)'\s+AS\s+INT\s*\)
+      | (?P<product>-?\d+(?:\s*\*\s*-?\d+)+)
+      | 0x(?P<hex>[0-9A-Fa-f]+)
+      | (?P<decimal>-?\d+\.\d*)
+      | (?P<integer>-?\d+)
+      | (?P<keyword>NULL|TRUE|FALSE|DEFAULT)
+    )\s*(?:,|$)''', re.VERBOSE | re.IGNORECASE)
+# DEFAULT is only used for SERIAL ids, they are numbered like NULL ids
+_default: object = object()
+_keywords: Dict[str, Value] = {
+    'NULL': None, 'TRUE': True, 'FALSE': False, 'DEFAULT': _default}
+_constraints: Tuple[str, ...] = (
+    'PRIMARY', 'FOREIGN', 'UNIQUE', 'CHECK', 'CONSTRAINT')
+
+
+class Table(NamedTuple):
+    name: str
+    columns: List[str]
+    # Column position of an INTEGER PRIMARY KEY or SERIAL column, NULL or
+    # DEFAULT there means the next id like it does in the database
+    rowId: Optional[int]
+    serial: bool
+    rows: List[List[Value]]
+
+
+_Keys = Dict[Tuple[str, Tuple[int, ...]],
+             DefaultDict[Tuple[Value, ...], List[List[Value]]]]
+
+
+class Dump(NamedTuple):
+    # PRAGMA, DROP and CREATE TABLE statements, in dump order
+    schema: List[str]
+    tables: List[Table]
+    # CREATE INDEX statements, run after the data is loaded
+    indexes: List[str]
+
+
+def statements(script: str) -> Iterator[str]:
+    parts: List[str] = []
+    match: Match[str]
+    for match in _statementPattern.finditer(script):
+        token: str = match.group()
+        if token.startswith('--'):
+            continue
+        if token == ';':
+            statement: str = ''.join(parts).strip()
+            if statement:
+                yield statement
+            parts = []
+        else:
+            parts.append(token)
+    statement = ''.join(parts).strip()
+    if statement:
+        yield statement
+
+
+def parseValues(text: str) -> List[Value]:
+    values: List[Value] = []
+    position: int = 0
+    while position < len(text):
+        match: Optional[Match[str]]
+        match = _valuePattern.match(text, position)
+        if match is None:
+            raise ValueError(f'Cannot parse values: {text[position:]!r}')
+        position = match.end()
+        if match.group('string') is not None:
+            values.append(match.group('string').replace("''", "'"))
+        elif match.group('bits') is not None:
+            values.append(int(match.group('bits'), 16))
+        elif match.group('product') is not None:
+            product: int = 1
+            factor: str
+            for factor in match.group('product').split('*'):
+                product *= int(factor)
+            values.append(product)
+        elif match.group('hex') is not None:
+            values.append(int(match.group('hex'), 16))
+        elif match.group('decimal') is not None:
+            values.append(Decimal(match.group('decimal')))
+        elif match.group('integer') is not None:
+            values.append(int(match.group('integer')))
+        else:
+            values.append(_keywords[match.group('keyword').upper()])
+    return values
+
+
+def _createTable(name: str, definition: str) -> Table:
+    columns: List[str] = []
+    rowId: Optional[int] = None
+    serial: bool = False
+    line: str
+    for line in re.split(r',\s*\n', definition):
+        words: List[str] = line.split()
+        if not words or words[0].upper() in _constraints:
+            continue
+        if re.match(r'\s*\w+\s+INTEGER\s+NOT\s+NULL\s+PRIMARY\s+KEY\b', line,
+                    re.IGNORECASE):
+            rowId = len(columns)
+        elif len(words) > 1 and words[1].upper() == 'SERIAL':
+            rowId = len(columns)
+            serial = True
+        columns.append(words[0])
+    return Table(name, columns, rowId, serial, [])
+
+
+def _assignments(text: str, separator: str) -> Dict[str, Value]:
+    values: Dict[str, Value] = {}
+    part: str
+    for part in re.split(separator, text, flags=re.IGNORECASE):
+        match: Optional[Match[str]] = _assignmentPattern.match(part)
+        if match is None:
+            raise ValueError(f'Cannot parse assignment: {part!r}')
+        value: List[Value] = parseValues(match.group(2))
+        if len(value) != 1:
+            raise ValueError(f'Cannot parse assignment: {part!r}')
+        values[match.group(1)] = value[0]
+    return values
+
+
+def _update(table: Table, statement: str, keys: _Keys) -> None:
+    # The dumps fill in forward references with UPDATE after the INSERT
+    # statements, apply them to the parsed rows so the rows load as final
+    match: Optional[Match[str]] = _updatePattern.match(statement)
+    if match is None:
+        raise ValueError(f'Unsupported statement: {statement[:80]!r}')
+    changes: Dict[str, Value] = _assignments(match.group(2), r',')
+    where: Dict[str, Value] = _assignments(match.group(3), r'\s+AND\s+')
+    positions: Tuple[int, ...]
+    positions = tuple(table.columns.index(c) for c in where)
+    changed: List[Tuple[int, Value]]
+    changed = [(table.columns.index(c), v) for c, v in changes.items()]
+    # Rows are grouped by the WHERE columns once for all UPDATE statements
+    # using the same columns
+    if (table.name, positions) not in keys:
+        rowsByKey: DefaultDict[Tuple[Value, ...], List[List[Value]]]
+        rowsByKey = defaultdict(list)
+        row: List[Value]
+        for row in table.rows:
+            rowsByKey[tuple(row[i] for i in positions)].append(row)
+        keys[table.name, positions] = rowsByKey
+    for row in keys[table.name, positions].get(tuple(where.values()), []):
+        column: int
+        value: Value
+        for column, value in changed:
+            row[column] = value
+    if any(column in positions for column, _ in changed):
+        del keys[table.name, positions]
+
+
+def parse(script: str) -> Dump:
+    dump: Dump = Dump([], [], [])
+    tables: Dict[str, Table] = {}
+    keys: _Keys = {}
+    statement: str
+    for statement in statements(script):
+        insert: Optional[Match[str]] = _insertPattern.match(statement)
+        if insert is not None:
+            tables[insert.group(1)].rows.append(
+                parseValues(insert.group(2)))
+            for key in [k for k in keys if k[0] == insert.group(1)]:
+                del keys[key]
+            continue
+        words: List[str] = statement.split()
+        keyword: str = ' '.join(words[:2]).upper()
+        if keyword in ('CREATE INDEX', 'CREATE UNIQUE'):
+            dump.indexes.append(statement)
+        elif keyword == 'ANALYZE':
+            pass
+        elif keyword == 'CREATE TABLE':
+            dump.schema.append(statement)
+            create: Optional[Match[str]]
+            create = _createTablePattern.match(statement)
+            if create is None:
+                raise ValueError(f'Cannot parse table: {statement[:80]!r}')
+            table: Table = _createTable(create.group(1), create.group(2))
+            tables[table.name] = table
+            dump.tables.append(table)
+        elif keyword == 'DROP TABLE' or words[0].upper() == 'PRAGMA':
+            dump.schema.append(statement)
+        elif words[0].upper() == 'UPDATE' and words[1] in tables:
+            _update(tables[words[1]], statement, keys)
+        else:
+            raise ValueError(f'Unsupported statement: {statement[:80]!r}')
+
+    for table in dump.tables:
+        if table.rowId is None:
+            continue
+        nextId: int = 1 + max((row[table.rowId] for row in table.rows
+                               if isinstance(row[table.rowId], int)),
+                              default=0)
+        row: List[Value]
+        for row in table.rows:
+            if row[table.rowId] is None or row[table.rowId] is _default:
+                row[table.rowId] = nextId
+                nextId += 1
+    for table in dump.tables:
+        for row in table.rows:
+            if any(value is _default for value in row):
+                raise ValueError(f'DEFAULT outside of an id in {table.name}')
+    return dump
+
+
+def loadSqlite(dump: Dump, path: str) -> None:
+    connection: sqlite3.Connection = sqlite3.connect(path,
+                                                     isolation_level=None)
+    try:
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute('PRAGMA journal_mode = MEMORY')
+        statement: str
+        for statement in dump.schema:
+            if statement.upper().startswith('PRAGMA'):
+                connection.execute(statement)
+        connection.execute('BEGIN')
+        # Rows may reference rows later in their own table
+        connection.execute('PRAGMA defer_foreign_keys = ON')
+        for statement in dump.schema:
+            if not statement.upper().startswith('PRAGMA'):
+                connection.execute(statement)
+        table: Table
+        for table in dump.tables:
+            if not table.rows:
+                continue
+            marks: str = ', '.join('?' * len(table.rows[0]))
+            connection.executemany(
+                f'INSERT INTO {table.name} VALUES ({marks})',
+                ([float(v) if isinstance(v, Decimal) else v for v in row]
+                 for row in table.rows))
+        for statement in dump.indexes:
+            connection.execute(statement)
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+    finally:
+        connection.close()
+
+
+def _copyValue(value: Value) -> str:
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, str):
+        return (value.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+    return str(value)
+
+
+def writePostgresql(dump: Dump, output: TextIO) -> None:
+    output.write('BEGIN;\n')
+    statement: str
+    for statement in dump.schema:
+        output.write(statement + ';\n')
+    table: Table
+    for table in dump.tables:
+        if not table.rows:
+            continue
+        output.write(f'COPY {table.name} FROM stdin;\n')
+        row: List[Value]
+        for row in table.rows:
+            output.write('\t'.join(_copyValue(v) for v in row) + '\n')
+        output.write('\\.\n')
+        if table.serial and table.rowId is not None:
+            column: str = table.columns[table.rowId]
+            output.write(f'''\
+SELECT setval(pg_get_serial_sequence('{table.name}', '{column.lower()}'), \
+MAX({column})) FROM {table.name};
+''')
+    for statement in dump.indexes:
+        output.write(statement + ';\n')
+    output.write('COMMIT;\n')
+    output.write('ANALYZE;\n')
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Bulk load a Gen 1 pokedex dump')
+    parser.add_argument('target', choices=['sqlite', 'postgresql'])
+    parser.add_argument('dump', help='gen1pokedex-*.sql file')
+    parser.add_argument('output', nargs='?',
+                        help='SQLite database, or psql script (stdout)')
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    start: float = time.perf_counter()
+    script: str
+    with open(args.dump, encoding='utf-8') as file:
+        script = file.read()
+    dump: Dump = parse(script)
+    rows: int = sum(len(table.rows) for table in dump.tables)
+    if args.target == 'sqlite':
+        if args.output is None:
+            parser.error('the SQLite database path is required')
+        loadSqlite(dump, args.output)
+    elif args.output is None:
+        writePostgresql(dump, sys.stdout)
+    else:
+        output: TextIO
+        with open(args.output, 'w', encoding='utf-8') as output:
+            writePostgresql(dump, output)
+    print(f'{rows} rows in {len(dump.tables)} tables, '
+          f'{time.perf_counter() - start:.2f}s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())